@@ -35,6 +35,7 @@ from app.models.labels import Label
 from app.models.objects import Object
 from app.models.projects import Project
 from app.models.settings import Setting
+from app.models.statistics import ProjectStatistics
 
 target_metadata = Base.metadata
 # target_metadata = None
@@ -0,0 +1,51 @@
+"""compress annotation masks
+
+Revision ID: 6d3b9e1f4a82
+Revises: c27a4f9e8d05
+Create Date: 2026-10-18 14:05:12.930417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.dependencies.masks import encode_annotation_data, decode_annotation_data
+
+
+# revision identifiers, used by Alembic.
+revision = '6d3b9e1f4a82'
+down_revision = 'c27a4f9e8d05'
+branch_labels = None
+depends_on = None
+
+
+objects = sa.table(
+    'objects',
+    sa.column('id', sa.String),
+    sa.column('annotation_data', sa.String),
+)
+
+
+def convert(pattern, transform):
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.select(objects.c.id).where(objects.c.annotation_data.like(pattern))
+    ).scalars().all()
+
+    # convert rows one by one to keep memory usage low
+    for object_id in rows:
+        annotation_data = connection.execute(
+            sa.select(objects.c.annotation_data).where(objects.c.id == object_id)
+        ).scalar()
+        connection.execute(
+            objects.update()
+            .where(objects.c.id == object_id)
+            .values(annotation_data=transform(annotation_data))
+        )
+
+
+def upgrade() -> None:
+    convert('%"Mask"%', encode_annotation_data)
+
+
+def downgrade() -> None:
+    convert('%zlib-bits%', decode_annotation_data)
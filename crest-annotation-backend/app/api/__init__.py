@@ -1,5 +1,8 @@
 import json
+import hashlib
+import threading
 
+from cachetools import LRUCache
 from fastapi import APIRouter, HTTPException
 
 
@@ -37,8 +40,17 @@ from .annotations_digital_heraldry.dependencies import (
     DigitalHeraldryAnnotationsProvider,
 )
 
+from ..environment import env
 from ..models.objects import Object
 from ..models.projects import Project
+from ..dependencies.search import make_search_text
+
+
+# parsed object data shared between requests, validating the object data
+# (including nested IIIF services) is much slower than formatting a URI
+_object_data = LRUCache(maxsize=max(env.object_data_cache_size, 1))
+_object_data_lock = threading.Lock()
+_object_data_counters = {"hits": 0, "misses": 0}
 
 
 def get_object_data_schema(object_data):
@@ -62,16 +74,61 @@ def get_object_data_schema(object_data):
     raise ModuleNotFoundError(name=id)
 
 
-def get_object_image_uri(data_object: Object, usage: schemas.ImageRequest):
+def parse_object_data(object_data: str):
     """
-    Get image URI from object
+    Parse serialized object data into its specific schema
     """
 
-    object_data = json.loads(data_object.object_data)
+    object_data = json.loads(object_data)
     schema = get_object_data_schema(object_data)
-    data = schema(**object_data)
 
-    return data.get_image_uri(usage)
+    return schema(**object_data)
+
+
+def get_object_data(data_object: Object):
+    """
+    Get parsed object data, reusing instances parsed by previous requests
+
+    Instances are shared and must not be modified. The content hash is
+    part of the key, so changed object data is never served from cache.
+    """
+
+    if env.object_data_cache_size <= 0:
+        return parse_object_data(data_object.object_data)
+
+    digest = hashlib.blake2b(data_object.object_data.encode(), digest_size=16)
+    key = (data_object.id, digest.digest())
+
+    with _object_data_lock:
+        data = _object_data.get(key)
+        _object_data_counters["misses" if data is None else "hits"] += 1
+    if data is None:
+        data = parse_object_data(data_object.object_data)
+        with _object_data_lock:
+            _object_data[key] = data
+
+    return data
+
+
+def get_object_data_statistics() -> dict[str, int]:
+    """
+    Get size and hit/miss counters of the object data cache
+    """
+
+    with _object_data_lock:
+        return {
+            **_object_data_counters,
+            "size": len(_object_data),
+            "max_size": env.object_data_cache_size,
+        }
+
+
+def get_object_image_uri(data_object: Object, usage: schemas.ImageRequest):
+    """
+    Get image URI from object
+    """
+
+    return get_object_data(data_object).get_image_uri(usage)
 
 
 def get_object_image_description(data_object: Object):
@@ -79,11 +136,19 @@ def get_object_image_description(data_object: Object):
     Get image description from object
     """
 
-    object_data = json.loads(data_object.object_data)
-    schema = get_object_data_schema(object_data)
-    data = schema(**object_data)
+    return get_object_data(data_object).get_image_description()
+
+
+def get_object_search_text(data_object: Object):
+    """
+    Get normalized search text from object
+    """
+
+    fields = []
+    if data_object.object_data:
+        fields = parse_object_data(data_object.object_data).get_search_fields()
 
-    return data.get_image_description()
+    return make_search_text(data_object.object_uuid, *fields)
 
 
 def get_annotations_provider(project: Project):
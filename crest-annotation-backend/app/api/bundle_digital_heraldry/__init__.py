@@ -64,6 +64,9 @@ class DigitalHeraldryObjectData(BaseModel):
     def get_image_description(self):
         return self.folio
 
+    def get_search_fields(self):
+        return list(self.bindings.values())
+
 
 def substitute_variables(query: str, variables: dict[str, str]) -> str:
     """
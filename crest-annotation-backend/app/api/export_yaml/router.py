@@ -6,14 +6,18 @@ from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
 
 from app.dependencies.db import get_db
-from app.models.objects import Object
+from app.dependencies.masks import decode_annotations
+from app.dependencies.projection import query_objects
+from app.models.objects import Object, ANNOTATIONS, SOURCE
 
 from .. import export_router as router
 
 
 @router.get("/yaml")
 def get_yaml_export(project_id: str, db: Session = Depends(get_db)):
-    objects: list[Object] = db.query(Object).filter_by(project_id=project_id)
+    objects: list[Object] = query_objects(db, ANNOTATIONS, SOURCE).filter_by(
+        project_id=project_id
+    )
 
     return PlainTextResponse(
         yaml.dump(
@@ -21,7 +25,9 @@ def get_yaml_export(project_id: str, db: Session = Depends(get_db)):
                 "images": [
                     {
                         "uuid": data_object.object_uuid,
-                        "annotations": json.loads(data_object.annotation_data),
+                        "annotations": decode_annotations(
+                            json.loads(data_object.annotation_data)
+                        ),
                         "source": json.loads(data_object.object_data),
                     }
                     for data_object in objects
@@ -9,6 +9,7 @@ from pyld import jsonld
 from app.dependencies.db import get_db
 from app.dependencies.logger import get_logger
 from app.dependencies.colors import Colors
+from app.dependencies.versions import touch_labels
 from app.models.labels import Label
 from app.models.projects import Project
 
@@ -132,6 +133,7 @@ def import_ontology(
     # These items will have different UUIDs but share the same reference from their @id tag.
     _add_branch(labels)
 
+    touch_labels(db, project_id)
     db.commit()
 
     return JSONResponse({"result": "success"})
@@ -2,11 +2,16 @@ import os
 import uuid
 import base64
 
+from urllib.parse import urlencode
 from pydantic import BaseModel, Field
 from fastapi import Depends
 
 from app.environment import env
 from app.dependencies.logger import get_logger
+from app.dependencies.derivatives import get_image_size
+from app.dependencies.etag import get_file_version
+from app.api.service_image_iiif import iiif3
+from app.api.service_image_iiif.info import ImageInfo
 from app import schemas
 
 
@@ -20,11 +25,42 @@ class FilesystemObjectData(BaseModel):
     path: str
 
     def get_image_uri(self, usage: schemas.ImageRequest):
-        return f"{env.image_local_url}/{self.path}"
+        if env.image_local_iiif:
+            uri = f"{env.image_local_iiif_url}/{self.path}"
+            try:
+                width, height = get_image_size(base64.b32decode(self.path).decode())
+            except OSError:
+                # missing or unreadable files are reported when requested
+                return f"{env.image_local_url}/{self.path}"
+
+            # exact sizes are rendered, so pre-rendered sizes are not preferred
+            info = ImageInfo(width=width, height=height)
+            return iiif3.get_image_uri(uri, usage, info)
+
+        query = {}
+
+        # request sizes to be derived from the original
+        if env.image_cache and env.image_derivatives and (usage.width or usage.height):
+            query.update(usage.dict(exclude_none=True))
+
+        # version the image, so browsers keep it until it is modified
+        try:
+            query["v"] = get_file_version(base64.b32decode(self.path).decode())
+        except OSError:
+            pass
+
+        if not query:
+            return f"{env.image_local_url}/{self.path}"
+
+        return f"{env.image_local_url}/{self.path}?{urlencode(query)}"
 
     def get_image_description(self):
         return self.path
 
+    def get_search_fields(self):
+        # paths are stored encoded, but searched in plain text
+        return [base64.b32decode(self.path).decode()]
+
 
 class FilesystemObject(BaseModel):
     object_uuid: str
@@ -7,6 +7,7 @@ from sqlalchemy.orm import Session
 from app.dependencies.db import get_db
 from app.models.projects import Project
 from app.models.objects import Object
+from app.dependencies.search import make_search_text
 
 from .. import import_router as router
 
@@ -41,6 +42,10 @@ def import_filesystem(
                 object_uuid=obj.object_uuid,
                 position=count + i + 1,
                 object_data=obj.object_data.json(),
+                search_text=make_search_text(
+                    obj.object_uuid,
+                    *obj.object_data.get_search_fields(),
+                ),
             )
             for i, obj in enumerate(objects)
         )
@@ -7,6 +7,7 @@ from app.dependencies.logger import get_logger
 from app import schemas
 
 from ..service_image_iiif import iiif3, iiif2, iiif1
+from ..service_image_iiif.info import ImageInfo
 
 from .schemas import Manifest, Image, Service
 
@@ -22,25 +23,39 @@ class Iiif2ObjectData(BaseModel):
     sequence: str
     canvas: str
     image: str | None
+    label: str | None
+    manifest_label: str | None
 
     service: Service
+    info: ImageInfo | None
 
-    def get_image_uri(self, usage: schemas.ImageRequest):
+    def get_image_service(self):
         # IIIF 3.0 Image API
         if self.service.context == "http://iiif.io/api/image/3/context.json":
-            return iiif3.get_image_uri(self.service.id, usage)
+            return iiif3, self.service.id
         # IIIF 2.x Image API
         if self.service.context == "http://iiif.io/api/image/2/context.json":
-            return iiif2.get_image_uri(self.service.id, usage)
+            return iiif2, self.service.id
         # IIIF 1.x Image API
         if self.service.context == "http://iiif.io/api/image/1/context.json":
-            return iiif1.get_image_uri(self.service.id, usage)
+            return iiif1, self.service.id
 
         raise HTTPException(status_code=404, detail="No compatible image service")
 
+    def get_image_uri(self, usage: schemas.ImageRequest):
+        service, uri = self.get_image_service()
+        return service.get_image_uri(uri, usage, self.info)
+
+    def get_image_info(self):
+        service, uri = self.get_image_service()
+        return service.get_image_info(uri)
+
     def get_image_description(self):
         return self.image
 
+    def get_search_fields(self):
+        return [self.label, self.manifest_label]
+
 
 class Iiif2Object(BaseModel):
     object_uuid: str
@@ -92,6 +107,8 @@ class Iiif2:
                     sequence=sequence.id,
                     canvas=canvas.id,
                     image=image.id,
+                    label=canvas.label,
+                    manifest_label=manifest.label,
                     service=image.resource.service,
                 ),
             )
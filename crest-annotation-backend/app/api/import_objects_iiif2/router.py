@@ -11,6 +11,8 @@ from app.dependencies.db import get_db
 from app.dependencies.logger import get_logger
 from app.models.projects import Project
 from app.models.objects import Object
+from app.dependencies.search import make_search_text
+from app.api.service_image_iiif.info import record_image_info
 
 from .. import import_router as router
 
@@ -55,12 +57,19 @@ def import_iiif2(
 
     # insert new objects
     if commit:
+        # record image dimensions, so image URIs can be computed offline
+        record_image_info([obj.object_data for obj in objects], logger)
+
         db.add_all(
             Object(
                 project_id=project_id,
                 object_uuid=obj.object_uuid,
                 position=count + i + 1,
                 object_data=obj.object_data.json(),
+                search_text=make_search_text(
+                    obj.object_uuid,
+                    *obj.object_data.get_search_fields(),
+                ),
             )
             for i, obj in enumerate(objects)
         )
@@ -27,6 +27,7 @@ class Image(Base):
 
 class Canvas(Base):
     id: str = Field(alias="@id")
+    label: str | None
     images: list[Image]
 
 
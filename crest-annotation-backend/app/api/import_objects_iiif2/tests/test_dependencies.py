@@ -26,6 +26,8 @@ def test_import_objects_iiif2():
         manifest="http://example.org/iiif/book1/manifest",
         sequence="http://example.org/iiif/book1/sequence/normal",
         canvas="http://example.org/iiif/book1/canvas/p1",
+        label="p. 1",
+        manifest_label="Book 1",
         service=Service(
             id="http://example.org/images/book1-page1",
             context="http://iiif.io/api/image/2/context.json",
@@ -33,6 +35,9 @@ def test_import_objects_iiif2():
         ),
     )
 
+    # search
+    assert objects[0].object_data.get_search_fields() == ["p. 1", "Book 1"]
+
     # service
     uri = objects[0].object_data.get_image_uri(schemas.ImageRequest())
     assert uri == "http://example.org/images/book1-page1/full/full/0/default.jpg"
@@ -8,6 +8,7 @@ from app.dependencies.logger import get_logger
 from app import schemas
 
 from ..service_image_iiif import iiif3, iiif2, iiif1
+from ..service_image_iiif.info import ImageInfo
 
 
 class Iiif3ObjectData(BaseModel):
@@ -21,28 +22,52 @@ class Iiif3ObjectData(BaseModel):
     page: str
     annotation: str
     canvas: str
+    label: str | None
+    manifest_label: str | None
 
     service: Service
+    info: ImageInfo | None
 
-    def get_image_uri(self, usage: schemas.ImageRequest):
+    def get_image_service(self):
         # try all services until one works
         for service in self.service.__root__:
-
             # IIIF 3.0 Image API
             if service.type == "ImageService3":
-                return iiif3.get_image_uri(service.id, usage)
+                return iiif3, service.id
             # IIIF 2.x Image API
             if service.type == "ImageService2":
-                return iiif2.get_image_uri(service.id, usage)
+                return iiif2, service.id
             # IIIF 2.x Image API
             if service.type == "ImageService1":
-                return iiif1.get_image_uri(service.id, usage)
+                return iiif1, service.id
 
         raise HTTPException(status_code=404, detail="No compatible image service")
 
+    def get_image_uri(self, usage: schemas.ImageRequest):
+        service, uri = self.get_image_service()
+        return service.get_image_uri(uri, usage, self.info)
+
+    def get_image_info(self):
+        service, uri = self.get_image_service()
+        return service.get_image_info(uri)
+
     def get_image_description(self):
         return self.canvas
 
+    def get_search_fields(self):
+        return [self.label, self.manifest_label]
+
+
+def get_label_text(label) -> str | None:
+    """
+    Flatten a language map into plain text
+    """
+
+    if not label:
+        return None
+
+    return " ".join(value for values in dict(label).values() for value in values)
+
 
 class Iiif3Object(BaseModel):
     object_uuid: str
@@ -99,6 +124,8 @@ class Iiif3:
                     canvas=canvas.id,
                     page=page.id,
                     annotation=item.id,
+                    label=get_label_text(canvas.label),
+                    manifest_label=get_label_text(manifest.label),
                     service=item.body.service,
                 ),
             )
@@ -31,6 +31,8 @@ def test_import_objects_iiif3():
         canvas="https://iiif.io/api/cookbook/recipe/0009-book-1/canvas/p1",
         page="https://iiif.io/api/cookbook/recipe/0009-book-1/page/p1/1",
         annotation="https://iiif.io/api/cookbook/recipe/0009-book-1/annotation/p0001-image",
+        label="Blank page",
+        manifest_label="Simple Manifest - Book",
         service=Service.parse_obj(
             [
                 ServiceItem(
@@ -42,6 +44,12 @@ def test_import_objects_iiif3():
         ),
     )
 
+    # search
+    assert objects[0].object_data.get_search_fields() == [
+        "Blank page",
+        "Simple Manifest - Book",
+    ]
+
     # service
     uri = objects[0].object_data.get_image_uri(schemas.ImageRequest())
     assert (
@@ -4,24 +4,25 @@ from pydantic import BaseModel, Field
 
 from app import schemas
 from . import cache
+from .info import ImageInfo, get_image_size
 
 
-class Iiif1ImageSize(BaseModel):
-    width: int
-    height: int
+class Iiif1ImageService(ImageInfo):
+    """
+    Defines a (incomplete) response as retrieved from IIIF 1.x image server
+    """
 
 
-class Iiif1ImageService(BaseModel):
+def get_image_info(uri) -> ImageInfo:
     """
-    Defines a (incomplete) response as retrieved from IIIF 1.x image server
+    Request image information from IIIF 1.x image server
     """
 
-    # image data
-    width: int
-    height: int
+    json_resonse = cache.get(f"{uri}/info.json").json()
+    return ImageInfo.of(Iiif1ImageService(**json_resonse))
 
 
-def get_image_uri(uri, usage: schemas.ImageRequest):
+def get_image_uri(uri, usage: schemas.ImageRequest, info: ImageInfo | None = None):
     """
     Request image from IIIF 1.x image server
     """
@@ -29,15 +30,10 @@ def get_image_uri(uri, usage: schemas.ImageRequest):
     if not usage.width and not usage.height:
         return f"{uri}/full/full/0/native.jpg"
 
-    # request service info
-    json_resonse = cache.get(f"{uri}/info.json").json()
-    service = Iiif1ImageService(**json_resonse)
-
-    # calculate optimal sizes
-    width = usage.width or 0
-    height = usage.height or 0
+    # request service info, unless it was recorded at import
+    if info is None:
+        info = get_image_info(uri)
 
-    w = round(max(width, height * service.width / service.height))
-    h = round(max(height, width * service.height / service.width))
+    w, h = get_image_size(info, usage)
 
     return f"{uri}/full/{w},{h}/0/native.jpg"
@@ -4,14 +4,10 @@ from pydantic import BaseModel, Field
 
 from app import schemas
 from . import cache
+from .info import ImageInfo, get_image_size
 
 
-class Iiif2ImageSize(BaseModel):
-    width: int
-    height: int
-
-
-class Iiif2ImageService(BaseModel):
+class Iiif2ImageService(ImageInfo):
     """
     Defines a (incomplete) response as retrieved from IIIF 2.x image server
     """
@@ -23,13 +19,17 @@ class Iiif2ImageService(BaseModel):
         const=True,
     )
 
-    # image data
-    width: int
-    height: int
-    sizes: list[Iiif2ImageSize] | None
+
+def get_image_info(uri) -> ImageInfo:
+    """
+    Request image information from IIIF 2.x image server
+    """
+
+    json_resonse = cache.get(f"{uri}/info.json").json()
+    return ImageInfo.of(Iiif2ImageService(**json_resonse))
 
 
-def get_image_uri(uri, usage: schemas.ImageRequest):
+def get_image_uri(uri, usage: schemas.ImageRequest, info: ImageInfo | None = None):
     """
     Request image from IIIF 2.x image server
     """
@@ -37,17 +37,10 @@ def get_image_uri(uri, usage: schemas.ImageRequest):
     if not usage.width and not usage.height:
         return f"{uri}/full/full/0/default.jpg"
 
-    # request service info
-    json_resonse = cache.get(f"{uri}/info.json").json()
-    service = Iiif2ImageService(**json_resonse)
-
-    # calculate optimal sizes
-    width = usage.width or 0
-    height = usage.height or 0
-
-    w = round(max(width, height * service.width / service.height))
-    h = round(max(height, width * service.height / service.width))
+    # request service info, unless it was recorded at import
+    if info is None:
+        info = get_image_info(uri)
 
-    # TODO: respect available sizes
+    w, h = get_image_size(info, usage)
 
     return f"{uri}/full/{w},{h}/0/default.jpg"
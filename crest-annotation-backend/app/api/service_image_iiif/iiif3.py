@@ -4,14 +4,10 @@ from pydantic import BaseModel, Field
 
 from app import schemas
 from . import cache
+from .info import ImageInfo, get_image_size
 
 
-class Iiif3ImageSize(BaseModel):
-    width: int
-    height: int
-
-
-class Iiif3ImageService(BaseModel):
+class Iiif3ImageService(ImageInfo):
     """
     Defines a (incomplete) response as retrieved from IIIF 3 image server
     """
@@ -20,13 +16,17 @@ class Iiif3ImageService(BaseModel):
     context: str | list[str] = Field(alias="@context")
     type: str = Field("ImageService3", const=True)
 
-    # image data
-    width: int
-    height: int
-    sizes: list[Iiif3ImageSize] | None
+
+def get_image_info(uri) -> ImageInfo:
+    """
+    Request image information from IIIF 3 image server
+    """
+
+    json_resonse = cache.get(uri).json()
+    return ImageInfo.of(Iiif3ImageService(**json_resonse))
 
 
-def get_image_uri(uri, usage: schemas.ImageRequest):
+def get_image_uri(uri, usage: schemas.ImageRequest, info: ImageInfo | None = None):
     """
     Get image URI from IIIF 3 image server
     """
@@ -34,17 +34,10 @@ def get_image_uri(uri, usage: schemas.ImageRequest):
     if not usage.width and not usage.height:
         return f"{uri}/full/max/0/default.jpg"
 
-    # request service info
-    json_resonse = cache.get(uri).json()
-    service = Iiif3ImageService(**json_resonse)
-
-    # calculate optimal sizes
-    width = usage.width or 0
-    height = usage.height or 0
-
-    w = round(max(width, height * service.width / service.height))
-    h = round(max(height, width * service.height / service.width))
+    # request service info, unless it was recorded at import
+    if info is None:
+        info = get_image_info(uri)
 
-    # TODO: respect available sizes
+    w, h = get_image_size(info, usage)
 
     return f"{uri}/full/{w},{h}/0/default.jpg"
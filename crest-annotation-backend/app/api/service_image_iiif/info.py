@@ -0,0 +1,84 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from pydantic import BaseModel, Field
+
+from app import schemas
+
+
+class ImageSize(BaseModel):
+    width: int
+    height: int
+
+
+class ImageTiles(BaseModel):
+    width: int
+    height: int | None
+    scale_factors: list[int] = Field(alias="scaleFactors")
+
+    class Config:
+        allow_population_by_field_name = True
+
+
+class ImageInfo(BaseModel):
+    """
+    Image dimensions as provided by an image server (info.json)
+
+    Recorded with the object data, so image URIs can be computed without
+    requesting the image server again.
+    """
+
+    width: int
+    height: int
+    sizes: list[ImageSize] | None
+    tiles: list[ImageTiles] | None
+
+    @classmethod
+    def of(cls, service: "ImageInfo") -> "ImageInfo":
+        return cls(**service.dict(include=set(cls.__fields__)))
+
+
+def get_image_size(info: ImageInfo, usage: schemas.ImageRequest) -> tuple[int, int]:
+    """
+    Calculate the smallest image size covering the requested size
+    """
+
+    width = usage.width or 0
+    height = usage.height or 0
+
+    w = round(max(width, height * info.width / info.height))
+    h = round(max(height, width * info.height / info.width))
+
+    # images are not upscaled, which IIIF 3 servers reject (without ^)
+    if w > info.width or h > info.height:
+        return info.width, info.height
+
+    # prefer sizes pre-rendered by the server (allowing for rounding),
+    # unless they are considerably larger than requested
+    covering = [
+        size
+        for size in info.sizes or []
+        if w - 1 <= size.width < 2 * w and h - 1 <= size.height < 2 * h
+    ]
+    if covering:
+        size = min(covering, key=lambda size: size.width)
+        return size.width, size.height
+
+    return w, h
+
+
+def record_image_info(object_data: list, logger, workers: int = 8):
+    """
+    Request and record image information of the given object data
+
+    Failures are logged and skipped, in which case image information is
+    requested when the image URI is computed.
+    """
+
+    def record(data):
+        try:
+            data.info = data.get_image_info()
+        except Exception:
+            logger.warning(f"Failed to request image information for {data}")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(record, object_data))
@@ -0,0 +1,51 @@
+from .... import schemas
+
+from .. import iiif2, iiif3
+from ..info import ImageInfo, get_image_size
+
+
+INFO = ImageInfo(
+    width=4000,
+    height=3000,
+    sizes=[
+        {"width": 500, "height": 375},
+        {"width": 1000, "height": 750},
+        {"width": 2000, "height": 1500},
+    ],
+    tiles=[{"width": 512, "scaleFactors": [1, 2, 4, 8]}],
+)
+
+
+def test_image_size():
+    # snap to pre-rendered sizes covering the requested size
+    assert get_image_size(INFO, schemas.ImageRequest(height=700)) == (1000, 750)
+    assert get_image_size(INFO, schemas.ImageRequest(width=999)) == (1000, 750)
+
+    # calculate sizes if no pre-rendered size is close
+    assert get_image_size(INFO, schemas.ImageRequest(height=150)) == (200, 150)
+    assert get_image_size(INFO, schemas.ImageRequest(height=2500)) == (3333, 2500)
+
+    # calculate sizes if no sizes are available
+    info = ImageInfo(width=4000, height=3000)
+    assert get_image_size(info, schemas.ImageRequest(height=750)) == (1000, 750)
+
+
+def test_image_size_not_upscaled():
+    info = ImageInfo(width=800, height=600)
+
+    assert get_image_size(info, schemas.ImageRequest(height=1024)) == (800, 600)
+    assert get_image_size(info, schemas.ImageRequest(width=800)) == (800, 600)
+
+
+def test_image_uri_with_info():
+    uri = "http://example.org/images/page1"
+    usage = schemas.ImageRequest(height=750)
+
+    # recorded information does not require requesting the image server
+    assert iiif2.get_image_uri(uri, usage, INFO) == f"{uri}/full/1000,750/0/default.jpg"
+    assert iiif3.get_image_uri(uri, usage, INFO) == f"{uri}/full/1000,750/0/default.jpg"
+
+
+def test_image_info_roundtrip():
+    assert ImageInfo.parse_raw(INFO.json()) == INFO
+    assert INFO.tiles[0].scale_factors == [1, 2, 4, 8]
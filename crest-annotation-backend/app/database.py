@@ -1,19 +1,57 @@
 from uuid import uuid4
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from .environment import env
 
 
+# drivers used to access the configured database asynchronously
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
 def make_uuid():
     return str(uuid4())
 
 
+def make_pool_options(url) -> dict:
+    # sqlite does not pool connections
+    if url.get_backend_name() == "sqlite":
+        return {}
+
+    return {
+        "pool_size": env.database_pool_size,
+        "max_overflow": env.database_max_overflow,
+    }
+
+
+url = make_url(env.database_url)
+async_url = url.set(drivername=ASYNC_DRIVERS[url.get_backend_name()])
+
 engine = create_engine(
-    env.database_url, connect_args={"password": env.database_password}
+    url, connect_args={"password": env.database_password}, **make_pool_options(url)
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# async endpoints run on the event loop instead of the threadpool, which is
+# shared with blocking requests (e.g. image downloads)
+async_engine = create_async_engine(
+    async_url,
+    connect_args={"password": env.database_password},
+    **make_pool_options(async_url),
+)
+AsyncSessionLocal = sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    # attributes can not be loaded lazily once the session is committed
+    expire_on_commit=False,
+)
+
 Base = declarative_base()
@@ -0,0 +1,56 @@
+from sqlalchemy.orm import Session
+
+from .filters import with_filters
+from .statistics import recompute
+from ..models.objects import Object
+from .. import schemas
+
+
+# values assigned to all selected objects per operation
+UPDATES = {
+    "finish": {
+        Object.annotated: True,
+        Object.locked_by: None,
+        Object.lease_expires: None,
+    },
+    "unfinish": {
+        Object.annotated: False,
+    },
+    "unlock": {
+        Object.locked_by: None,
+        Object.lease_expires: None,
+    },
+    "reset": {
+        Object.synced: True,
+        Object.annotation_data: "[]",
+        Object.annotation_version: Object.annotation_version + 1,
+    },
+}
+
+
+def apply_bulk(db: Session, bulk: schemas.BulkObjects) -> schemas.BulkResult:
+    """
+    Apply an operation to the selected objects of a project at once
+
+    Objects are selected by their ids and/or filters. All objects are
+    modified by a single statement within one transaction.
+    """
+
+    query = db.query(Object).filter(Object.project_id == bulk.project_id)
+    if bulk.ids is not None:
+        query = query.filter(Object.id.in_(bulk.ids))
+    if bulk.filters is not None:
+        query = with_filters(query, bulk.filters)
+
+    if bulk.operation == "delete":
+        affected = query.delete(synchronize_session=False)
+    else:
+        affected = query.update(UPDATES[bulk.operation], synchronize_session=False)
+
+    # bulk statements bypass the incremental statistics
+    statistics = recompute(db.connection(), bulk.project_id)
+    db.commit()
+
+    return schemas.BulkResult(
+        affected=affected, statistics=schemas.TotalOf(**statistics)
+    )
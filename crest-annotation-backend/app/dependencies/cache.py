@@ -1,16 +1,28 @@
 import os
+import re
 import hashlib
+import tempfile
+import threading
 import base64
 import pathlib
-import threading
-import urllib.request
+import urllib.error
 
 from typing import Callable
-from fastapi import Depends
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import Depends, HTTPException
 from pydantic import BaseModel
 from datetime import datetime
 
 from ..dependencies.logger import get_logger
+from ..dependencies.downloads import Downloads, IncompleteDownload
+from ..dependencies.cache_index import CacheIndex
+from ..dependencies.transcoding import transcode
+from ..dependencies.derivatives import (
+    MASTER,
+    derive,
+    get_derivative_size,
+    get_image_size,
+)
 from ..environment import env
 from .. import schemas
 
@@ -31,6 +43,176 @@ USER_AGENT = {
 }
 
 
+# size of chunks read from upstream servers
+CHUNK_SIZE = 64 * 1024
+
+# leading bytes of supported image formats
+SIGNATURES = (
+    b"\xff\xd8\xff",  # JPEG
+    b"\x89PNG\r\n\x1a\n",  # PNG
+    b"GIF87a",  # GIF
+    b"GIF89a",
+    b"II*\x00",  # TIFF
+    b"MM\x00*",
+    b"\x00\x00\x00\x0cjP  \r\n\x87\n",  # JPEG 2000
+    b"\xff\x4f\xff\x51",
+    b"BM",  # BMP
+)
+
+
+def is_image(head: bytes) -> bool:
+    """
+    Check the leading bytes of a file for a known image format
+    """
+
+    # formats based on RIFF (WebP) and ISO media files (AVIF, HEIF)
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return True
+    if head[4:8] == b"ftyp":
+        return True
+
+    return head.startswith(SIGNATURES)
+
+
+def write_image(response, out_file) -> tuple[int, str]:
+    """
+    Stream the response in chunks and validate the received image
+
+    Returns the size and content hash of the image.
+    """
+
+    size = 0
+    head = b""
+    digest = hashlib.sha256()
+    while chunk := response.read(CHUNK_SIZE):
+        if len(head) < 16:
+            head += chunk[: 16 - len(head)]
+        digest.update(chunk)
+        size += out_file.write(chunk)
+
+    expected = response.headers.get("Content-Length")
+    if expected is not None and expected.isdigit() and int(expected) != size:
+        raise IncompleteDownload(f"Received {size} of {expected} bytes")
+    if not is_image(head):
+        raise HTTPException(status_code=502, detail="Invalid image received")
+
+    return size, digest.hexdigest()
+
+
+def get_digest(path: str) -> str:
+    """
+    Hash the content of a file
+    """
+
+    with open(path, "rb") as in_file:
+        return hashlib.file_digest(in_file, "sha256").hexdigest()
+
+
+# shared by all requests, so limits apply to the whole process
+downloads = Downloads(
+    headers=USER_AGENT,
+    concurrency=env.image_download_concurrency,
+    rate=env.image_download_rate,
+    retries=env.image_download_retries,
+)
+
+# sizes and accesses of cached files, shared by all requests
+index = CacheIndex(env.image_cache_path) if env.image_cache else None
+
+# length of content hashes used as versions in URLs and entity tags
+VERSION_LENGTH = 16
+
+# requests served by this process
+_counters = {
+    "hits": 0,
+    "misses": 0,
+    "evicted": 0,
+    "stale": 0,
+    "revalidated": 0,
+    "refreshed": 0,
+    "revalidation_errors": 0,
+}
+_counters_lock = threading.Lock()
+
+# stale files are revalidated in the background, each once at a time
+_revalidations = ThreadPoolExecutor(
+    max_workers=max(env.image_download_concurrency, 1),
+    thread_name_prefix="revalidate",
+)
+_revalidating: set[str] = set()
+_revalidating_lock = threading.Lock()
+
+
+def _count(counter: str, value: int = 1):
+    with _counters_lock:
+        _counters[counter] += value
+
+
+def get_shard(file: str) -> str:
+    """
+    Get the path of a cached file relative to the cache root
+
+    Files are spread over two levels of subdirectories, which avoids
+    directories with huge numbers of entries.
+    """
+
+    return os.path.join(file[:2], file[2:4], file)
+
+
+def evict():
+    """
+    Remove least recently used files exceeding the cache size
+    """
+
+    def remove(file: str):
+        try:
+            os.remove(os.path.join(env.image_cache_path, get_shard(file)))
+        except FileNotFoundError:
+            pass
+
+    evicted = index.evict(env.image_cache_size, remove)
+    _count("evicted", evicted)
+
+    return evicted
+
+
+def get_cache_statistics() -> schemas.CacheStatistics:
+    """
+    Get the size of the cache and the requests served by this process
+    """
+
+    index.flush()
+    with _counters_lock:
+        counters = dict(_counters)
+
+    return schemas.CacheStatistics(
+        **index.statistics(), max_size=env.image_cache_size, **counters
+    )
+
+
+def is_local_uri(uri: str) -> bool:
+    """
+    Check if the URI is served by this backend, which is not cached
+    """
+
+    return uri.lower().startswith(
+        (env.image_local_url.lower(), env.image_local_iiif_url.lower())
+    )
+
+
+def get_local_source(uri: str) -> str:
+    """
+    Get the file of an image served by this backend
+    """
+
+    for url in (env.image_local_url, env.image_local_iiif_url):
+        if uri.lower().startswith(url.lower()):
+            identifier = re.split("[/?]", uri[len(url) :].lstrip("/"))[0]
+            return base64.b32decode(identifier).decode()
+
+    raise ValueError(f"Not a local image {uri}")
+
+
 class Entry(BaseModel):
     object_id: str
     usage: schemas.ImageRequest
@@ -52,18 +234,11 @@ class Cache:
     Simple file based caching
     """
 
-    def __init__(
-        self,
-        logger=Depends(get_logger),
-        concurreny_limit: int = 3,
-    ):
+    def __init__(self, logger=Depends(get_logger)):
         self._path = env.image_cache_path
         self._duration = env.image_cache_duration
         self._logger = logger
 
-        # limit the number of concurrent requests
-        self._semaphore = threading.Semaphore(concurreny_limit)
-
     def encode(self, object_id: str, usage: schemas.ImageRequest) -> str:
         """
         Encode the URL so it can be passed safely as filename or inside another URL
@@ -85,23 +260,41 @@ class Cache:
         # base32 encoding fits the needs
         return Entry.parse_raw(base64.b32decode(encoded.encode("ascii")))
 
-    def load(self, url: str, file: str):
+    def load(self, url: str, file: str, headers: dict[str, str] | None = None):
         """
         Load the given URL and store in cache
         """
 
         self._logger.debug(f"Caching {url} as {file}")
-        path = os.path.join(self._path, file)
+        path = os.path.join(self._path, get_shard(file))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
 
-        # limit concurrent downloads to avoid overwhelming IIIF servers
-        with self._semaphore:
-            # use browser-like headers to avoid 403 from IIIF servers
-            req = urllib.request.Request(url, headers=USER_AGENT)
-            with urllib.request.urlopen(req, timeout=30) as response:
-                with open(path, "wb") as out_file:
-                    out_file.write(response.read())
+        def store(response):
+            # incomplete files are never visible, as renaming is atomic
+            handle, temporary = tempfile.mkstemp(
+                dir=os.path.dirname(path), prefix=".", suffix=".part"
+            )
+            try:
+                with os.fdopen(handle, "wb") as out_file:
+                    size, digest = write_image(response, out_file)
+                os.replace(temporary, path)
+            except BaseException:
+                os.remove(temporary)
+                raise
 
-        return path
+            index.add(
+                file,
+                size,
+                etag=response.headers.get("ETag"),
+                modified=response.headers.get("Last-Modified"),
+                digest=digest,
+            )
+            return path
+
+        # concurrent requests of the same file share a single download,
+        # which conditional requests can not share with unconditional ones
+        key = f"{file}#revalidate" if headers else file
+        return downloads.fetch(key, url, store, headers)
 
     def get(self, encoded: str, resolve: Callable[[str, schemas.ImageRequest], str]):
         """
@@ -109,20 +302,348 @@ class Cache:
         """
 
         entry = self.decode(encoded)
+        path = os.path.join(self._path, get_shard(entry.file))
+
+        self._logger.debug(f"Requested cached {entry.file}")
+        if self._is_fresh(path):
+            index.touch(entry.file)
+            _count("hits")
+
+            return path
+
+        # serve outdated files immediately, while they are revalidated
+        if env.image_cache_revalidate and os.path.isfile(path):
+            self._logger.debug(f"Revalidating stale {entry.file}")
+            index.touch(entry.file)
+            _count("stale")
+            self._schedule_refresh(entry, resolve)
+
+            return path
+
+        self._logger.debug(f"Missing cached {entry.file}")
+
+        # move files of the previous flat layout instead of loading them again
+        if self._migrate(entry.file, path):
+            return self.get(encoded, resolve)
+
+        _count("misses")
+
+        return self._fill(entry, resolve)
+
+    def is_cached(self, object_id: str, usage: schemas.ImageRequest) -> bool:
+        """
+        Check if the image is cached and fresh, so no URI must be resolved
+        """
+
+        entry = Entry(object_id=object_id, usage=usage)
+        return self._is_fresh(os.path.join(self._path, get_shard(entry.file)))
+
+    def get_version(self, object_id: str, usage: schemas.ImageRequest) -> str | None:
+        """
+        Identify the cached content of an image, if it was loaded already
+        """
+
+        entry = index.get(Entry(object_id=object_id, usage=usage).file)
+        if not entry or not entry["digest"]:
+            return None
+
+        return entry["digest"][:VERSION_LENGTH]
+
+    def get_file_version(self, path: str) -> str:
+        """
+        Identify the content of a served file
+        """
+
+        file = os.path.basename(path)
+        entry = index.get(file)
+        if entry is None:
+            return get_digest(path)[:VERSION_LENGTH]
+
+        # files indexed before content hashes were recorded
+        if not entry["digest"]:
+            entry["digest"] = get_digest(path)
+            index.set_digest(file, entry["digest"])
+
+        return entry["digest"][:VERSION_LENGTH]
+
+    def warm(
+        self,
+        object_id: str,
+        usage: schemas.ImageRequest,
+        resolve: Callable[[str, schemas.ImageRequest], str],
+    ) -> bool:
+        """
+        Load the given image into cache unless cached already
+        """
+
+        entry = Entry(object_id=object_id, usage=usage)
+        path = os.path.join(self._path, get_shard(entry.file))
+        if self._is_fresh(path):
+            return False
+        if self._migrate(entry.file, path) and self._is_fresh(path):
+            return False
+
+        if env.image_cache_revalidate and os.path.isfile(path):
+            return self._refresh(entry, resolve)
+
+        self._fill(entry, resolve)
+        return True
+
+    def get_local(self, source: str, usage: schemas.ImageRequest) -> str:
+        """
+        Retrieve a local image in the requested size, derived if missing
+        """
+
+        size = get_derivative_size(get_image_size(source), usage)
+        if size is None:
+            return source
+
+        def create(path: str) -> int:
+            return derive(source, path, size)
+
+        return self._get_local(source, str(usage.dict()), create)
+
+    def get_transcoded(self, source: str, media_type: str) -> str:
+        """
+        Retrieve an image in the given format, transcoded if missing
+        """
+
+        def create(path: str) -> int:
+            return transcode(source, path, media_type)
+
+        return self._get_local(source, media_type, create)
+
+    def get_rendered(
+        self, source: str, descriptor: str, render: Callable[[], bytes]
+    ) -> str:
+        """
+        Retrieve an image rendered from a local image, rendered if missing
+        """
+
+        def create(path: str) -> int:
+            content = render()
+
+            handle, temporary = tempfile.mkstemp(
+                dir=os.path.dirname(path), prefix=".", suffix=".part"
+            )
+            try:
+                with os.fdopen(handle, "wb") as out_file:
+                    out_file.write(content)
+                os.replace(temporary, path)
+            except BaseException:
+                os.remove(temporary)
+                raise
+
+            return len(content)
+
+        return self._get_local(source, descriptor, create)
+
+    def get_generated(self, descriptor: str, create: Callable[[str], int]) -> str:
+        """
+        Retrieve a file generated from the given description, created if missing
+        """
+
+        file = hashlib.sha256(
+            descriptor.encode("utf-8"),
+            usedforsecurity=False,
+        ).hexdigest()
+        path = os.path.join(self._path, get_shard(file))
+
+        if os.path.isfile(path):
+            index.touch(file)
+            _count("hits")
+
+            return path
+
+        _count("misses")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        index.add(file, create(path), digest=get_digest(path))
+
+        return path
+
+    def get_generated_file(self, file: str) -> str:
+        """
+        Retrieve a generated file by its name (as returned by get_generated)
+        """
+
+        path = os.path.join(self._path, get_shard(file))
+        if not re.fullmatch("[0-9a-f]{64}", file) or not os.path.isfile(path):
+            raise HTTPException(status_code=404, detail="File not found")
+
+        index.touch(file)
+        _count("hits")
+
+        return path
+
+    def _get_local(self, source: str, descriptor: str, create) -> str:
+        # modifying the source invalidates everything derived from it
+        stat = os.stat(source)
+        return self.get_generated(f"{source}#{stat.st_mtime_ns}#{descriptor}", create)
+
+    def _fill(self, entry: Entry, resolve) -> str:
+        if env.image_derivatives:
+            path = self._derive(entry, resolve)
+            if path is not None:
+                return path
+
+        url = resolve(entry.object_id, entry.usage)
+        return self.load(url, entry.file)
+
+    def _derive(self, entry: Entry, resolve) -> str | None:
+        """
+        Render a sized entry from the master image of its object
+
+        Returns None for entries which can not be derived (unsized, exceeding
+        the master or its loading failed), which are loaded from the server
+        instead.
+        """
+
+        if entry.usage == MASTER or not (entry.usage.width or entry.usage.height):
+            return None
+
+        master = Entry(object_id=entry.object_id, usage=MASTER)
+        source = os.path.join(self._path, get_shard(master.file))
         try:
-            self._logger.debug(f"Requested cached {entry.file}")
-            stat = os.stat(os.path.join(self._path, entry.file))
+            if self._is_fresh(source):
+                index.touch(master.file)
+            elif env.image_cache_revalidate and os.path.isfile(source):
+                self._revalidate(master.file, resolve(entry.object_id, MASTER))
+            else:
+                self.load(resolve(entry.object_id, MASTER), master.file)
+        except Exception as exception:
+            # outdated masters are still good enough to derive from
+            if not os.path.isfile(source):
+                self._logger.warning(
+                    f"Loading master {master.file} failed ({exception})"
+                )
+                return None
+
+        size = get_derivative_size(get_image_size(source), entry.usage)
+        if size is None:
+            return None
 
-            # validate the cache object
-            if self._duration > 0:
-                modified = datetime.fromtimestamp(stat.st_mtime)
-                age = (datetime.now() - modified).total_seconds()
-                assert age < self._duration, "outdated"
+        self._logger.debug(f"Deriving {entry.file} from {master.file}")
+        path = os.path.join(self._path, get_shard(entry.file))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        index.add(entry.file, derive(source, path, size), digest=get_digest(path))
 
-            return os.path.join(self._path, entry.file)
+        return path
+
+    def _schedule_refresh(self, entry: Entry, resolve):
+        with _revalidating_lock:
+            if entry.file in _revalidating:
+                return
+            _revalidating.add(entry.file)
 
+        # resolve while the database session of the request is open
+        usages = [entry.usage, MASTER] if env.image_derivatives else [entry.usage]
+        try:
+            urls = {usage.json(): resolve(entry.object_id, usage) for usage in usages}
         except Exception as exception:
-            self._logger.debug(f"Missing cached {entry.file} ({exception})")
-            url = resolve(entry.object_id, entry.usage)
+            self._logger.warning(f"Resolving stale {entry.file} failed ({exception})")
+            with _revalidating_lock:
+                _revalidating.discard(entry.file)
+            return
+
+        def resolved(object_id: str, usage: schemas.ImageRequest):
+            return urls[usage.json()]
+
+        def refresh():
+            try:
+                self._refresh(entry, resolved)
+            except Exception as exception:
+                self._logger.warning(f"Revalidating {entry.file} failed ({exception})")
+                _count("revalidation_errors")
+            finally:
+                with _revalidating_lock:
+                    _revalidating.discard(entry.file)
+
+        _revalidations.submit(refresh)
+
+    def _refresh(self, entry: Entry, resolve) -> bool:
+        """
+        Revalidate an outdated entry, returns whether it was modified
+
+        Derived entries are rendered again if their master was modified.
+        """
+
+        path = os.path.join(self._path, get_shard(entry.file))
+        master = Entry(object_id=entry.object_id, usage=MASTER)
+        source = os.path.join(self._path, get_shard(master.file))
+
+        derived = (
+            env.image_derivatives
+            and entry.usage != MASTER
+            and (entry.usage.width or entry.usage.height)
+            and os.path.isfile(source)
+            and get_derivative_size(get_image_size(source), entry.usage) is not None
+        )
+        if not derived:
+            return self._revalidate(entry.file, resolve(entry.object_id, entry.usage))
+
+        modified = not self._is_fresh(source) and self._revalidate(
+            master.file, resolve(entry.object_id, MASTER)
+        )
+
+        # the master may have been loaded again since deriving (not just revalidated)
+        loaded, rendered = index.get(master.file), index.get(entry.file)
+        if loaded and rendered and loaded["created"] > rendered["created"]:
+            modified = True
+
+        if not modified:
+            os.utime(path)
+            return False
+
+        self._derive(entry, resolve)
+        return True
+
+    def _revalidate(self, file: str, url: str) -> bool:
+        """
+        Load a file again, unless the server reports it as not modified
+        """
+
+        entry = index.get(file) or {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("modified"):
+            headers["If-Modified-Since"] = entry["modified"]
+
+        try:
+            self.load(url, file, headers)
+        except urllib.error.HTTPError as exception:
+            if exception.code != 304:
+                raise
+
+            # restart the duration of the unmodified file
+            os.utime(os.path.join(self._path, get_shard(file)))
+            _count("revalidated")
+            return False
+
+        _count("refreshed")
+        return True
+
+    def _is_fresh(self, path: str) -> bool:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return False
+
+        # validate the cache object
+        if self._duration > 0:
+            modified = datetime.fromtimestamp(stat.st_mtime)
+            age = (datetime.now() - modified).total_seconds()
+            return age < self._duration
+
+        return True
+
+    def _migrate(self, file: str, path: str) -> bool:
+        legacy = os.path.join(self._path, file)
+        if not os.path.isfile(legacy):
+            return False
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(legacy, path)
+        index.add(file, os.path.getsize(path), digest=get_digest(path))
 
-            return self.load(url, entry.file)
+        return True
@@ -0,0 +1,169 @@
+import os
+import time
+import sqlite3
+import threading
+
+from typing import Callable
+
+
+# evict down to this share of the budget, so eviction does not run constantly
+LOW_WATERMARK = 0.9
+
+
+class CacheIndex:
+    """
+    SQLite index of cached files tracking their size and accesses
+
+    Accesses are collected in memory and written in batches, so serving
+    cached files does not require a write transaction.
+    """
+
+    def __init__(self, path: str):
+        self._file = os.path.join(path, "index.sqlite")
+        self._local = threading.local()
+
+        self._lock = threading.Lock()
+        self._accessed: dict[str, tuple[float, int]] = {}
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        # connections can not be shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self._file, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "file TEXT PRIMARY KEY, size INTEGER NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL, "
+                "hits INTEGER NOT NULL DEFAULT 0)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)"
+            )
+
+            # validators of the server, added after the table was introduced
+            columns = {
+                row[1] for row in connection.execute("PRAGMA table_info(entries)")
+            }
+            for column in ("etag", "modified", "digest"):
+                if column not in columns:
+                    connection.execute(f"ALTER TABLE entries ADD COLUMN {column} TEXT")
+            self._local.connection = connection
+
+        return connection
+
+    def add(
+        self,
+        file: str,
+        size: int,
+        etag: str | None = None,
+        modified: str | None = None,
+        digest: str | None = None,
+    ):
+        """
+        Register a (re-)loaded file, its content hash and the validators
+        it was served with
+        """
+
+        now = time.time()
+        with self._connection as connection:
+            connection.execute(
+                "INSERT INTO entries "
+                "(file, size, created, accessed, etag, modified, digest) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (file) DO UPDATE "
+                "SET size = excluded.size, created = excluded.created, "
+                "accessed = excluded.accessed, etag = excluded.etag, "
+                "modified = excluded.modified, digest = excluded.digest",
+                (file, size, now, now, etag, modified, digest),
+            )
+
+    def get(self, file: str) -> dict | None:
+        """
+        Get when a file was loaded, its content hash and validators
+        """
+
+        row = self._connection.execute(
+            "SELECT created, etag, modified, digest FROM entries WHERE file = ?",
+            (file,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        return dict(zip(("created", "etag", "modified", "digest"), row))
+
+    def set_digest(self, file: str, digest: str):
+        """
+        Record the content hash of a file indexed without it
+        """
+
+        with self._connection as connection:
+            connection.execute(
+                "UPDATE entries SET digest = ? WHERE file = ?", (digest, file)
+            )
+
+    def touch(self, file: str):
+        """
+        Record an access of a file
+        """
+
+        with self._lock:
+            _, hits = self._accessed.get(file, (0, 0))
+            self._accessed[file] = (time.time(), hits + 1)
+
+    def flush(self):
+        """
+        Write recorded accesses to the index
+        """
+
+        with self._lock:
+            accessed, self._accessed = self._accessed, {}
+        if not accessed:
+            return
+
+        with self._connection as connection:
+            connection.executemany(
+                "UPDATE entries SET accessed = ?, hits = hits + ? WHERE file = ?",
+                [(time, hits, file) for file, (time, hits) in accessed.items()],
+            )
+
+    def evict(self, budget: int, remove: Callable[[str], None]) -> int:
+        """
+        Remove least recently used files until the budget is met
+        """
+
+        self.flush()
+
+        total = self.statistics()["size"]
+        if budget <= 0 or total <= budget:
+            return 0
+
+        target = budget * LOW_WATERMARK
+        evicted = []
+        rows = self._connection.execute(
+            "SELECT file, size FROM entries ORDER BY accessed"
+        )
+        for file, size in rows:
+            if total <= target:
+                break
+
+            remove(file)
+            evicted.append((file,))
+            total -= size
+
+        with self._connection as connection:
+            connection.executemany("DELETE FROM entries WHERE file = ?", evicted)
+
+        return len(evicted)
+
+    def statistics(self) -> dict[str, int]:
+        """
+        Get the number and total size of indexed files
+        """
+
+        files, size = self._connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+
+        return {"files": files, "size": size}
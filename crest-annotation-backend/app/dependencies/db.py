@@ -1,14 +1,27 @@
 import math
+import json
+import base64
+import threading
 
 from typing import Callable
 
+from cachetools import TTLCache
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Query as SqlQuery
-from fastapi import Query
+from fastapi import HTTPException, Query
 
-from ..database import SessionLocal
+from ..database import SessionLocal, AsyncSessionLocal
+from ..environment import env
 from .. import schemas
 
 
+# counting large projects is expensive, so optional totals of cursor pages
+# are shared between requests and only refreshed once the cache duration
+# has passed
+_counts = TTLCache(maxsize=1024, ttl=max(env.pagination_count_duration, 1))
+_counts_lock = threading.Lock()
+
+
 def get_db():
     db = SessionLocal()
     try:
@@ -17,13 +30,120 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def count(query: SqlQuery) -> int:
+    """
+    Count the rows of the given query using the shared count cache
+    """
+
+    if env.pagination_count_duration <= 0:
+        return query.order_by(None).count()
+
+    # the compiled statement and its parameters identify the query
+    compiled = query.statement.compile()
+    key = (str(compiled), tuple(sorted(compiled.params.items())))
+
+    with _counts_lock:
+        total = _counts.get(key)
+    if total is None:
+        total = query.order_by(None).count()
+        with _counts_lock:
+            _counts[key] = total
+
+    return total
+
+
+def encode_cursor(direction: str, values: tuple) -> str:
+    """
+    Encode an opaque cursor pointing next to the given keys
+    """
+
+    raw = json.dumps({"d": direction, "k": list(values)})
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[str, tuple]:
+    """
+    Decode an opaque cursor into direction and keys
+    """
+
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        direction, values = raw["d"], tuple(raw["k"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if direction not in ("next", "prev"):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return direction, values
+
+
 def get_paginate(page: int = Query(ge=1), size: int = Query()):
     def paginate(query: SqlQuery, transform: Callable):
         items = list(map(transform, query.offset((page - 1) * size).limit(size)))
-        total = query.count()
+        # page based listings report exact totals, as they are shown right
+        # after changes (e.g. finishing objects or creating projects)
+        total = query.order_by(None).count()
 
         return schemas.Paginated(
-            items=items, pages=math.ceil(total / size), page=page, size=page
+            items=items, pages=math.ceil(total / size), page=page, size=size
+        )
+
+    return paginate
+
+
+def get_cursor_paginate(
+    cursor: str | None = Query(default=None),
+    size: int = Query(ge=1),
+    total: bool = Query(default=False),
+):
+    """
+    Keyset pagination, which avoids scanning skipped rows on late pages
+
+    The given keys must be unique in combination (e.g. position and id)
+    and should be covered by an index.
+    """
+
+    def paginate(query: SqlQuery, keys: list, transform: Callable):
+        direction, values = decode_cursor(cursor) if cursor else ("next", None)
+        if values is not None and len(values) != len(keys):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        page = query.order_by(None)
+        if direction == "next":
+            if values is not None:
+                page = page.filter(tuple_(*keys) > tuple_(*values))
+            page = page.order_by(*keys)
+        else:
+            page = page.filter(tuple_(*keys) < tuple_(*values))
+            page = page.order_by(*map(lambda key: key.desc(), keys))
+
+        # fetch one additional row to know whether more rows follow
+        rows = page.limit(size + 1).all()
+        more = len(rows) > size
+        rows = rows[:size]
+        if direction == "prev":
+            rows.reverse()
+
+        def key_of(row):
+            return tuple(getattr(row, key.key) for key in keys)
+
+        # rows beyond the page exist in the direction of travel,
+        # rows before the page exist whenever a cursor was followed
+        has_next = more if direction == "next" else values is not None
+        has_prev = more if direction == "prev" else values is not None
+
+        return schemas.CursorPaginated(
+            items=list(map(transform, rows)),
+            next=encode_cursor("next", key_of(rows[-1])) if has_next and rows else None,
+            prev=encode_cursor("prev", key_of(rows[0])) if has_prev and rows else None,
+            size=size,
+            total=count(query) if total else None,
         )
 
     return paginate
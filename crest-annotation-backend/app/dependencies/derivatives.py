@@ -0,0 +1,118 @@
+import os
+import tempfile
+import threading
+import multiprocessing
+
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image
+
+from ..environment import env
+from .. import schemas
+
+
+# image loaded once per object, from which requested sizes are derived
+MASTER = schemas.ImageRequest(
+    width=env.image_derivative_master_size,
+    height=env.image_derivative_master_size,
+)
+
+# derivatives are stored like images of IIIF servers (default.jpg)
+FORMAT = "JPEG"
+QUALITY = 90
+
+# resizing is CPU bound, so it runs in separate processes
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ProcessPoolExecutor:
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            # avoid forking the threads of the server
+            _pool = ProcessPoolExecutor(
+                max_workers=max(env.image_derivative_workers, 1),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    return _pool
+
+
+def get_derivative_size(
+    size: tuple[int, int], usage: schemas.ImageRequest
+) -> tuple[int, int] | None:
+    """
+    Calculate the smallest size covering the requested size
+
+    Returns None if the request is not sized or exceeds the source.
+    """
+
+    width, height = size
+    if not usage.width and not usage.height:
+        return None
+
+    w = round(max(usage.width or 0, (usage.height or 0) * width / height))
+    h = round(max(usage.height or 0, (usage.width or 0) * height / width))
+    if w > width or h > height:
+        return None
+
+    return w, h
+
+
+def get_image_size(path: str) -> tuple[int, int]:
+    """
+    Read the size of an image (without decoding it)
+    """
+
+    with Image.open(path) as image:
+        return image.size
+
+
+def save(image: Image.Image, target: str, format: str, **options) -> int:
+    """
+    Store the image atomically, returns its file size
+    """
+
+    handle, temporary = tempfile.mkstemp(
+        dir=os.path.dirname(target), prefix=".", suffix=".part"
+    )
+    try:
+        with os.fdopen(handle, "wb") as out_file:
+            image.save(out_file, format, **options)
+        os.replace(temporary, target)
+    except BaseException:
+        os.remove(temporary)
+        raise
+
+    return os.path.getsize(target)
+
+
+def render(source: str, target: str, size: tuple[int, int]) -> int:
+    """
+    Resize the source image and store it as target (in a worker process)
+    """
+
+    with Image.open(source) as image:
+        # let the decoder scale down (JPEG), instead of decoding at full size
+        image.draft("RGB", size)
+
+        # reduce by whole factors first, which is much faster than resampling
+        factor = min(image.width // size[0], image.height // size[1])
+        if factor > 1:
+            image = image.reduce(factor)
+
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        image = image.resize(size, Image.Resampling.LANCZOS)
+
+    return save(image, target, FORMAT, quality=QUALITY)
+
+
+def derive(source: str, target: str, size: tuple[int, int]) -> int:
+    """
+    Render a derivative using the process pool, returns its file size
+    """
+
+    return get_pool().submit(render, source, target, size).result()
@@ -0,0 +1,199 @@
+import time
+import random
+import threading
+import http.client
+import email.utils
+import urllib.error
+import urllib.request
+
+from typing import Callable, TypeVar
+from datetime import datetime, timezone
+from concurrent.futures import Future
+from urllib.parse import urlparse
+
+from .logger import get_logger
+
+
+T = TypeVar("T")
+
+# responses indicating temporary failures
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# give up instead of blocking requests for longer
+MAX_RETRY_AFTER = 60
+
+
+class IncompleteDownload(Exception):
+    """
+    Response ended before the announced content was received
+    """
+
+
+def get_retry_after(headers) -> float | None:
+    """
+    Parse the Retry-After header (seconds or HTTP date)
+    """
+
+    value = headers.get("Retry-After") if headers else None
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max((date - datetime.now(timezone.utc)).total_seconds(), 0)
+
+
+class Host:
+    """
+    Concurrency and rate limits of requests to a single host
+    """
+
+    def __init__(self, concurrency: int, rate: float):
+        self.semaphore = threading.BoundedSemaphore(max(concurrency, 1))
+
+        self._interval = 1 / rate if rate > 0 else 0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        """
+        Wait for the next request slot
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self._interval
+
+        time.sleep(start - now)
+
+    def delay(self, seconds: float):
+        """
+        Delay all further requests (e.g. when asked to by the host)
+        """
+
+        with self._lock:
+            self._next = max(self._next, time.monotonic() + seconds)
+
+
+class Downloads:
+    """
+    Process wide coordination of downloads
+
+    Concurrent downloads of the same key are performed only once, requests
+    are limited per host and temporary failures are retried with backoff.
+    """
+
+    def __init__(
+        self,
+        headers: dict[str, str] | None = None,
+        concurrency: int = 3,
+        rate: float = 0,
+        retries: int = 3,
+        backoff: float = 1.0,
+        timeout: float = 30,
+    ):
+        self._headers = headers or {}
+        self._concurrency = concurrency
+        self._rate = rate
+        self._retries = retries
+        self._backoff = backoff
+        self._timeout = timeout
+        self._logger = get_logger()
+
+        self._lock = threading.Lock()
+        self._pending: dict[str, Future] = {}
+        self._hosts: dict[str, Host] = {}
+
+    def _host(self, url: str) -> Host:
+        name = urlparse(url).netloc
+
+        with self._lock:
+            host = self._hosts.get(name)
+            if host is None:
+                host = self._hosts[name] = Host(self._concurrency, self._rate)
+
+        return host
+
+    def fetch(
+        self,
+        key: str,
+        url: str,
+        store: Callable[..., T],
+        headers: dict[str, str] | None = None,
+    ) -> T:
+        """
+        Download the URL and pass the response to store
+
+        Callers requesting a key which is already being downloaded wait for
+        and share the result of the pending download.
+        """
+
+        with self._lock:
+            future = self._pending.get(key)
+            pending = future is not None
+            if not pending:
+                future = self._pending[key] = Future()
+
+        if pending:
+            self._logger.debug(f"Waiting for pending download of {key}")
+            return future.result()
+
+        try:
+            result = self._download(url, store, headers or {})
+            future.set_result(result)
+            return result
+        except BaseException as exception:
+            future.set_exception(exception)
+            raise
+        finally:
+            with self._lock:
+                del self._pending[key]
+
+    def _download(self, url: str, store: Callable[..., T], headers: dict) -> T:
+        host = self._host(url)
+
+        for attempt in range(self._retries + 1):
+            retry_after = None
+            with host.semaphore:
+                host.wait()
+                try:
+                    request = urllib.request.Request(
+                        url, headers={**self._headers, **headers}
+                    )
+                    with urllib.request.urlopen(
+                        request, timeout=self._timeout
+                    ) as response:
+                        return store(response)
+                except urllib.error.HTTPError as exception:
+                    if exception.code not in RETRY_STATUS:
+                        raise
+                    if attempt == self._retries:
+                        raise
+                    retry_after = get_retry_after(exception.headers)
+                    if retry_after is not None and retry_after > MAX_RETRY_AFTER:
+                        raise
+                    # slow down all requests to hosts rejecting too many requests
+                    if exception.code == 429 and retry_after is None:
+                        retry_after = self._backoff * 2**attempt
+                except (
+                    urllib.error.URLError,
+                    TimeoutError,
+                    http.client.IncompleteRead,
+                    IncompleteDownload,
+                ):
+                    if attempt == self._retries:
+                        raise
+
+            if retry_after is not None:
+                self._logger.warning(f"Retrying {url} after {retry_after:.1f}s")
+                host.delay(retry_after)
+            else:
+                delay = self._backoff * 2**attempt * random.uniform(0.5, 1.5)
+                self._logger.warning(f"Retrying {url} in {delay:.1f}s")
+                time.sleep(delay)
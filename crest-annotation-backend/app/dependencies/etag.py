@@ -0,0 +1,90 @@
+import os
+import hashlib
+
+from typing import Awaitable, Callable
+
+from fastapi import Request
+from fastapi.responses import Response
+
+
+# cache for a year, without revalidating
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def make_etag(*parts) -> str:
+    """
+    Build a strong entity tag from version identifiers
+    """
+
+    return '"' + "-".join(map(str, parts)) + '"'
+
+
+def get_file_version(path: str) -> str:
+    """
+    Identify the content of a file by its modification time and size
+
+    Used for files too large to hash on every request (e.g. local images).
+    """
+
+    stat = os.stat(path)
+    descriptor = f"{stat.st_mtime_ns}-{stat.st_size}"
+
+    return hashlib.sha256(descriptor.encode("utf-8")).hexdigest()[:16]
+
+
+class Conditional:
+    """
+    Conditional GET support using entity tags
+
+    Endpoints read their version cheaply first and only build the full
+    payload if the client does not have the current version already.
+    """
+
+    def __init__(self, request: Request):
+        self._request = request
+
+    def matches(self, etag: str) -> bool:
+        header = self._request.headers.get("if-none-match")
+        if not header:
+            return False
+
+        # weak comparison is used for If-None-Match (RFC 7232)
+        tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+        return "*" in tags or etag in tags
+
+    def respond(
+        self, etag: str, build: Callable[[], Response], immutable: bool = False
+    ) -> Response:
+        """
+        Build the response unless not modified
+
+        Immutable responses (e.g. of URLs containing a content hash) are
+        cached by browsers without revalidating them.
+        """
+
+        if self.matches(etag):
+            return self._not_modified(etag, immutable)
+
+        return self._tag(build(), etag, immutable)
+
+    async def respond_async(
+        self, etag: str, build: Callable[[], Awaitable[Response]]
+    ) -> Response:
+        if self.matches(etag):
+            return self._not_modified(etag)
+
+        return self._tag(await build(), etag)
+
+    @staticmethod
+    def _headers(etag: str, immutable: bool = False) -> dict[str, str]:
+        if immutable:
+            return {"ETag": etag, "Cache-Control": IMMUTABLE}
+
+        return {"ETag": etag, "Cache-Control": "no-cache"}
+
+    def _not_modified(self, etag: str, immutable: bool = False) -> Response:
+        return Response(status_code=304, headers=self._headers(etag, immutable))
+
+    def _tag(self, response: Response, etag: str, immutable: bool = False) -> Response:
+        response.headers.update(self._headers(etag, immutable))
+        return response
@@ -0,0 +1,13 @@
+from .search import with_search
+from ..models.objects import Object
+from .. import schemas
+
+
+def with_filters(query, filters: schemas.ObjectFilters):
+    if filters.annotated is not None:
+        query = query.filter(Object.annotated == filters.annotated)
+    if filters.synced is not None:
+        query = query.filter(Object.synced == filters.synced)
+    if filters.search:
+        query = with_search(query, filters.search)
+    return query
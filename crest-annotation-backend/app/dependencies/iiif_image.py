@@ -0,0 +1,296 @@
+import io
+import math
+
+from collections import OrderedDict
+
+from PIL import Image, ImageOps
+from pydantic import BaseModel
+
+from .derivatives import get_image_size, get_pool
+
+
+# formats and their media types supported by the local image server
+FORMATS = {
+    "jpg": ("JPEG", "image/jpeg"),
+    "png": ("PNG", "image/png"),
+    "webp": ("WEBP", "image/webp"),
+    "gif": ("GIF", "image/gif"),
+    "tif": ("TIFF", "image/tiff"),
+}
+QUALITIES = ("default", "color", "gray", "bitonal")
+
+# edge length of tiles announced to viewers
+TILE_SIZE = 512
+
+# pixels of decoded pyramid levels kept per worker process (about 3 bytes
+# each), larger levels (e.g. full size scans) are decoded per request
+LEVEL_PIXELS = 32_000_000
+
+
+class IiifRequest(BaseModel):
+    """
+    Image request with all parameters resolved against the image size
+    """
+
+    region: tuple[int, int, int, int]
+    size: tuple[int, int]
+    mirror: bool
+    rotation: float
+    quality: str
+    format: str
+
+    @property
+    def canonical(self) -> str:
+        """
+        Path of the request, equal for equivalent requests
+        """
+
+        region = ",".join(map(str, self.region))
+        size = ",".join(map(str, self.size))
+        rotation = f"{'!' if self.mirror else ''}{self.rotation:g}"
+
+        return f"{region}/{size}/{rotation}/{self.quality}.{self.format}"
+
+    @property
+    def media_type(self) -> str:
+        return FORMATS[self.format][1]
+
+
+def _numbers(value: str, count: int, convert=int) -> list:
+    numbers = list(map(convert, value.split(",")))
+    if len(numbers) != count or any(number < 0 for number in numbers):
+        raise ValueError(f"Invalid parameter {value}")
+
+    return numbers
+
+
+def parse_region(value: str, width: int, height: int) -> tuple[int, int, int, int]:
+    if value == "full":
+        return 0, 0, width, height
+    if value == "square":
+        side = min(width, height)
+        return (width - side) // 2, (height - side) // 2, side, side
+
+    if value.startswith("pct:"):
+        x, y, w, h = _numbers(value[4:], 4, float)
+        x, w = round(x * width / 100), round(w * width / 100)
+        y, h = round(y * height / 100), round(h * height / 100)
+    else:
+        x, y, w, h = _numbers(value, 4)
+
+    # regions exceeding the image are cropped
+    if x >= width or y >= height or w == 0 or h == 0:
+        raise ValueError(f"Invalid region {value}")
+
+    return x, y, min(w, width - x), min(h, height - y)
+
+
+def parse_size(
+    value: str, width: int, height: int, limit: tuple[int, int]
+) -> tuple[int, int]:
+    upscale = value.startswith("^")
+    value = value.removeprefix("^")
+
+    if value in ("max", "full"):
+        w, h = width, height
+    elif value.startswith("pct:"):
+        (scale,) = _numbers(value[4:], 1, float)
+        w, h = round(width * scale / 100), round(height * scale / 100)
+    elif value.startswith("!"):
+        w, h = _numbers(value[1:], 2)
+        scale = min(w / width, h / height)
+        w, h = round(width * scale), round(height * scale)
+    elif value.startswith(","):
+        (h,) = _numbers(value[1:], 1)
+        w = round(width * h / height)
+    elif value.endswith(","):
+        (w,) = _numbers(value[:-1], 1)
+        h = round(height * w / width)
+    else:
+        w, h = _numbers(value, 2)
+
+    if w < 1 or h < 1 or (not upscale and (w > width or h > height)):
+        raise ValueError(f"Invalid size {value}")
+    # upscaling is limited to the size of the whole image
+    if w > max(width, limit[0]) or h > max(height, limit[1]):
+        raise ValueError(f"Invalid size {value}")
+
+    return w, h
+
+
+def parse_request(
+    source: str, region: str, size: str, rotation: str, image: str
+) -> IiifRequest:
+    """
+    Parse the parameters of an image request (IIIF Image API 2 and 3)
+    """
+
+    width, height = get_image_size(source)
+
+    quality, _, format = image.rpartition(".")
+    if quality not in QUALITIES or format not in FORMATS:
+        raise ValueError(f"Invalid quality or format {image}")
+
+    mirror = rotation.startswith("!")
+    try:
+        degrees = float(rotation.removeprefix("!"))
+    except ValueError:
+        raise ValueError(f"Invalid rotation {rotation}")
+    if not 0 <= degrees < 360:
+        raise ValueError(f"Invalid rotation {rotation}")
+
+    box = parse_region(region, width, height)
+
+    return IiifRequest(
+        region=box,
+        size=parse_size(size, box[2], box[3], (width, height)),
+        mirror=mirror,
+        rotation=degrees,
+        quality=quality,
+        format=format,
+    )
+
+
+def get_scale_factors(width: int, height: int) -> list[int]:
+    """
+    Scale factors until the whole image fits into a single tile
+    """
+
+    factors = [1]
+    while math.ceil(max(width, height) / factors[-1]) > TILE_SIZE:
+        factors.append(factors[-1] * 2)
+
+    return factors
+
+
+def get_info(source: str, id: str) -> dict:
+    """
+    Describe the image (IIIF Image API 3 info.json)
+    """
+
+    width, height = get_image_size(source)
+    factors = get_scale_factors(width, height)
+
+    return {
+        "@context": "http://iiif.io/api/image/3/context.json",
+        "id": id,
+        "type": "ImageService3",
+        "protocol": "http://iiif.io/api/image",
+        "profile": "level2",
+        "width": width,
+        "height": height,
+        "maxWidth": width,
+        "maxHeight": height,
+        "sizes": [
+            {
+                "width": math.ceil(width / factor),
+                "height": math.ceil(height / factor),
+            }
+            for factor in reversed(factors[1:])
+        ],
+        "tiles": [{"width": TILE_SIZE, "height": TILE_SIZE, "scaleFactors": factors}],
+        "extraQualities": ["color", "gray", "bitonal"],
+        "extraFormats": [format for format in FORMATS if format != "jpg"],
+        "extraFeatures": ["mirroring", "rotationArbitrary", "sizeUpscaling"],
+    }
+
+
+_levels: OrderedDict[tuple[str, int, int], Image.Image] = OrderedDict()
+
+
+def _decode_level(source: str, factor: int) -> Image.Image:
+    """
+    Decode the image scaled down by the given factor (a pyramid level)
+    """
+
+    with Image.open(source) as image:
+        width, height = image.size
+        size = (math.ceil(width / factor), math.ceil(height / factor))
+
+        # let the decoder scale down (JPEG), then reduce the remaining factor
+        image.draft("RGB", size)
+        level = image.copy()
+
+    remaining = min(level.width // size[0], level.height // size[1])
+    if remaining > 1:
+        level = level.reduce(remaining)
+    if level.mode not in ("RGB", "L"):
+        level = level.convert("RGB")
+
+    return level
+
+
+def _open_level(source: str, modified: int, factor: int) -> Image.Image:
+    """
+    Get a decoded pyramid level, least recently used levels are dropped
+
+    Kept decoded, so requesting further tiles of the same level does not
+    decode the source again.
+    """
+
+    key = (source, modified, factor)
+    if key in _levels:
+        _levels.move_to_end(key)
+        return _levels[key]
+
+    level = _decode_level(source, factor)
+    if level.width * level.height > LEVEL_PIXELS:
+        return level
+
+    _levels[key] = level
+    while sum(kept.width * kept.height for kept in _levels.values()) > LEVEL_PIXELS:
+        _levels.popitem(last=False)
+
+    return level
+
+
+def render(source: str, modified: int, request: IiifRequest) -> bytes:
+    """
+    Render the requested image (in a worker process)
+    """
+
+    with Image.open(source) as image:
+        width, height = image.size
+
+    # choose the smallest level still covering the requested size
+    x, y, w, h = request.region
+    scale = min(w / request.size[0], h / request.size[1])
+    factor = 2 ** int(math.log2(scale)) if scale >= 2 else 1
+
+    level = _open_level(source, modified, factor)
+    sx, sy = level.width / width, level.height / height
+    box = (
+        round(x * sx),
+        round(y * sy),
+        max(round((x + w) * sx), round(x * sx) + 1),
+        max(round((y + h) * sy), round(y * sy) + 1),
+    )
+    image = level.crop(box).resize(request.size, Image.Resampling.LANCZOS)
+
+    if request.mirror:
+        image = ImageOps.mirror(image)
+    if request.rotation:
+        # rotation is clockwise, the uncovered area is left white
+        image = image.rotate(-request.rotation, expand=True, fillcolor="white")
+
+    if request.quality == "gray":
+        image = image.convert("L")
+    elif request.quality == "bitonal":
+        image = image.convert("1")
+
+    format = FORMATS[request.format][0]
+    if format == "JPEG" and image.mode == "1":
+        image = image.convert("L")
+
+    buffer = io.BytesIO()
+    image.save(buffer, format, **({"quality": 90} if format == "JPEG" else {}))
+
+    return buffer.getvalue()
+
+
+def render_image(source: str, modified: int, request: IiifRequest) -> bytes:
+    """
+    Render the requested image using the process pool
+    """
+
+    return get_pool().submit(render, source, modified, request).result()
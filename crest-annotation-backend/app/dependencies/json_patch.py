@@ -0,0 +1,166 @@
+import copy
+
+
+class PatchError(Exception):
+    """
+    Patch can not be applied to the document
+    """
+
+
+class PatchConflict(PatchError):
+    """
+    Patch test operation failed
+    """
+
+
+def _parse_pointer(pointer: str) -> list[str]:
+    """
+    Split a JSON pointer (RFC 6901) into unescaped tokens
+    """
+
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise PatchError(f"Invalid pointer {pointer}")
+
+    return [
+        token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")
+    ]
+
+
+def _index(container: list, token: str, append: bool = False) -> int:
+    if append and token == "-":
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token.startswith("0")):
+        raise PatchError(f"Invalid array index {token}")
+
+    index = int(token)
+    if index > len(container) or (not append and index == len(container)):
+        raise PatchError(f"Array index {token} out of range")
+
+    return index
+
+
+def _resolve(document, tokens: list[str]):
+    """
+    Resolve the value referenced by the given tokens
+    """
+
+    for token in tokens:
+        if isinstance(document, dict):
+            if token not in document:
+                raise PatchError(f"Missing member {token}")
+            document = document[token]
+        elif isinstance(document, list):
+            document = document[_index(document, token)]
+        else:
+            raise PatchError(f"Can not resolve {token} in scalar value")
+
+    return document
+
+
+def _add(document, tokens: list[str], value):
+    if not tokens:
+        return value
+
+    parent = _resolve(document, tokens[:-1])
+    if isinstance(parent, dict):
+        parent[tokens[-1]] = value
+    elif isinstance(parent, list):
+        parent.insert(_index(parent, tokens[-1], append=True), value)
+    else:
+        raise PatchError("Can not add to scalar value")
+
+    return document
+
+
+def _remove(document, tokens: list[str]):
+    if not tokens:
+        raise PatchError("Can not remove the document root")
+
+    parent = _resolve(document, tokens[:-1])
+    if isinstance(parent, dict):
+        if tokens[-1] not in parent:
+            raise PatchError(f"Missing member {tokens[-1]}")
+        return document, parent.pop(tokens[-1])
+    if isinstance(parent, list):
+        return document, parent.pop(_index(parent, tokens[-1]))
+
+    raise PatchError("Can not remove from scalar value")
+
+
+def _member(operation: dict, key: str):
+    if key not in operation:
+        raise PatchError(f"Missing {key} in {operation.get('op')} operation")
+
+    return operation[key]
+
+
+def apply_patch(document, operations: list[dict]):
+    """
+    Apply JSON patch (RFC 6902) operations to a document
+
+    The given document is not modified, the patched document is returned.
+    Either all operations are applied or a PatchError is raised.
+    """
+
+    document = copy.deepcopy(document)
+
+    for operation in operations:
+        op = operation.get("op")
+        path = _parse_pointer(operation.get("path", ""))
+
+        if op == "add":
+            document = _add(document, path, copy.deepcopy(_member(operation, "value")))
+        elif op == "remove":
+            document, _ = _remove(document, path)
+        elif op == "replace":
+            _resolve(document, path)
+            if path:
+                document, _ = _remove(document, path)
+            document = _add(document, path, copy.deepcopy(_member(operation, "value")))
+        elif op == "move":
+            source = _parse_pointer(_member(operation, "from"))
+            if path[: len(source)] == source and path != source:
+                raise PatchError("Can not move a value into one of its children")
+            document, value = _remove(document, source)
+            document = _add(document, path, value)
+        elif op == "copy":
+            value = _resolve(document, _parse_pointer(_member(operation, "from")))
+            document = _add(document, path, copy.deepcopy(value))
+        elif op == "test":
+            if _resolve(document, path) != _member(operation, "value"):
+                raise PatchConflict(f"Test failed for {operation.get('path')}")
+        else:
+            raise PatchError(f"Invalid operation {op}")
+
+    return document
+
+
+def apply_upserts(annotations: list[dict], upsert: list[dict], delete: list[str]):
+    """
+    Insert, replace or delete annotations by their identifier
+    """
+
+    if not isinstance(annotations, list) or not all(
+        isinstance(annotation, dict) for annotation in [*annotations, *upsert]
+    ):
+        raise PatchError("Annotations must be a list of objects")
+    if any("id" not in annotation for annotation in upsert):
+        raise PatchError("Upserted annotations require an id")
+
+    deleted = set(delete)
+    replaced = {annotation["id"]: annotation for annotation in upsert}
+
+    result = []
+    for annotation in annotations:
+        identifier = annotation.get("id")
+        if identifier in deleted:
+            continue
+        # keep the existing order for replaced annotations
+        result.append(replaced.pop(identifier, annotation))
+
+    # remaining annotations are new
+    result.extend(replaced.values())
+
+    return result
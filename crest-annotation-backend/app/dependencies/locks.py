@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta
+
+from fastapi import Depends
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session
+
+from .db import get_db
+from ..environment import env
+from ..models.objects import Object
+from .. import schemas
+
+
+class Locks:
+    """
+    Lease based object locks
+
+    Every state change is a single conditional UPDATE, so concurrent
+    sessions can not overwrite each other. Leases expire unless they are
+    renewed by heartbeats, which releases objects of abandoned sessions.
+    """
+
+    def __init__(self, db: Session = Depends(get_db)):
+        self._db = db
+        self._duration = timedelta(seconds=env.lock_duration)
+
+    def _update(self, object_id: str, *conditions, **values) -> bool:
+        result = self._db.execute(
+            update(Object)
+            .where(Object.id == object_id, *conditions)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    def acquire(self, object_id: str, session_id: str, force: bool = False) -> bool:
+        """
+        Acquire or renew the lock if it is free, expired or already owned
+        """
+
+        now = datetime.utcnow()
+        lease = {"locked_by": session_id, "lease_expires": now + self._duration}
+
+        conditions = (
+            []
+            if force
+            else [
+                or_(
+                    Object.locked_by.is_(None),
+                    Object.locked_by == session_id,
+                    Object.lease_expires.is_(None),
+                    Object.lease_expires < now,
+                )
+            ]
+        )
+        acquired = self._update(object_id, *conditions, **lease)
+        self._db.commit()
+
+        return acquired
+
+    def heartbeat(self, object_id: str, session_id: str) -> bool:
+        """
+        Extend the lease if it is still owned by the session
+        """
+
+        renewed = self._update(
+            object_id,
+            Object.locked_by == session_id,
+            lease_expires=datetime.utcnow() + self._duration,
+        )
+        self._db.commit()
+
+        return renewed
+
+    def release(self, object_id: str, session_id: str | None = None) -> bool:
+        """
+        Release the lock (of the given session only if provided)
+        """
+
+        conditions = [Object.locked_by.isnot(None)]
+        if session_id is not None:
+            conditions.append(Object.locked_by == session_id)
+
+        released = self._update(
+            object_id, *conditions, locked_by=None, lease_expires=None
+        )
+        self._db.commit()
+
+        return released
+
+    def status(self, object_ids: list[str], session_id: str | None = None):
+        """
+        Retrieve the lock status of multiple objects at once
+        """
+
+        now = datetime.utcnow()
+        rows = self._db.query(Object.id, Object.locked_by, Object.lease_expires).filter(
+            Object.id.in_(object_ids)
+        )
+
+        def to_status(row):
+            valid = row.locked_by is not None and (
+                row.lease_expires is not None and row.lease_expires >= now
+            )
+            return schemas.LockStatus(
+                id=row.id,
+                locked=valid,
+                owned=valid and row.locked_by == session_id,
+                expires=row.lease_expires if valid else None,
+            )
+
+        return list(map(to_status, rows))
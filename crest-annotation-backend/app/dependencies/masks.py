@@ -0,0 +1,184 @@
+import json
+import zlib
+import base64
+import asyncio
+import operator
+import functools
+import itertools
+
+from typing import Callable, TypeVar
+from concurrent.futures import ThreadPoolExecutor
+
+from ..environment import env
+
+
+T = TypeVar("T")
+
+# identifies masks stored in compressed form
+CODEC = "zlib-bits"
+
+# translate between one byte per pixel and binary digits
+TO_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+FROM_DIGITS = bytes.maketrans(b"01", b"\x00\x01")
+
+# compared against pixel values to threshold them
+ZEROS = itertools.repeat(0)
+
+# masks are coded in dedicated threads, so they neither block the event loop
+# nor wait for blocking requests (e.g. image downloads) of the shared pool
+_executor = ThreadPoolExecutor(
+    max_workers=max(env.mask_coding_workers, 1), thread_name_prefix="masks"
+)
+
+
+def encode_mask(mask: list[list]) -> dict:
+    """
+    Pack a dense mask into one bit per pixel and compress it with zlib
+
+    Masks consist of long runs of identical values, which deflate
+    reduces to a small fraction of their JSON representation.
+    """
+
+    height = len(mask)
+    width = len(mask[0]) if height and isinstance(mask[0], list) else 0
+
+    # ragged rows would be packed misaligned and decoded corrupted
+    for row in mask:
+        if not isinstance(row, list) or len(row) != width:
+            raise ValueError("Mask rows must be lists of equal length")
+
+    # positive values are foreground when rendering (e.g. logits of SAM)
+    pixels = b"".join(bytes(map(operator.gt, row, ZEROS)) for row in mask)
+    digits = pixels.translate(TO_DIGITS).decode("ascii")
+    digits += "0" * (-len(digits) % 8)
+    packed = int(digits or "0", 2).to_bytes(len(digits) // 8, "big")
+
+    return {
+        "codec": CODEC,
+        "width": width,
+        "height": height,
+        "data": base64.b64encode(zlib.compress(packed, 9)).decode("ascii"),
+    }
+
+
+def decode_mask(encoded: dict) -> list[list[int]]:
+    """
+    Restore a dense mask from its compressed form
+    """
+
+    if encoded.get("codec") != CODEC:
+        raise ValueError(f"Unsupported mask codec {encoded.get('codec')}")
+
+    width, height = encoded["width"], encoded["height"]
+    if not width:
+        return [[] for _ in range(height)]
+
+    packed = zlib.decompress(base64.b64decode(encoded["data"]))
+
+    digits = bin(int.from_bytes(packed, "big"))[2:].zfill(len(packed) * 8)
+    pixels = digits.encode("ascii").translate(FROM_DIGITS)
+
+    return [list(pixels[i : i + width]) for i in range(0, width * height, width)]
+
+
+def _masks(annotations):
+    """
+    Iterate all mask shapes contained in annotations
+    """
+
+    if not isinstance(annotations, list):
+        return
+
+    for annotation in annotations:
+        if not isinstance(annotation, dict):
+            continue
+        for shape in annotation.get("shapes") or []:
+            if isinstance(shape, dict) and shape.get("type") == "Mask":
+                yield shape
+
+
+def encode_annotations(annotations: list) -> list:
+    """
+    Compress all dense masks contained in annotations (in place)
+    """
+
+    for shape in _masks(annotations):
+        if isinstance(shape.get("mask"), list):
+            shape["mask"] = encode_mask(shape["mask"])
+
+    return annotations
+
+
+def decode_annotations(annotations: list) -> list:
+    """
+    Restore all compressed masks contained in annotations (in place)
+    """
+
+    for shape in _masks(annotations):
+        if isinstance(shape.get("mask"), dict):
+            shape["mask"] = decode_mask(shape["mask"])
+
+    return annotations
+
+
+def encode_annotation_data(annotation_data: str) -> str:
+    """
+    Compress masks of serialized annotations before storing them
+    """
+
+    # avoid parsing annotations without any masks
+    if annotation_data is None or '"Mask"' not in annotation_data:
+        return annotation_data
+
+    annotations = encode_annotations(json.loads(annotation_data))
+    return json.dumps(annotations, separators=(",", ":"))
+
+
+def decode_annotation_data(annotation_data: str) -> str:
+    """
+    Restore masks of stored annotations to their serialized form
+    """
+
+    # avoid parsing annotations without any compressed masks
+    if annotation_data is None or CODEC not in annotation_data:
+        return annotation_data
+
+    annotations = decode_annotations(json.loads(annotation_data))
+    return json.dumps(annotations, separators=(",", ":"))
+
+
+def has_masks(annotation_data: str | None) -> bool:
+    """
+    Check if serialized annotations contain dense or compressed masks
+    """
+
+    return annotation_data is not None and '"Mask"' in annotation_data
+
+
+def contains_masks(value) -> bool:
+    """
+    Check if parsed values (e.g. patch operations) contain mask shapes
+    """
+
+    if isinstance(value, dict):
+        return value.get("type") == "Mask" or any(map(contains_masks, value.values()))
+    # rows of masks contain numbers only, so they are not traversed
+    if isinstance(value, list) and value and isinstance(value[0], (dict, list)):
+        return any(map(contains_masks, value))
+
+    return False
+
+
+async def run_coding(masked: bool, function: Callable[..., T], *args) -> T:
+    """
+    Run a function coding masks off the event loop
+
+    Annotations without masks are cheap to process, so they are processed
+    directly instead of waiting for a thread.
+    """
+
+    if not masked:
+        return function(*args)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(function, *args))
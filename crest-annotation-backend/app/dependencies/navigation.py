@@ -0,0 +1,98 @@
+from fastapi import Depends
+from sqlalchemy import literal, select, tuple_, union_all
+from sqlalchemy.orm import Session
+
+from .db import get_db
+from .filters import with_filters
+from ..models.objects import Object
+from .. import schemas
+
+
+class Navigation:
+    """
+    Navigate between neighbouring objects matching filters
+
+    Objects are ordered by (position, id), so every lookup is a range
+    scan on the composite project and position indices starting right
+    next to the current object. The current object itself is resolved
+    within the same statement, which avoids a self-join.
+    """
+
+    def __init__(self, db: Session = Depends(get_db)):
+        self._db = db
+
+    def _neighbours(self, object_id: str, filters: schemas.ObjectFilters):
+        current = Object.id == object_id
+        project_id = select(Object.project_id).where(current).scalar_subquery()
+        position = select(Object.position).where(current).scalar_subquery()
+
+        query = self._db.query(Object.id).filter(Object.project_id == project_id)
+        query = with_filters(query, filters)
+
+        keys = tuple_(Object.position, Object.id)
+        current_keys = tuple_(position, object_id)
+
+        following = query.filter(keys > current_keys).order_by(
+            Object.position.asc(), Object.id.asc()
+        )
+        preceding = query.filter(keys < current_keys).order_by(
+            Object.position.desc(), Object.id.desc()
+        )
+
+        return following, preceding
+
+    def neighbour(
+        self, object_id: str, filters: schemas.ObjectFilters, offset: int
+    ) -> str | None:
+        """
+        Find the n-th neighbour (negative offsets navigate backwards)
+        """
+
+        if offset == 0:
+            return object_id
+
+        following, preceding = self._neighbours(object_id, filters)
+        query = following if offset > 0 else preceding
+
+        row = query.offset(abs(offset) - 1).limit(1).first()
+        return row.id if row else None
+
+    def window(
+        self, object_id: str, filters: schemas.ObjectFilters, before: int, after: int
+    ) -> schemas.ObjectWindow:
+        """
+        Find up to the given number of neighbours in both directions
+
+        Identifiers are ordered by distance to the current object.
+        """
+
+        following, preceding = self._neighbours(object_id, filters)
+
+        # both directions are fetched within a single round trip
+        parts = [
+            query.add_columns(
+                literal(direction).label("direction"),
+                Object.position,
+            )
+            .limit(limit)
+            .subquery()
+            for query, direction, limit in [
+                (following, "after", after),
+                (preceding, "before", before),
+            ]
+            if limit > 0
+        ]
+        if not parts:
+            return schemas.ObjectWindow(before=[], after=[])
+
+        rows = self._db.execute(union_all(*map(select, parts))).all()
+
+        def ordered(direction: str, reverse: bool):
+            matching = [row for row in rows if row.direction == direction]
+            matching.sort(key=lambda row: (row.position, row.id), reverse=reverse)
+            return [row.id for row in matching]
+
+        return schemas.ObjectWindow(
+            before=ordered("before", reverse=True),
+            after=ordered("after", reverse=False),
+        )
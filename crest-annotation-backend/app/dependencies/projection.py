@@ -0,0 +1,45 @@
+from sqlalchemy import select
+from sqlalchemy.orm import Session, load_only, undefer_group
+
+from ..models.objects import Object, ANNOTATIONS, SOURCE, SEARCH
+
+
+# columns required to build object summaries
+SUMMARY_COLUMNS = (
+    Object.id,
+    Object.project_id,
+    Object.object_uuid,
+    Object.position,
+    Object.annotated,
+    Object.synced,
+    Object.locked_by,
+)
+
+
+def query_objects(db: Session, *groups: str):
+    """
+    Query objects including the given deferred column groups
+
+    Deferred columns that are not requested are loaded lazily on access,
+    which costs an additional round trip per object.
+    """
+
+    return db.query(Object).options(*map(undefer_group, groups))
+
+
+def select_objects(*groups: str):
+    """
+    Select objects including the given deferred column groups
+
+    Used with async sessions, which can not load deferred columns lazily.
+    """
+
+    return select(Object).options(*map(undefer_group, groups))
+
+
+def query_summaries(db: Session):
+    """
+    Query objects restricted to the summary columns
+    """
+
+    return db.query(Object).options(load_only(*SUMMARY_COLUMNS))
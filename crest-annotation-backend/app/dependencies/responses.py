@@ -0,0 +1,123 @@
+import os
+import re
+import stat
+
+import anyio
+
+from fastapi import Request
+from starlette.responses import FileResponse
+from starlette.types import Receive, Scope, Send
+
+
+RANGE = re.compile(r"bytes=(\d*)-(\d*)")
+
+# ASGI extension to pass files to the server (e.g. to use sendfile)
+ZERO_COPY = "http.response.zerocopysend"
+
+
+def parse_range(value: str | None, size: int) -> tuple[int, int] | None:
+    """
+    Parse a single byte range into inclusive start and end offsets
+
+    Returns None for missing or multiple ranges, which are answered with the
+    whole file, and raises a ValueError for ranges outside of the file.
+    """
+
+    match = RANGE.fullmatch(value.strip()) if value else None
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+
+    start, end = match.groups()
+    if start == "":
+        # suffix ranges select the last bytes of the file
+        start, end = max(size - int(end), 0), size - 1
+    else:
+        start, end = int(start), min(int(end), size - 1) if end else size - 1
+
+    if start > end or start >= size:
+        raise ValueError("Range not satisfiable")
+
+    return start, end
+
+
+class RangeFileResponse(FileResponse):
+    """
+    File response supporting single byte ranges and zero copy sending
+    """
+
+    def __init__(self, path: str, request: Request, **kwargs):
+        super().__init__(path, stat_result=os.stat(path), **kwargs)
+        self.headers["accept-ranges"] = "bytes"
+
+        self._range = None
+        size = self.stat_result.st_size
+
+        # ranges only apply while the file matches the validator of the client
+        validator = request.headers.get("if-range")
+        if validator and validator not in (
+            self.headers["etag"],
+            self.headers["last-modified"],
+        ):
+            return
+
+        try:
+            self._range = parse_range(request.headers.get("range"), size)
+        except ValueError:
+            self.status_code = 416
+            self.headers["content-range"] = f"bytes */{size}"
+            self.headers["content-length"] = "0"
+            return
+
+        if self._range is not None:
+            start, end = self._range
+            self.status_code = 206
+            self.headers["content-range"] = f"bytes {start}-{end}/{size}"
+            self.headers["content-length"] = str(end - start + 1)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not stat.S_ISREG(self.stat_result.st_mode):
+            raise RuntimeError(f"File at path {self.path} is not a file.")
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        )
+
+        start, end = self._range or (0, self.stat_result.st_size - 1)
+        if self.send_header_only or self.status_code == 416 or end < start:
+            await send({"type": "http.response.body", "body": b""})
+        elif ZERO_COPY in scope.get("extensions", {}):
+            with open(self.path, "rb") as file:
+                await send(
+                    {
+                        "type": ZERO_COPY,
+                        "file": file,
+                        "offset": start,
+                        "count": end - start + 1,
+                    }
+                )
+        else:
+            async with await anyio.open_file(self.path, mode="rb") as file:
+                await file.seek(start)
+                remaining = end - start + 1
+                while remaining > 0:
+                    chunk = await file.read(min(self.chunk_size, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    await send(
+                        {
+                            "type": "http.response.body",
+                            "body": chunk,
+                            "more_body": remaining > 0,
+                        }
+                    )
+                if remaining > 0:
+                    # file was truncated while sending
+                    await send({"type": "http.response.body", "body": b""})
+
+        if self.background is not None:
+            await self.background()
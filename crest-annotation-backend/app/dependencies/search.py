@@ -0,0 +1,42 @@
+import re
+
+from sqlalchemy import func
+
+from ..models.objects import Object
+
+
+def make_search_text(*fields: str | None) -> str:
+    """
+    Combine searchable fields into normalized search text
+    """
+
+    text = " ".join(field for field in fields if field)
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+def with_search(query, search: str):
+    """
+    Filter objects by the indexed search text
+
+    The trigram index supports substring matches without scanning
+    the raw object data.
+    """
+
+    term = make_search_text(search)
+    escaped = re.sub(r"([\\%_])", r"\\\1", term)
+
+    return query.filter(Object.search_text.like(f"%{escaped}%", escape="\\"))
+
+
+def by_rank(query, search: str):
+    """
+    Order objects by relevance for the given search term
+    """
+
+    term = make_search_text(search)
+
+    # ranking requires pg_trgm, other databases keep the natural order
+    if query.session.bind.dialect.name == "postgresql":
+        query = query.order_by(func.word_similarity(term, Object.search_text).desc())
+
+    return query.order_by(Object.position, Object.id)
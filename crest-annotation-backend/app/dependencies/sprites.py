@@ -0,0 +1,178 @@
+import os
+import json
+import math
+
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+from fastapi import Depends
+
+from .logger import get_logger
+from .cache import Cache, get_local_source, is_local_uri
+from .derivatives import MASTER, get_image_size, get_pool, save
+from ..environment import env
+from ..models.objects import Object
+from ..api import get_object_image_uri
+from .. import schemas
+
+
+# thumbnails as requested by the objects overview of the web app
+THUMBNAIL = schemas.ImageRequest(thumbnail=True, width=240)
+
+# thumbnails are fitted into square cells, arranged in rows
+CELL_SIZE = 240
+COLUMNS = 8
+
+FORMAT = "JPEG"
+QUALITY = 85
+
+
+def get_layout(
+    sizes: list[tuple[int, int]]
+) -> tuple[tuple[int, int], list[tuple[int, int, int, int]]]:
+    """
+    Arrange images of the given sizes, returns the sheet size and their boxes
+    """
+
+    boxes = []
+    for i, (width, height) in enumerate(sizes):
+        scale = min(CELL_SIZE / width, CELL_SIZE / height, 1)
+        boxes.append(
+            (
+                (i % COLUMNS) * CELL_SIZE,
+                (i // COLUMNS) * CELL_SIZE,
+                max(round(width * scale), 1),
+                max(round(height * scale), 1),
+            )
+        )
+
+    columns = min(len(sizes), COLUMNS)
+    rows = math.ceil(len(sizes) / COLUMNS)
+
+    return (columns * CELL_SIZE, rows * CELL_SIZE), boxes
+
+
+def render(
+    sources: list[str],
+    size: tuple[int, int],
+    boxes: list[tuple[int, int, int, int]],
+    target: str,
+) -> int:
+    """
+    Paste the images into a single sheet (in a worker process)
+    """
+
+    sheet = Image.new("RGB", size, "white")
+    for source, (x, y, width, height) in zip(sources, boxes):
+        with Image.open(source) as image:
+            image.draft("RGB", (width, height))
+            if image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            sheet.paste(image.resize((width, height), Image.Resampling.LANCZOS), (x, y))
+
+    return save(sheet, target, FORMAT, quality=QUALITY)
+
+
+class Sprites:
+    """
+    Thumbnails of a page of objects rendered into a single image
+
+    Sprites are identified by the thumbnails they contain, so they are
+    rendered again only once the page or one of its thumbnails changes.
+    """
+
+    def __init__(self, cache: Cache = Depends(Cache), logger=Depends(get_logger)):
+        self._cache = cache
+        self._logger = logger
+
+    def get(self, data_objects: list[Object]) -> schemas.Sprite:
+        thumbnails = self._get_thumbnails(data_objects)
+
+        ids = [id for id, thumbnail in thumbnails if thumbnail is not None]
+        files = [thumbnail for _, thumbnail in thumbnails if thumbnail is not None]
+        if not files:
+            return schemas.Sprite(uri=None, width=0, height=0, tiles=[])
+
+        size, boxes = get_layout([get_image_size(file) for file in files])
+
+        # versions identify the thumbnails, even if their files are replaced
+        descriptor = json.dumps(
+            {
+                "versions": list(map(self._cache.get_file_version, files)),
+                "boxes": boxes,
+                "format": FORMAT,
+                "quality": QUALITY,
+            }
+        )
+
+        def create(path: str) -> int:
+            return get_pool().submit(render, files, size, boxes, path).result()
+
+        path = self._cache.get_generated(f"sprite#{descriptor}", create)
+
+        return schemas.Sprite(
+            uri=f"{env.image_cache_url}/sprites/{os.path.basename(path)}",
+            width=size[0],
+            height=size[1],
+            tiles=[
+                schemas.SpriteTile(id=id, x=x, y=y, width=width, height=height)
+                for id, (x, y, width, height) in zip(ids, boxes)
+            ],
+        )
+
+    def _get_thumbnails(self, data_objects: list[Object]):
+        """
+        Retrieve the thumbnail files of the objects (None if loading failed)
+        """
+
+        # resolve in this thread, as sessions are not thread safe
+        uris = {}
+        for data_object in data_objects:
+            if not self._cache.is_cached(data_object.id, THUMBNAIL):
+                uris[data_object.id] = self._resolve(data_object)
+
+        def resolve(object_id: str, usage: schemas.ImageRequest):
+            return uris[object_id][usage.json()]
+
+        def load(object_id: str):
+            try:
+                local = uris.get(object_id, {}).get(None)
+                if local is not None:
+                    return self._cache.get_local(local, THUMBNAIL)
+
+                encoded = self._cache.encode(object_id, THUMBNAIL)
+                return self._cache.get(encoded, resolve)
+            except Exception as exception:
+                self._logger.warning(
+                    f"Loading thumbnail {object_id} failed ({exception})"
+                )
+                return None
+
+        ids = [data_object.id for data_object in data_objects]
+        with ThreadPoolExecutor(
+            max_workers=max(env.image_warmup_concurrency, 1)
+        ) as executor:
+            return list(zip(ids, executor.map(load, ids)))
+
+    def _resolve(self, data_object: Object) -> dict:
+        """
+        Resolve the URIs to cache per usage, local files are stored as None
+        """
+
+        # master images are loaded first, if sizes are derived from them
+        usages = [MASTER, THUMBNAIL] if env.image_derivatives else [THUMBNAIL]
+
+        uris = {}
+        for usage in usages:
+            try:
+                uri = get_object_image_uri(data_object, usage)
+            except Exception as exception:
+                self._logger.warning(f"Resolving {data_object.id} failed ({exception})")
+                return {}
+
+            if is_local_uri(uri):
+                return {None: get_local_source(uri)}
+
+            uris[usage.json()] = uri
+
+        return uris
@@ -0,0 +1,210 @@
+from datetime import datetime
+from collections import defaultdict
+
+from sqlalchemy import case, event, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import get_history, PASSIVE_NO_INITIALIZE
+
+from ..models.objects import Object
+from ..models.projects import Project
+from ..models.statistics import ProjectStatistics
+
+
+# counters stored per project, locks are counted when read as leases expire
+COUNTERS = ("total", "annotated", "synced")
+
+# statements inserting or updating rows at once per supported database
+UPSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def count_flags(annotated, synced) -> dict[str, int]:
+    """
+    Contribution of a single object to the project counters
+    """
+
+    return {
+        "total": 1,
+        "annotated": int(bool(annotated)),
+        "synced": int(bool(synced)),
+    }
+
+
+def count_locked(connection, project_id: str) -> int:
+    """
+    Count the unexpired leases of a project
+
+    Leases expire without any write, so they can not be counted
+    incrementally. The partial index of locked objects keeps this cheap.
+    """
+
+    return connection.execute(
+        select(func.count(Object.id)).where(
+            Object.project_id == project_id,
+            Object.locked_by.isnot(None),
+            Object.lease_expires >= datetime.utcnow(),
+        )
+    ).scalar()
+
+
+def recompute(connection, project_id: str) -> dict[str, int]:
+    """
+    Recompute the counters of a project from its objects
+    """
+
+    def flagged(condition):
+        return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+    row = connection.execute(
+        select(
+            func.count(Object.id).label("total"),
+            flagged(Object.annotated == True).label("annotated"),
+            flagged(Object.synced == True).label("synced"),
+        ).where(Object.project_id == project_id)
+    ).one()
+    values = {counter: getattr(row, counter) for counter in COUNTERS}
+
+    # unknown projects have no objects, their counters are not stored
+    if not connection.execute(
+        select(Project.id).where(Project.id == project_id)
+    ).first():
+        return {**values, "locked": 0}
+
+    # a single upsert, so concurrent first reads of a project do not conflict
+    statement = UPSERTS[connection.dialect.name](ProjectStatistics).values(
+        project_id=project_id, **values
+    )
+    connection.execute(
+        statement.on_conflict_do_update(
+            index_elements=[ProjectStatistics.project_id],
+            set_={counter: statement.excluded[counter] for counter in COUNTERS},
+        )
+    )
+
+    return {**values, "locked": count_locked(connection, project_id)}
+
+
+def recompute_all(connection) -> int:
+    """
+    Recompute the counters of all projects (e.g. to repair drift)
+    """
+
+    project_ids = connection.execute(select(Project.id)).scalars().all()
+    for project_id in project_ids:
+        recompute(connection, project_id)
+
+    return len(project_ids)
+
+
+def get_statistics(db: Session, project_id: str) -> dict[str, int]:
+    """
+    Read the counters of a project, initializing them if missing
+    """
+
+    statistics: ProjectStatistics = (
+        db.query(ProjectStatistics).filter_by(project_id=project_id).first()
+    )
+    if not statistics:
+        values = recompute(db.connection(), project_id)
+        db.commit()
+        return values
+
+    return {
+        **{counter: getattr(statistics, counter) for counter in COUNTERS},
+        "locked": count_locked(db, project_id),
+    }
+
+
+# marks previous values, which have not been loaded before modification
+UNKNOWN = object()
+TRACKED = ("annotated", "synced")
+
+
+def _previous(data_object: Object, attribute: str):
+    history = get_history(data_object, attribute, PASSIVE_NO_INITIALIZE)
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return UNKNOWN
+
+
+def _current(data_object: Object, attribute: str):
+    history = get_history(data_object, attribute, PASSIVE_NO_INITIALIZE)
+    if history.added:
+        return history.added[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return None
+
+
+@event.listens_for(Session, "after_flush")
+def update_statistics(session: Session, flush_context):
+    """
+    Apply counter deltas for all flushed objects within the same transaction
+
+    Bulk updates and deletes (Query.update, Query.delete) are not tracked
+    and need to recompute the affected projects themselves.
+    """
+
+    deltas = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+    stale = set()
+
+    def apply(project_id, values, sign):
+        for counter, value in count_flags(*values).items():
+            deltas[project_id][counter] += sign * value
+
+    for instance in session.new:
+        if isinstance(instance, Project):
+            stale.add(instance.id)
+        if isinstance(instance, Object):
+            current = [_current(instance, attribute) for attribute in TRACKED]
+            apply(instance.project_id, current, +1)
+
+    for instance in session.deleted:
+        if isinstance(instance, Object):
+            previous = [_previous(instance, attribute) for attribute in TRACKED]
+            if UNKNOWN in previous:
+                stale.add(instance.project_id)
+                continue
+
+            apply(instance.project_id, previous, -1)
+
+    for instance in session.dirty:
+        if isinstance(instance, Object):
+            previous = [_previous(instance, attribute) for attribute in TRACKED]
+            if UNKNOWN in previous:
+                stale.add(instance.project_id)
+                continue
+
+            current = [_current(instance, attribute) for attribute in TRACKED]
+            apply(instance.project_id, previous, -1)
+            apply(instance.project_id, current, +1)
+
+    if not deltas and not stale:
+        return
+
+    connection = session.connection()
+    for project_id, delta in deltas.items():
+        if project_id in stale or not any(delta.values()):
+            continue
+
+        # increment atomically, so concurrent transactions do not conflict
+        result = connection.execute(
+            update(ProjectStatistics)
+            .where(ProjectStatistics.project_id == project_id)
+            .values(
+                {
+                    getattr(ProjectStatistics, counter): (
+                        getattr(ProjectStatistics, counter) + value
+                    )
+                    for counter, value in delta.items()
+                }
+            )
+        )
+        if result.rowcount == 0:
+            stale.add(project_id)
+
+    for project_id in stale:
+        if project_id is not None:
+            recompute(connection, project_id)
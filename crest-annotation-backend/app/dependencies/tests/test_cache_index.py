@@ -0,0 +1,62 @@
+import time
+
+import pytest
+
+from ..cache_index import CacheIndex
+
+
+@pytest.fixture
+def index(tmp_path):
+    return CacheIndex(str(tmp_path))
+
+
+def test_statistics(index):
+    index.add("a", 100)
+    index.add("b", 50)
+    # reloading replaces the size
+    index.add("a", 200)
+
+    assert index.statistics() == {"files": 2, "size": 250}
+
+
+def test_evict_least_recently_used(index):
+    for file in ("a", "b", "c"):
+        index.add(file, 100)
+        time.sleep(0.01)
+
+    index.touch("a")
+
+    removed = []
+    assert index.evict(200, removed.append) == 2
+    assert removed == ["b", "c"]
+    assert index.statistics() == {"files": 1, "size": 100}
+
+
+def test_evict_within_budget(index):
+    index.add("a", 100)
+
+    removed = []
+    assert index.evict(100, removed.append) == 0
+    assert index.evict(0, removed.append) == 0
+    assert removed == []
+
+
+def test_validators(index):
+    index.add("a", 100, etag='"v1"', modified="Wed, 21 Oct 2015 07:28:00 GMT")
+    index.add("b", 100)
+
+    assert index.get("a")["etag"] == '"v1"'
+    assert index.get("a")["modified"] == "Wed, 21 Oct 2015 07:28:00 GMT"
+    assert index.get("b")["etag"] is None
+    assert index.get("c") is None
+
+
+def test_digest(index):
+    index.add("a", 100, digest="abc")
+    index.add("b", 100)
+
+    assert index.get("a")["digest"] == "abc"
+    assert index.get("b")["digest"] is None
+
+    index.set_digest("b", "def")
+    assert index.get("b")["digest"] == "def"
@@ -0,0 +1,37 @@
+from PIL import Image
+
+from ..derivatives import get_derivative_size, render
+from ... import schemas
+
+
+def test_derivative_size():
+    size = (4000, 3000)
+
+    assert get_derivative_size(size, schemas.ImageRequest(width=400)) == (400, 300)
+    assert get_derivative_size(size, schemas.ImageRequest(height=300)) == (400, 300)
+    # cover both dimensions
+    assert get_derivative_size(size, schemas.ImageRequest(width=400, height=400)) == (
+        533,
+        400,
+    )
+
+
+def test_derivative_size_underivable():
+    size = (4000, 3000)
+
+    assert get_derivative_size(size, schemas.ImageRequest()) is None
+    assert get_derivative_size(size, schemas.ImageRequest(thumbnail=True)) is None
+    assert get_derivative_size(size, schemas.ImageRequest(height=3001)) is None
+
+
+def test_render(tmp_path):
+    source = str(tmp_path / "source.png")
+    target = str(tmp_path / "target")
+    Image.new("RGBA", (1000, 800), (255, 0, 0, 128)).save(source)
+
+    assert render(source, target, (250, 200)) > 0
+
+    with Image.open(target) as image:
+        assert image.format == "JPEG"
+        assert image.size == (250, 200)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["source.png", "target"]
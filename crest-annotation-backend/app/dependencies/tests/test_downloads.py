@@ -0,0 +1,99 @@
+import time
+import threading
+import urllib.error
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ..downloads import Downloads, IncompleteDownload, get_retry_after
+
+
+class Handler(BaseHTTPRequestHandler):
+    requests: dict[str, int] = {}
+
+    def do_GET(self):
+        count = Handler.requests[self.path] = Handler.requests.get(self.path, 0) + 1
+
+        if self.path == "/slow":
+            time.sleep(0.2)
+        if self.path == "/limited" and count == 1:
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.end_headers()
+            return
+        if self.path == "/missing":
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(self.path.encode())
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    Handler.requests = {}
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+
+    httpd.shutdown()
+
+
+def read(response):
+    return response.read()
+
+
+def test_single_flight(server):
+    downloads = Downloads(concurrency=8)
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        results = list(
+            executor.map(
+                lambda _: downloads.fetch("slow", f"{server}/slow", read), range(5)
+            )
+        )
+
+    assert results == [b"/slow"] * 5
+    assert Handler.requests["/slow"] == 1
+
+
+def test_retry(server):
+    downloads = Downloads(backoff=0)
+
+    assert downloads.fetch("limited", f"{server}/limited", read) == b"/limited"
+    assert Handler.requests["/limited"] == 2
+
+    # client errors are not retried
+    with pytest.raises(urllib.error.HTTPError):
+        downloads.fetch("missing", f"{server}/missing", read)
+    assert Handler.requests["/missing"] == 1
+
+
+def test_retry_incomplete(server):
+    downloads = Downloads(backoff=0)
+    attempts = []
+
+    def store(response):
+        attempts.append(response.read())
+        if len(attempts) == 1:
+            raise IncompleteDownload()
+        return attempts[-1]
+
+    assert downloads.fetch("incomplete", f"{server}/incomplete", store) == (
+        b"/incomplete"
+    )
+    assert Handler.requests["/incomplete"] == 2
+
+
+def test_retry_after():
+    assert get_retry_after({"Retry-After": "120"}) == 120
+    assert get_retry_after({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0
+    assert get_retry_after({}) is None
@@ -0,0 +1,88 @@
+import io
+
+import pytest
+from PIL import Image
+
+from .. import iiif_image
+from ..iiif_image import (
+    get_scale_factors,
+    parse_region,
+    parse_request,
+    parse_size,
+    render,
+)
+
+
+def test_parse_region():
+    assert parse_region("full", 400, 300) == (0, 0, 400, 300)
+    assert parse_region("square", 400, 300) == (50, 0, 300, 300)
+    assert parse_region("pct:25,50,50,50", 400, 300) == (100, 150, 200, 150)
+    # regions exceeding the image are cropped
+    assert parse_region("300,200,200,200", 400, 300) == (300, 200, 100, 100)
+
+    with pytest.raises(ValueError):
+        parse_region("400,0,10,10", 400, 300)
+    with pytest.raises(ValueError):
+        parse_region("0,0,10", 400, 300)
+
+
+def test_parse_size():
+    limit = (400, 300)
+
+    assert parse_size("max", 400, 300, limit) == (400, 300)
+    assert parse_size("200,", 400, 300, limit) == (200, 150)
+    assert parse_size(",150", 400, 300, limit) == (200, 150)
+    assert parse_size("pct:50", 400, 300, limit) == (200, 150)
+    assert parse_size("!200,200", 400, 300, limit) == (200, 150)
+    assert parse_size("100,100", 400, 300, limit) == (100, 100)
+    assert parse_size("^400,", 200, 150, limit) == (400, 300)
+
+    # upscaling requires ^ and is limited to the whole image
+    with pytest.raises(ValueError):
+        parse_size("400,", 200, 150, limit)
+    with pytest.raises(ValueError):
+        parse_size("^800,", 200, 150, limit)
+
+
+def test_scale_factors():
+    assert get_scale_factors(500, 300) == [1]
+    assert get_scale_factors(5000, 4000) == [1, 2, 4, 8, 16]
+
+
+def test_render(tmp_path):
+    source = str(tmp_path / "source.png")
+    image = Image.new("RGB", (2000, 1000), "red")
+    image.paste("blue", (1000, 0, 2000, 1000))
+    image.save(source)
+
+    request = parse_request(source, "1000,0,1000,1000", "100,", "!90", "gray.png")
+    assert request.canonical == "1000,0,1000,1000/100,100/!90/gray.png"
+
+    with Image.open(io.BytesIO(render(source, 0, request))) as result:
+        assert result.format == "PNG"
+        assert result.mode == "L"
+        assert result.size == (100, 100)
+        # the blue half only
+        assert result.getextrema()[0] == result.getextrema()[1]
+
+    with pytest.raises(ValueError):
+        parse_request(source, "full", "max", "360", "default.jpg")
+    with pytest.raises(ValueError):
+        parse_request(source, "full", "max", "0", "default.bmp")
+
+
+def test_levels_bounded(tmp_path, monkeypatch):
+    source = str(tmp_path / "source.png")
+    Image.new("RGB", (200, 100), "red").save(source)
+
+    monkeypatch.setattr(iiif_image, "LEVEL_PIXELS", 8000)
+    monkeypatch.setattr(iiif_image, "_levels", iiif_image.OrderedDict())
+
+    # levels exceeding the budget are not kept
+    assert iiif_image._open_level(source, 0, 1).size == (200, 100)
+    assert not iiif_image._levels
+
+    # least recently used levels are dropped
+    iiif_image._open_level(source, 0, 2)
+    iiif_image._open_level(source, 1, 2)
+    assert list(iiif_image._levels) == [(source, 1, 2)]
@@ -0,0 +1,63 @@
+import pytest
+
+from ..json_patch import PatchConflict, PatchError, apply_patch, apply_upserts
+
+
+def test_apply_patch():
+    document = [{"id": "a", "shapes": [{"x": 1}]}, {"id": "b"}]
+
+    patched = apply_patch(
+        document,
+        [
+            {"op": "replace", "path": "/0/shapes/0/x", "value": 5},
+            {"op": "add", "path": "/-", "value": {"id": "c"}},
+            {"op": "move", "from": "/1", "path": "/0"},
+            {"op": "copy", "from": "/0/id", "path": "/2/copy"},
+            {"op": "remove", "path": "/1/shapes"},
+            {"op": "test", "path": "/2/id", "value": "c"},
+        ],
+    )
+
+    assert patched == [{"id": "b"}, {"id": "a"}, {"id": "c", "copy": "b"}]
+
+    # source document is left untouched
+    assert document == [{"id": "a", "shapes": [{"x": 1}]}, {"id": "b"}]
+
+
+def test_apply_patch_errors():
+    document = [{"id": "a/b~"}]
+
+    assert apply_patch(document, [{"op": "test", "path": "/0/id", "value": "a/b~"}])
+    assert apply_patch(document, [{"op": "remove", "path": "/0/id"}]) == [{}]
+    assert apply_patch(document, [{"op": "add", "path": "/0/a~1b", "value": 1}]) == [
+        {"id": "a/b~", "a/b": 1}
+    ]
+
+    with pytest.raises(PatchConflict):
+        apply_patch(document, [{"op": "test", "path": "/0/id", "value": "b"}])
+    with pytest.raises(PatchError):
+        apply_patch(document, [{"op": "remove", "path": "/1"}])
+    with pytest.raises(PatchError):
+        apply_patch(document, [{"op": "add", "path": "/01", "value": 1}])
+    with pytest.raises(PatchError):
+        apply_patch(document, [{"op": "add", "path": "/0/x"}])
+    with pytest.raises(PatchError):
+        apply_patch(document, [{"op": "move", "from": "/0", "path": "/0/child"}])
+
+
+def test_apply_upserts():
+    annotations = [{"id": "a"}, {"id": "b"}, {"id": "c"}]
+
+    result = apply_upserts(annotations, [{"id": "b", "v": 1}, {"id": "d"}], ["a"])
+    assert result == [{"id": "b", "v": 1}, {"id": "c"}, {"id": "d"}]
+
+    with pytest.raises(PatchError):
+        apply_upserts(annotations, [{"name": "missing id"}], [])
+
+    # patched documents must still be lists of annotations
+    with pytest.raises(PatchError):
+        apply_upserts([{"id": "a"}, "b"], [{"id": "c"}], [])
+    with pytest.raises(PatchError):
+        apply_upserts({"id": "a"}, [{"id": "c"}], [])
+    with pytest.raises(PatchError):
+        apply_upserts(annotations, [["id"]], [])
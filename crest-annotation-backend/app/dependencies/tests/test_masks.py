@@ -0,0 +1,79 @@
+import json
+import asyncio
+import threading
+
+import pytest
+
+from ..masks import (
+    contains_masks,
+    has_masks,
+    run_coding,
+    decode_annotation_data,
+    encode_annotation_data,
+    encode_mask,
+    decode_mask,
+)
+
+
+def test_encode_mask():
+    mask = [[0, 0, 1, 1], [0, 1, 1, 0], [0, 0, 0, 0]]
+
+    encoded = encode_mask(mask)
+    assert encoded["width"] == 4
+    assert encoded["height"] == 3
+    assert decode_mask(encoded) == mask
+
+    # values are reduced to foreground and background
+    assert decode_mask(encode_mask([[0, 255, 0.5]])) == [[0, 1, 1]]
+
+
+def test_encode_mask_logits():
+    # negative logits are background
+    mask = [[-3.2, 0.0, 4.1], [-0.5, -1, 2]]
+
+    assert decode_mask(encode_mask(mask)) == [[0, 0, 1], [0, 0, 1]]
+
+
+def test_encode_mask_malformed():
+    # rows of other lengths or types are rejected instead of corrupted
+    for mask in ([[1], [1, 1, 1]], [[1, 0, 1], [1]], [[1, 0], 1], [[1, 0], "10"]):
+        with pytest.raises(ValueError):
+            encode_mask(mask)
+
+    annotation_data = json.dumps(
+        [{"shapes": [{"type": "Mask", "mask": [[1], [1, 1]]}]}]
+    )
+    with pytest.raises(ValueError):
+        encode_annotation_data(annotation_data)
+
+
+def test_encode_annotation_data():
+    mask = [[int(x > 300 and y > 300) for x in range(1024)] for y in range(1024)]
+    annotations = [
+        {"id": "a", "shapes": [{"type": "Rectangle", "x": 1}]},
+        {"id": "b", "shapes": [{"type": "Mask", "mask": mask, "dx": 0, "dy": 0}]},
+    ]
+    annotation_data = json.dumps(annotations)
+
+    encoded = encode_annotation_data(annotation_data)
+    assert len(encoded) * 1000 < len(annotation_data)
+    assert json.loads(decode_annotation_data(encoded)) == annotations
+
+    # annotations without masks are passed through unchanged
+    assert encode_annotation_data("[]") == "[]"
+    assert decode_annotation_data(annotation_data) == annotation_data
+
+
+def test_has_masks():
+    assert has_masks('[{"shapes": [{"type": "Mask", "mask": [[1]]}]}]')
+    assert not has_masks('[{"shapes": [{"type": "Rectangle"}]}]')
+    assert not has_masks(None)
+
+    assert contains_masks([{"op": "add", "value": {"type": "Mask", "mask": [[1]]}}])
+    assert not contains_masks([{"op": "add", "value": [[1, 0], [0, 1]]}])
+
+
+def test_run_coding():
+    # only annotations with masks are coded in another thread
+    assert asyncio.run(run_coding(False, threading.get_ident)) == threading.get_ident()
+    assert asyncio.run(run_coding(True, threading.get_ident)) != threading.get_ident()
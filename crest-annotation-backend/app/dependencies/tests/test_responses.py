@@ -0,0 +1,26 @@
+import pytest
+
+from ..responses import parse_range
+
+
+def test_parse_range():
+    assert parse_range("bytes=0-9", 100) == (0, 9)
+    assert parse_range("bytes=90-", 100) == (90, 99)
+    assert parse_range("bytes=-10", 100) == (90, 99)
+    # ranges exceeding the file are shortened
+    assert parse_range("bytes=50-200", 100) == (50, 99)
+    assert parse_range("bytes=-200", 100) == (0, 99)
+
+
+def test_parse_range_ignored():
+    assert parse_range(None, 100) is None
+    assert parse_range("bytes=-", 100) is None
+    assert parse_range("bytes=0-9,20-29", 100) is None
+    assert parse_range("items=0-9", 100) is None
+
+
+def test_parse_range_not_satisfiable():
+    with pytest.raises(ValueError):
+        parse_range("bytes=100-", 100)
+    with pytest.raises(ValueError):
+        parse_range("bytes=20-10", 100)
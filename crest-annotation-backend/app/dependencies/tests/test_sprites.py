@@ -0,0 +1,41 @@
+from PIL import Image
+
+from ..sprites import CELL_SIZE, COLUMNS, get_layout, render
+
+
+def test_layout():
+    size, boxes = get_layout([(800, 600), (600, 900), (100, 50)])
+
+    assert size == (3 * CELL_SIZE, CELL_SIZE)
+    assert boxes == [
+        (0, 0, 240, 180),
+        (CELL_SIZE, 0, 160, 240),
+        # smaller images are not enlarged
+        (2 * CELL_SIZE, 0, 100, 50),
+    ]
+
+
+def test_layout_rows():
+    size, boxes = get_layout([(240, 240)] * (COLUMNS + 1))
+
+    assert size == (COLUMNS * CELL_SIZE, 2 * CELL_SIZE)
+    assert boxes[-1] == (0, CELL_SIZE, 240, 240)
+
+
+def test_render(tmp_path):
+    sources = []
+    for color in ("red", "blue"):
+        source = str(tmp_path / f"{color}.png")
+        Image.new("RGB", (480, 240), color).save(source)
+        sources.append(source)
+
+    size, boxes = get_layout([(480, 240)] * 2)
+    target = str(tmp_path / "sprite")
+    assert render(sources, size, boxes, target) > 0
+
+    with Image.open(target) as image:
+        assert image.size == size
+        assert image.getpixel((10, 10))[0] > 200
+        assert image.getpixel((CELL_SIZE + 10, 10))[2] > 200
+        # uncovered parts of cells are left white
+        assert image.getpixel((10, 200)) == (255, 255, 255)
@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+
+from ..locks import Locks
+from ..statistics import get_statistics, recompute
+from ...database import Base
+from ...models.objects import Object
+from ...models.projects import Project
+from ...models.statistics import ProjectStatistics
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+
+    session = sessionmaker(bind=engine)()
+    session.add(Project(id="p", name="Project"))
+    session.add_all(
+        Object(id=f"o{i}", project_id="p", position=i, annotated=i == 0)
+        for i in range(3)
+    )
+    session.commit()
+
+    yield session
+
+    session.close()
+
+
+def stored(db) -> dict[str, int]:
+    statistics = db.query(ProjectStatistics).filter_by(project_id="p").one()
+    return {
+        "total": statistics.total,
+        "annotated": statistics.annotated,
+        "synced": statistics.synced,
+    }
+
+
+def test_insert(db):
+    assert stored(db) == {"total": 3, "annotated": 1, "synced": 3}
+
+    db.add(Object(id="o3", project_id="p", position=3, synced=False))
+    db.commit()
+
+    assert stored(db) == {"total": 4, "annotated": 1, "synced": 3}
+    assert get_statistics(db, "p") == {**stored(db), "locked": 0}
+
+
+def test_finish(db):
+    data_object = db.query(Object).filter_by(id="o1").one()
+    data_object.annotated = True
+    db.commit()
+    assert stored(db)["annotated"] == 2
+
+    # previous values are expired by the commit, so the project is recounted
+    data_object.annotated = False
+    db.commit()
+    assert stored(db)["annotated"] == 1
+
+
+def test_delete(db):
+    db.delete(db.query(Object).filter_by(id="o0").one())
+    db.commit()
+
+    assert stored(db) == {"total": 2, "annotated": 0, "synced": 2}
+
+
+def test_recompute(db):
+    # counters drift when objects are changed outside of the session
+    db.execute(update(Object).values(synced=False))
+    db.commit()
+    assert stored(db)["synced"] == 3
+
+    assert recompute(db.connection(), "p")["synced"] == 0
+    db.commit()
+    assert stored(db)["synced"] == 0
+
+    # counters of unknown projects are not stored
+    assert recompute(db.connection(), "unknown")["total"] == 0
+    assert db.query(ProjectStatistics).filter_by(project_id="unknown").count() == 0
+
+
+def test_locks(db):
+    locks = Locks(db)
+
+    assert locks.acquire("o0", "a")
+    assert locks.acquire("o1", "a")
+    assert get_statistics(db, "p")["locked"] == 2
+
+    assert locks.release("o1", "a")
+    assert get_statistics(db, "p")["locked"] == 1
+
+    # expired leases are no longer counted, until they are taken over
+    db.execute(
+        update(Object)
+        .where(Object.id == "o0")
+        .values(lease_expires=datetime.utcnow() - timedelta(seconds=1))
+    )
+    db.commit()
+    assert get_statistics(db, "p")["locked"] == 0
+
+    assert locks.acquire("o0", "b")
+    assert get_statistics(db, "p")["locked"] == 1
@@ -0,0 +1,30 @@
+from PIL import Image
+
+from ..transcoding import negotiate, render
+
+
+def test_negotiate():
+    assert negotiate("image/avif,image/webp,image/apng,*/*;q=0.8") == "image/avif"
+    assert negotiate("image/webp,*/*") == "image/webp"
+    # formats must be accepted explicitly
+    assert negotiate("image/*,*/*;q=0.8") is None
+    assert negotiate(None) is None
+
+
+def test_negotiate_rejected():
+    assert negotiate("image/avif;q=0, image/webp") == "image/webp"
+    assert negotiate("image/avif;q=invalid") is None
+
+
+def test_render(tmp_path):
+    source = str(tmp_path / "source.png")
+    target = str(tmp_path / "target")
+    Image.new("P", (100, 80)).save(source)
+
+    for format in ("WEBP", "AVIF"):
+        assert render(source, target, format, 80) > 0
+
+        with Image.open(target) as image:
+            assert image.format == format
+            assert image.size == (100, 80)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["source.png", "target"]
@@ -0,0 +1,24 @@
+import time
+
+from .. import warmup
+from ..warmup import Warmup, get_job
+from ... import schemas
+
+
+def test_prune_jobs(monkeypatch):
+    monkeypatch.setattr(warmup.env, "image_warmup_retention", 60)
+    monkeypatch.setattr(warmup, "jobs", {})
+
+    running = Warmup(schemas.WarmupRequest(project_id="p"))
+    recent = Warmup(schemas.WarmupRequest(project_id="p"))
+    recent.finished = time.monotonic()
+    expired = Warmup(schemas.WarmupRequest(project_id="p"))
+    expired.finished = time.monotonic() - 61
+
+    for job in (running, recent, expired):
+        warmup.jobs[job.id] = job
+
+    assert get_job(running.id) is running
+    assert get_job(recent.id) is recent
+    assert get_job(expired.id) is None
+    assert list(warmup.jobs) == [running.id, recent.id]
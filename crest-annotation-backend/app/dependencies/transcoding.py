@@ -0,0 +1,102 @@
+import pillow_avif  # noqa: F401 (registers the AVIF plugin)
+
+from PIL import Image
+from fastapi import Request
+from fastapi.responses import Response
+
+from ..environment import env
+from .derivatives import get_pool, save
+from .etag import make_etag
+
+
+# transcoded formats in order of preference (smallest images first)
+FORMATS = {
+    "image/avif": "AVIF",
+    "image/webp": "WEBP",
+}
+
+
+def negotiate(accept: str | None) -> str | None:
+    """
+    Choose the preferred format accepted by the client
+
+    Only explicitly listed media types are considered, as browsers accept
+    image/* without supporting every format.
+    """
+
+    accepted = set()
+    for part in (accept or "").split(","):
+        media_type, *parameters = map(str.strip, part.split(";"))
+        quality = 1.0
+        for parameter in parameters:
+            name, _, value = parameter.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(media_type.lower())
+
+    for media_type in FORMATS:
+        if media_type in accepted:
+            return media_type
+
+    return None
+
+
+class Transcoding:
+    """
+    Transcoding of images to formats accepted by the client
+    """
+
+    def __init__(self, request: Request):
+        self.enabled = env.image_cache and env.image_transcode
+        self.media_type = (
+            negotiate(request.headers.get("accept")) if self.enabled else None
+        )
+
+    def tag(self, version: str) -> str:
+        """
+        Build the entity tag of the served variant
+        """
+
+        if self.media_type is None:
+            return make_etag(version)
+
+        return make_etag(version, FORMATS[self.media_type].lower())
+
+    def vary(self, response: Response) -> Response:
+        """
+        Mark the response as depending on the accepted formats
+        """
+
+        if self.enabled:
+            response.headers["Vary"] = "Accept"
+
+        return response
+
+
+def render(source: str, target: str, format: str, quality: int) -> int:
+    """
+    Store the source image in the given format (in a worker process)
+    """
+
+    with Image.open(source) as image:
+        if image.mode not in ("RGB", "RGBA", "L"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+        return save(image, target, format, quality=quality)
+
+
+def transcode(source: str, target: str, media_type: str) -> int:
+    """
+    Transcode an image using the process pool, returns its file size
+    """
+
+    format = FORMATS[media_type]
+    return (
+        get_pool()
+        .submit(render, source, target, format, env.image_transcode_quality)
+        .result()
+    )
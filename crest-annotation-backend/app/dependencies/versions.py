@@ -0,0 +1,14 @@
+from sqlalchemy.orm import Session
+
+from ..models.projects import Project
+
+
+def touch_labels(db: Session, project_id: str):
+    """
+    Mark the labels of a project as modified (invalidates entity tags)
+    """
+
+    db.query(Project).filter_by(id=project_id).update(
+        {Project.labels_version: Project.labels_version + 1},
+        synchronize_session=False,
+    )
@@ -0,0 +1,238 @@
+import time
+import threading
+
+from uuid import uuid4
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+
+from .cache import Cache, is_local_uri
+from .derivatives import MASTER
+from .filters import with_filters
+from .logger import get_logger
+from .projection import query_objects
+from ..database import SessionLocal
+from ..environment import env
+from ..models.objects import Object, SOURCE
+from ..api import get_object_image_uri
+from .. import schemas
+
+
+# image usages requested by the web app (object cards and editor)
+USAGES = [
+    schemas.ImageRequest(thumbnail=True, width=240),
+    schemas.ImageRequest(height=1024),
+]
+
+# objects loaded at once, cancelling waits for the current batch
+BATCH_SIZE = 20
+
+
+class Warmup:
+    """
+    Background job loading the images of a project into the cache
+
+    Objects are processed in order of their position, so cancelled or
+    failed jobs resume after the last completed batch. Images cached
+    already are skipped without contacting the image server.
+    """
+
+    def __init__(self, request: schemas.WarmupRequest):
+        self.id = uuid4().hex
+        self.request = request
+        self.usages = request.usages or USAGES
+        self.started = datetime.now()
+
+        self.state = "running"
+        self.finished: float | None = None
+        self.total = 0
+        self.processed = 0
+        self.loaded = 0
+        self.failed = 0
+
+        self._cursor: tuple[int, str] | None = None
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._logger = get_logger()
+
+        # progress of the current run to estimate the remaining time
+        self._run_started = 0.0
+        self._run_processed = 0
+
+    @property
+    def running(self) -> bool:
+        return self.state == "running"
+
+    def start(self):
+        """
+        Start or resume processing in a background thread
+        """
+
+        with self._lock:
+            self.state = "running"
+            self.finished = None
+            self._cancelled.clear()
+            self._run_started = time.monotonic()
+            self._run_processed = self.processed
+
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def cancel(self):
+        """
+        Stop processing after the current batch
+        """
+
+        self._cancelled.set()
+
+    def status(self) -> schemas.WarmupStatus:
+        with self._lock:
+            eta = None
+            elapsed = time.monotonic() - self._run_started
+            done = self.processed - self._run_processed
+            if self.running and done > 0:
+                eta = (self.total - self.processed) * elapsed / done
+
+            return schemas.WarmupStatus(
+                id=self.id,
+                project_id=self.request.project_id,
+                status=self.state,
+                total=self.total,
+                processed=self.processed,
+                loaded=self.loaded,
+                failed=self.failed,
+                started=self.started,
+                eta=eta,
+            )
+
+    def _query(self, db: Session):
+        query = query_objects(db, SOURCE).filter(
+            Object.project_id == self.request.project_id
+        )
+        if self.request.filters is not None:
+            query = with_filters(query, self.request.filters)
+
+        return query
+
+    def _run(self):
+        cache = Cache(logger=self._logger)
+
+        try:
+            with SessionLocal() as db, ThreadPoolExecutor(
+                max_workers=max(env.image_warmup_concurrency, 1)
+            ) as executor:
+                self.total = self._query(db).order_by(None).count()
+
+                while not self._cancelled.is_set():
+                    query = self._query(db)
+                    if self._cursor is not None:
+                        query = query.filter(
+                            tuple_(Object.position, Object.id) > tuple_(*self._cursor)
+                        )
+                    batch = (
+                        query.order_by(Object.position, Object.id)
+                        .limit(BATCH_SIZE)
+                        .all()
+                    )
+                    if not batch:
+                        break
+
+                    # resolve in this thread, as sessions are not thread safe
+                    ids = [data_object.id for data_object in batch]
+                    uris = [self._resolve(data_object) for data_object in batch]
+                    list(executor.map(self._warm, ids, uris, [cache] * len(batch)))
+
+                    self._cursor = (batch[-1].position, batch[-1].id)
+                    # release the loaded objects of the batch
+                    db.expunge_all()
+
+            state = "cancelled" if self._cancelled.is_set() else "completed"
+        except Exception:
+            self._logger.exception(f"Warm-up {self.id} failed")
+            state = "failed"
+
+        with self._lock:
+            self.state = state
+            self.finished = time.monotonic()
+
+    def _resolve(self, data_object: Object):
+        """
+        Resolve the URIs to cache per usage (None if resolving failed)
+        """
+
+        # load master images first, so sizes are derived from them
+        usages = [MASTER, *self.usages] if env.image_derivatives else self.usages
+
+        uris = []
+        for usage in usages:
+            try:
+                uri = get_object_image_uri(data_object, usage)
+            except Exception as exception:
+                self._logger.warning(f"Resolving {data_object.id} failed ({exception})")
+                return None
+
+            # local files are not cached
+            if not is_local_uri(uri):
+                uris.append((usage, uri))
+
+        return uris
+
+    def _warm(self, object_id: str, uris, cache: Cache):
+        resolved = {usage.json(): uri for usage, uri in uris or []}
+
+        def resolve(object_id: str, usage: schemas.ImageRequest):
+            return resolved[usage.json()]
+
+        loaded, failed = 0, uris is None
+        for usage, uri in uris or []:
+            try:
+                loaded += cache.warm(object_id, usage, resolve)
+            except Exception as exception:
+                self._logger.warning(f"Warming {uri} failed ({exception})")
+                failed = True
+
+        with self._lock:
+            self.processed += 1
+            self.loaded += loaded
+            self.failed += failed
+
+
+# jobs of this process by their id
+jobs: dict[str, Warmup] = {}
+_jobs_lock = threading.Lock()
+
+
+def _prune_jobs():
+    """
+    Remove jobs finished longer than the retention period ago
+    """
+
+    expired = time.monotonic() - env.image_warmup_retention
+    for job_id, job in list(jobs.items()):
+        if job.finished is not None and job.finished < expired:
+            del jobs[job_id]
+
+
+def get_job(job_id: str) -> Warmup | None:
+    with _jobs_lock:
+        _prune_jobs()
+        return jobs.get(job_id)
+
+
+def start_warmup(request: schemas.WarmupRequest) -> Warmup:
+    """
+    Start a warm-up job, unless one is running for the project already
+    """
+
+    with _jobs_lock:
+        _prune_jobs()
+        for job in jobs.values():
+            if job.running and job.request.project_id == request.project_id:
+                return job
+
+        job = Warmup(request)
+        jobs[job.id] = job
+
+    job.start()
+    return job
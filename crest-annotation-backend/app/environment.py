@@ -6,13 +6,58 @@ class Environment(BaseSettings):
     database_url: str
     database_password: str
 
+    # connections kept open per engine (sync and async) and per worker
+    database_pool_size: int = 10
+    database_max_overflow: int = 20
+
+    # duration in seconds totals of cursor pages are reused (0 disables caching)
+    pagination_count_duration: int = 30
+
+    # duration in seconds object locks are kept without heartbeat
+    lock_duration: int = 300
+
+    # number of parsed object data kept in memory (0 disables caching)
+    object_data_cache_size: int = 4096
+    # objects resolved at once by batch requests (e.g. image info lookups)
+    object_resolve_concurrency: int = 8
+    # threads compressing and restoring annotation masks
+    mask_coding_workers: int = 4
+
     image_local: bool = False
     image_local_url: str = "/api/objects/local"
+    # serve local images through a IIIF image API (sizes and tiles)
+    image_local_iiif: bool = False
+    image_local_iiif_url: str = "/api/objects/iiif"
 
     image_cache: bool = False
     image_cache_url: str = "/api/objects/cache"
     image_cache_duration: int = 0
+    # serve outdated images while revalidating them in the background
+    image_cache_revalidate: bool = True
     image_cache_path: str = "./cache"
+    # total size in bytes of cached images (0 disables eviction)
+    image_cache_size: int = 0
+    # interval in seconds between eviction runs
+    image_cache_eviction_interval: int = 60
+
+    # derive sized images from one cached master image per object
+    image_derivatives: bool = False
+    image_derivative_master_size: int = 2048
+    image_derivative_workers: int = 2
+
+    # transcode images for browsers accepting AVIF or WebP (quality 0 to 100)
+    image_transcode: bool = False
+    image_transcode_quality: int = 80
+
+    # images loaded at once by cache warm-up jobs
+    image_warmup_concurrency: int = 4
+    # duration in seconds finished warm-up jobs are kept for status requests
+    image_warmup_retention: int = 3600
+
+    # limits of image downloads per host (rate in requests per second, 0 disables)
+    image_download_concurrency: int = 3
+    image_download_rate: float = 0
+    image_download_retries: int = 3
 
     class Config:
         env_file = ".env", ".env.local"
@@ -7,9 +7,11 @@ logging.getLogger("urllib3").setLevel(logging.WARNING)
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi_utils import openapi
+from fastapi_utils.tasks import repeat_every
 
 from .routers import labels, objects, projects
 from .api import import_router, export_router
+from .dependencies import cache
 from .environment import env
 
 
@@ -25,6 +27,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Annotation-Version", "ETag"],
 )
 
 app.include_router(labels.router)
@@ -34,6 +37,22 @@ app.include_router(projects.router)
 app.include_router(import_router)
 app.include_router(export_router)
 
+
+@app.on_event("startup")
+@repeat_every(
+    seconds=env.image_cache_eviction_interval,
+    wait_first=True,
+    logger=logging.getLogger(),
+)
+def evict_image_cache():
+    """
+    Keep the image cache within its size (runs in the thread pool)
+    """
+
+    if env.image_cache:
+        cache.evict()
+
+
 # use function names only for endpoint names,
 # which improves readability on the frontend side
 openapi.simplify_operation_ids(app)
@@ -1,8 +1,15 @@
-from sqlalchemy import Column, ForeignKey, String, Integer, Boolean, Index
+from sqlalchemy import Column, ForeignKey, String, Integer, Boolean, DateTime, Index
+from sqlalchemy.orm import deferred
 
 from ..database import Base, make_uuid
 
 
+# deferred column groups, which are only loaded on request
+ANNOTATIONS = "annotations"
+SOURCE = "source"
+SEARCH = "search"
+
+
 class Object(Base):
     __tablename__ = "objects"
 
@@ -15,9 +22,46 @@ class Object(Base):
     position = Column(Integer)
     annotated = Column(Boolean, default=False)
     synced = Column(Boolean, default=True)
-    annotation_data = Column(String, default="[]")
-    object_data = Column(String)
+    annotation_data = deferred(Column(String, default="[]"), group=ANNOTATIONS)
+    annotation_version = Column(Integer, default=0, nullable=False)
+    object_data = deferred(Column(String), group=SOURCE)
+    search_text = deferred(Column(String), group=SEARCH)
     locked_by = Column(String, default=None)
+    lease_expires = Column(DateTime, default=None)
 
 
 Index("objects_project_id_uri", Object.project_id, Object.object_uuid)
+Index(
+    "objects_project_id_position",
+    Object.project_id,
+    Object.position,
+    Object.id,
+)
+Index(
+    "objects_project_id_annotated_position",
+    Object.project_id,
+    Object.annotated,
+    Object.position,
+    Object.id,
+)
+Index(
+    "objects_project_id_synced_position",
+    Object.project_id,
+    Object.synced,
+    Object.position,
+    Object.id,
+)
+# few objects are locked at once, so only those are indexed
+Index(
+    "objects_project_id_locked",
+    Object.project_id,
+    Object.lease_expires,
+    postgresql_where=Object.locked_by.isnot(None),
+    sqlite_where=Object.locked_by.isnot(None),
+)
+Index(
+    "objects_search_text",
+    Object.search_text,
+    postgresql_using="gin",
+    postgresql_ops={"search_text": "gin_trgm_ops"},
+)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, text
+from sqlalchemy import Column, String, Integer, text
 
 from ..database import Base, make_uuid
 
@@ -13,3 +13,7 @@ class Project(Base):
     sync_type = Column(String)
     sync_config = Column(String)
     custom_fields = Column(String)
+
+    # incremented by every change, used as entity tags
+    version = Column(Integer, default=0, nullable=False)
+    labels_version = Column(Integer, default=0, nullable=False)
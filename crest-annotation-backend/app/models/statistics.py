@@ -0,0 +1,20 @@
+from sqlalchemy import Column, ForeignKey, String, Integer
+
+from ..database import Base
+
+
+class ProjectStatistics(Base):
+    __tablename__ = "project_statistics"
+
+    project_id = Column(
+        String,
+        ForeignKey(
+            "projects.id",
+            ondelete="CASCADE",
+            name="project_statistics_project_id_fkey",
+        ),
+        primary_key=True,
+    )
+    total = Column(Integer, default=0, nullable=False)
+    annotated = Column(Integer, default=0, nullable=False)
+    synced = Column(Integer, default=0, nullable=False)
@@ -3,10 +3,15 @@ from enum import auto
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import JSONResponse, Response
 from fastapi_utils.enums import StrEnum
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from ..dependencies.db import get_db
+from ..dependencies.db import get_db, get_async_db
+from ..dependencies.etag import Conditional, make_etag
+from ..dependencies.versions import touch_labels
 from ..models.labels import Label
+from ..models.projects import Project
 from .. import schemas
 
 router = APIRouter(
@@ -45,27 +50,9 @@ def order_by(sorting):
     return [mapping[sorting]]
 
 
-@router.get("/of/{project_id}", response_model=list[schemas.Label])
-def get_project_labels(
-    project_id: str,
-    sorting: Sorting = Sorting.name,
-    direction: schemas.SortDirection = schemas.SortDirection.asc,
-    starred: bool | None = None,
-    grouped: bool = False,
-    db: Session = Depends(get_db),
-):
-
-    labels: list[Label] = (
-        db.query(Label)
-        .filter_by(project_id=project_id)
-        .order_by(*map(direction.apply, order_by(sorting)))
-    )
-
-    if starred is not None:
-        labels = labels.filter_by(starred=starred)
-
+def to_tree(labels: list[Label], grouped: bool):
     if not grouped:
-        return JSONResponse(list(map(map_label, labels)))
+        return list(map(map_label, labels))
 
     # generate tree structure
     roots: list[schemas.Label] = []
@@ -79,23 +66,57 @@ def get_project_labels(
         else:
             roots.append(label)
 
-    return JSONResponse(roots)
+    return roots
+
+
+@router.get("/of/{project_id}", response_model=list[schemas.Label])
+async def get_project_labels(
+    project_id: str,
+    sorting: Sorting = Sorting.name,
+    direction: schemas.SortDirection = schemas.SortDirection.asc,
+    starred: bool | None = None,
+    grouped: bool = False,
+    conditional: Conditional = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+):
+    async def build():
+        query = (
+            select(Label)
+            .filter_by(project_id=project_id)
+            .order_by(*map(direction.apply, order_by(sorting)))
+        )
+
+        if starred is not None:
+            query = query.filter_by(starred=starred)
+
+        labels = (await db.execute(query)).scalars().all()
+        return JSONResponse(to_tree(labels, grouped))
+
+    version = await db.scalar(select(Project.labels_version).filter_by(id=project_id))
+    if version is None:
+        return await build()
+
+    return await conditional.respond_async(make_etag(project_id, version), build)
 
 
 @router.patch("/", response_model=schemas.Label)
-def update_label(
+async def update_label(
     patch: schemas.PatchLabel,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    labels = db.query(Label).filter_by(id=patch.id)
-    labels.update(patch.dict(exclude_none=True))
+    await db.execute(
+        update(Label)
+        .filter_by(id=patch.id)
+        .values(patch.dict(exclude_none=True))
+        .execution_options(synchronize_session=False)
+    )
 
-    label = labels.first()
+    label = (await db.execute(select(Label).filter_by(id=patch.id))).scalars().first()
     if not label:
         raise HTTPException(status_code=404, detail="Label not found")
 
-    db.commit()
-    db.refresh(label)
+    await db.run_sync(touch_labels, label.project_id)
+    await db.commit()
 
     return JSONResponse(map_label(label))
 
@@ -108,6 +129,7 @@ def create_label(
     label = Label(**create.dict())
 
     db.add(label)
+    touch_labels(db, label.project_id)
     db.commit()
     db.refresh(label)
 
@@ -119,10 +141,13 @@ def delete_label(
     label_id: str,
     db: Session = Depends(get_db),
 ):
+    project_id = db.query(Label.project_id).filter_by(id=label_id).scalar()
+
     modified = db.query(Label).filter_by(id=label_id).delete()
     if modified != 1:
         raise HTTPException(status_code=404, detail="Label not found")
 
+    touch_labels(db, project_id)
     db.commit()
 
     return Response()
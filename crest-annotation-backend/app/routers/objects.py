@@ -1,20 +1,70 @@
+import os
 import json
 import logging
 import base64
 
 from typing import Callable
-
-from fastapi import APIRouter, Depends, Body, HTTPException, Query
-from fastapi.responses import JSONResponse, FileResponse, Response
-from sqlalchemy.orm import Session, aliased
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+from fastapi import APIRouter, Depends, Body, HTTPException, Query, Request
+from fastapi.responses import (
+    JSONResponse,
+    RedirectResponse,
+    Response,
+    StreamingResponse,
+)
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
 from ..environment import env
-from ..dependencies.db import get_db, get_paginate
-from ..dependencies.cache import Cache
-from ..models.objects import Object
+from ..dependencies.db import (
+    get_db,
+    get_async_db,
+    get_paginate,
+    get_cursor_paginate,
+)
+from ..dependencies.cache import (
+    VERSION_LENGTH,
+    Cache,
+    get_cache_statistics,
+    is_local_uri,
+)
+from ..dependencies.iiif_image import get_info, parse_request, render_image
+from ..dependencies.filters import with_filters
+from ..dependencies.navigation import Navigation
+from ..dependencies.locks import Locks
+from ..dependencies.bulk import apply_bulk
+from ..dependencies.warmup import get_job, start_warmup
+from ..dependencies.sprites import Sprites
+from ..dependencies.etag import Conditional, get_file_version, make_etag
+from ..dependencies.responses import RangeFileResponse
+from ..dependencies.transcoding import Transcoding
+from ..dependencies.search import with_search, by_rank
+from ..dependencies.statistics import get_statistics, recompute
+from ..dependencies.masks import (
+    contains_masks,
+    decode_annotation_data,
+    decode_annotations,
+    encode_annotation_data,
+    encode_annotations,
+    has_masks,
+    run_coding,
+)
+from ..dependencies.json_patch import (
+    PatchConflict,
+    PatchError,
+    apply_patch,
+    apply_upserts,
+)
+from ..dependencies.projection import query_objects, query_summaries, select_objects
+from ..models.objects import Object, ANNOTATIONS, SOURCE
 from .. import schemas
 
 from ..api import (
+    get_object_data,
+    get_object_data_statistics,
     get_object_image_uri,
     get_object_image_description,
     get_annotations_provider,
@@ -34,50 +84,49 @@ def to_schema(data_object: Object) -> schemas.Object:
         object_uuid=data_object.object_uuid,
         position=data_object.position,
         annotated=data_object.annotated,
-        annotation_data=data_object.annotation_data,
+        annotation_data=decode_annotation_data(data_object.annotation_data),
     )
 
 
+def to_response(data_object: Object) -> JSONResponse:
+    """
+    Serialize an object with its annotations
+
+    Decoding masks is CPU bound, so async endpoints run this through
+    run_coding if the object has masks.
+    """
+
+    return JSONResponse(to_schema(data_object).dict())
+
+
 def to_summary_schema(data_object: Object) -> schemas.SummaryObject:
     return schemas.SummaryObject(
         id=data_object.id,
         object_uuid=data_object.object_uuid,
         position=data_object.position,
         annotated=data_object.annotated,
+        synced=data_object.synced,
     )
 
 
-def with_filters(query, filters: schemas.ObjectFilters):
-    if filters.annotated is not None:
-        query = query.filter_by(annotated=filters.annotated)
-    if filters.synced is not None:
-        query = query.filter_by(synced=filters.synced)
-    if filters.search:
-        search_term = f"%{filters.search}%"
-        query = query.filter(
-            Object.object_uuid.ilike(search_term)
-            | Object.object_data.ilike(search_term)
-        )
-    return query
-
-
 @router.get("/at/{project_id}", response_model=schemas.Object)
-def get_object_at(
+async def get_object_at(
     project_id: str,
     filters: schemas.ObjectFilters = Depends(),
     offset: int | None = Query(default=0),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    query = db.query(Object).filter_by(project_id=project_id)
+    query = select_objects(ANNOTATIONS).filter_by(project_id=project_id)
     query = with_filters(query, filters)
-    query = query.order_by(Object.position)
+    query = query.order_by(Object.position, Object.id)
 
-    total = query.count()
-    data_object: Object = query.order_by(Object.position).offset(offset or 0).first()
+    result = await db.execute(query.offset(offset or 0).limit(1))
+    data_object: Object = result.scalars().first()
     if not data_object:
         raise HTTPException(status_code=404, detail="No objects found")
 
-    return to_schema(data_object)
+    masked = has_masks(data_object.annotation_data)
+    return await run_coding(masked, to_response, data_object)
 
 
 @router.get("/offset/{object_id}", response_model=schemas.ObjectNavigate)
@@ -85,53 +134,37 @@ def navigate_from(
     object_id: str,
     filters: schemas.ObjectFilters = Depends(),
     offset: int = Query(default=0),
-    db: Session = Depends(get_db),
+    navigation: Navigation = Depends(Navigation),
 ):
-    if offset == 0:
-        return schemas.ObjectNavigate(id=object_id)
-
-    # self-join to find current object
-    current = aliased(Object)
-    query = db.query(Object).join(
-        current,
-        (Object.project_id == current.project_id) & (current.id == object_id),
-    )
-    query = with_filters(query, filters)
+    neighbour = navigation.neighbour(object_id, filters, offset)
+    if not neighbour:
+        raise HTTPException(status_code=404, detail="No objects match filters")
 
-    # find next image
-    if offset > 0:
-        query = (
-            query.filter(Object.position > current.position)
-            .order_by(Object.position.asc())
-            .offset(offset - 1)
-        )
+    return schemas.ObjectNavigate(id=neighbour)
 
-    # find previous image
-    if offset < 0:
-        query = (
-            query.filter(Object.position < current.position)
-            .order_by(Object.position.desc())
-            .offset(-offset - 1)
-        )
 
-    # validate result
-    data_object = query.first()
-    if not data_object:
-        raise HTTPException(status_code=404, detail="No objects match filters")
-
-    print(str(query))
-    return schemas.ObjectNavigate(id=data_object.id)
+@router.get("/window/{object_id}", response_model=schemas.ObjectWindow)
+def navigate_window(
+    object_id: str,
+    filters: schemas.ObjectFilters = Depends(),
+    before: int = Query(default=10, ge=0, le=1000),
+    after: int = Query(default=10, ge=0, le=1000),
+    navigation: Navigation = Depends(Navigation),
+):
+    return navigation.window(object_id, filters, before, after)
 
 
 @router.get("/total-of/{project_id}", response_model=schemas.TotalOf)
-def get_objects_count(project_id: str, db: Session = Depends(get_db)):
-    total = db.query(Object).filter_by(project_id=project_id)
-    annotated = total.filter_by(annotated=True)
+async def get_objects_count(project_id: str, db: AsyncSession = Depends(get_async_db)):
+    return schemas.TotalOf(**await db.run_sync(get_statistics, project_id))
 
-    return schemas.TotalOf(
-        total=total.count(),
-        annotated=annotated.count(),
-    )
+
+@router.post("/recount-of/{project_id}", response_model=schemas.TotalOf)
+def recount_objects(project_id: str, db: Session = Depends(get_db)):
+    statistics = recompute(db.connection(), project_id)
+    db.commit()
+
+    return schemas.TotalOf(**statistics)
 
 
 @router.get("/of/{project_id}", response_model=schemas.Paginated[schemas.SummaryObject])
@@ -141,82 +174,211 @@ def get_objects(
     paginate: Callable = Depends(get_paginate),
     db: Session = Depends(get_db),
 ):
-    query = db.query(Object).filter_by(project_id=project_id)
+    query = query_summaries(db).filter_by(project_id=project_id)
     query = with_filters(query, filters)
     query = query.order_by(Object.position)
 
     return paginate(query, to_summary_schema)
 
 
+@router.get(
+    "/cursor-of/{project_id}",
+    response_model=schemas.CursorPaginated[schemas.SummaryObject],
+)
+def get_objects_by_cursor(
+    project_id: str,
+    filters: schemas.ObjectFilters = Depends(),
+    paginate: Callable = Depends(get_cursor_paginate),
+    db: Session = Depends(get_db),
+):
+    query = query_summaries(db).filter_by(project_id=project_id)
+    query = with_filters(query, filters)
+
+    # position is not unique, so the id breaks ties
+    return paginate(query, [Object.position, Object.id], to_summary_schema)
+
+
+@router.get("/search/{project_id}", response_model=list[schemas.SummaryObject])
+def search_objects(
+    project_id: str,
+    search: str,
+    limit: int = Query(default=20, ge=1, le=1000),
+    db: Session = Depends(get_db),
+):
+    query = query_summaries(db).filter_by(project_id=project_id)
+    query = with_search(query, search)
+    query = by_rank(query, search)
+
+    return list(map(to_summary_schema, query.limit(limit)))
+
+
 @router.get("/all-of/{project_id}", response_model=list[schemas.SummaryObject])
-def get_all_objects(project_id: str, db: Session = Depends(get_db)):
-    objects: list[schemas.Object] = db.query(Object).filter_by(project_id=project_id)
+def get_all_objects(
+    project_id: str,
+    stream: bool = False,
+    db: Session = Depends(get_db),
+):
+    # only load the columns required for summaries
+    objects = (
+        db.query(
+            Object.id,
+            Object.object_uuid,
+            Object.position,
+            Object.annotated,
+            Object.synced,
+        )
+        .filter_by(project_id=project_id)
+        .order_by(Object.position, Object.id)
+    )
+
+    if not stream:
+        return list(map(to_summary_schema, objects))
 
-    return map(to_summary_schema, objects)
+    # emit one JSON object per line while rows are fetched from a server-side cursor,
+    # so memory usage does not depend on the project size
+    def generate():
+        for data_object in objects.yield_per(1000):
+            yield to_summary_schema(data_object).json() + "\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
 
 @router.get("/id/{object_id}", response_model=schemas.Object)
-def get_object(object_id: str, db: Session = Depends(get_db)):
-    data_object: Object = db.query(Object).filter_by(id=object_id).first()
-    if not data_object:
+async def get_object(
+    object_id: str,
+    conditional: Conditional = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+):
+    result = await db.execute(
+        select(Object.annotation_version, Object.annotated, Object.position).filter_by(
+            id=object_id
+        )
+    )
+    version = result.first()
+    if not version:
         raise HTTPException(status_code=404, detail="Object not found")
 
-    return to_schema(data_object)
+    async def build():
+        result = await db.execute(select_objects(ANNOTATIONS).filter_by(id=object_id))
+        data_object: Object = result.scalars().one()
+        masked = has_masks(data_object.annotation_data)
+        return await run_coding(masked, to_response, data_object)
+
+    return await conditional.respond_async(make_etag(object_id, *version), build)
 
 
 @router.post("/finish/{object_id}")
-def finish_object(object_id: str, finished: bool = True, db: Session = Depends(get_db)):
-    data_object: Object = db.query(Object).filter_by(id=object_id).first()
+async def finish_object(
+    object_id: str, finished: bool = True, db: AsyncSession = Depends(get_async_db)
+):
+    result = await db.execute(select(Object).filter_by(id=object_id))
+    data_object: Object = result.scalars().first()
     if not data_object:
         raise HTTPException(status_code=404, detail="Object not found")
 
     data_object.annotated = finished
-    data_object.locked = False
-    db.commit()
+    data_object.locked_by = None
+    data_object.lease_expires = None
+    await db.commit()
 
     return Response()
 
 
-@router.post("/lock/{object_id}/{session_id}")
+@router.post("/bulk", response_model=schemas.BulkResult)
+def bulk_objects(bulk: schemas.BulkObjects, db: Session = Depends(get_db)):
+    if bulk.ids is None and bulk.filters is None:
+        raise HTTPException(status_code=422, detail="Either ids or filters required")
+
+    if not db.query(Project.id).filter_by(id=bulk.project_id).first():
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    return apply_bulk(db, bulk)
+
+
+@router.post("/lock/{object_id}/{session_id}", response_model=schemas.LockStatus)
 def lock_object(
-    object_id: str, session_id: str, force: bool = False, db: Session = Depends(get_db)
+    object_id: str,
+    session_id: str,
+    force: bool = False,
+    db: Session = Depends(get_db),
+    locks: Locks = Depends(),
 ):
-    data_object: Object = db.query(Object).filter_by(id=object_id).first()
-    if not data_object:
+    if not db.query(Object.id).filter_by(id=object_id).first():
         raise HTTPException(status_code=404, detail="Object not found")
 
-    if force or data_object.locked_by is None:
-        data_object.locked_by = session_id
+    locks.acquire(object_id, session_id, force)
 
-    db.commit()
+    return locks.status([object_id], session_id)[0]
 
-    return Response()
+
+@router.post("/heartbeat/{object_id}/{session_id}", response_model=schemas.LockStatus)
+def heartbeat_object(
+    object_id: str,
+    session_id: str,
+    db: Session = Depends(get_db),
+    locks: Locks = Depends(),
+):
+    if not db.query(Object.id).filter_by(id=object_id).first():
+        raise HTTPException(status_code=404, detail="Object not found")
+
+    if not locks.heartbeat(object_id, session_id):
+        raise HTTPException(status_code=409, detail="Object is not locked")
+
+    return locks.status([object_id], session_id)[0]
 
 
 @router.post("/unlock/{object_id}")
 def unlock_object(
-    object_id: str, session_id: str | None = None, db: Session = Depends(get_db)
+    object_id: str,
+    session_id: str | None = None,
+    db: Session = Depends(get_db),
+    locks: Locks = Depends(),
 ):
-    data_object: Object = db.query(Object).filter_by(id=object_id).first()
-    if not data_object:
+    if not db.query(Object.id).filter_by(id=object_id).first():
         raise HTTPException(status_code=404, detail="Object not found")
 
-    if session_id is None or data_object.locked_by == session_id:
-        data_object.locked_by = None
-
-    data_object.locked_by = None
-    db.commit()
+    locks.release(object_id, session_id)
 
     return Response()
 
 
 @router.get("/lock/{object_id}/{session_id}")
-def get_lock_status(object_id: str, session_id: str, db: Session = Depends(get_db)):
-    data_object: Object = db.query(Object).filter_by(id=object_id).first()
-    if not data_object:
+def get_lock_status(object_id: str, session_id: str, locks: Locks = Depends()):
+    status = locks.status([object_id], session_id)
+    if not status:
         raise HTTPException(status_code=404, detail="Object not found")
 
-    return JSONResponse({"locked": data_object.locked_by == session_id})
+    return JSONResponse({"locked": status[0].owned})
+
+
+@router.post("/lock-status", response_model=list[schemas.LockStatus])
+def get_lock_statuses(
+    object_ids: list[str] = Body(),
+    session_id: str | None = None,
+    locks: Locks = Depends(),
+):
+    return locks.status(object_ids, session_id)
+
+
+def to_served_uri(
+    object_id: str, usage: schemas.ImageRequest, image_uri: str, cache: Cache
+) -> str:
+    """
+    Get the URI to serve an object image from (cached if enabled)
+    """
+
+    # disable caching for local files
+    if is_local_uri(image_uri) or not env.image_cache:
+        return image_uri
+
+    uri = f"{env.image_cache_url}/{cache.encode(object_id, usage)}"
+
+    # version images loaded already, so browsers keep them
+    version = cache.get_version(object_id, usage)
+    if version:
+        uri = f"{uri}?v={version}"
+
+    return uri
 
 
 @router.post("/uri/{object_id}")
@@ -226,20 +388,12 @@ def get_image_uri(
     db: Session = Depends(get_db),
     cache: Cache = Depends(Cache),
 ):
-    data_object: Object = db.query(Object).filter_by(id=object_id).first()
+    data_object: Object = query_objects(db, SOURCE).filter_by(id=object_id).first()
     if not data_object:
         raise HTTPException(status_code=404, detail="Object not found")
 
-    # disable caching for local files
     image_uri = get_object_image_uri(data_object, usage)
-    local = image_uri.lower().startswith(env.image_local_url.lower())
-
-    # inject cache if enabled
-    if not local and env.image_cache:
-        uri = f"{env.image_cache_url}/{cache.encode(object_id, usage)}"
-        return JSONResponse(uri)
-
-    return JSONResponse(image_uri)
+    return JSONResponse(to_served_uri(object_id, usage, image_uri, cache))
 
 
 @router.get("/describe/{object_id}")
@@ -248,7 +402,7 @@ def get_image_description(
     db: Session = Depends(get_db),
     cache: Cache = Depends(Cache),
 ):
-    data_object: Object = db.query(Object).filter_by(id=object_id).first()
+    data_object: Object = query_objects(db, SOURCE).filter_by(id=object_id).first()
     if not data_object:
         raise HTTPException(status_code=404, detail="Object not found")
 
@@ -256,62 +410,427 @@ def get_image_description(
     return JSONResponse(description)
 
 
+@router.post("/resolve", response_model=schemas.ResolvedObjects)
+def resolve_objects(
+    request: schemas.ResolveObjects,
+    db: Session = Depends(get_db),
+    cache: Cache = Depends(Cache),
+):
+    groups = (SOURCE, ANNOTATIONS) if request.annotations else (SOURCE,)
+    query = query_objects(db, *groups).filter(Object.id.in_(request.ids))
+
+    # load in this thread, as sessions are not thread safe
+    found = {
+        data_object.id: (
+            data_object,
+            data_object.annotation_data if request.annotations else None,
+        )
+        for data_object in query
+    }
+
+    # image services are requested concurrently (e.g. IIIF info.json)
+    def resolve(object_id: str) -> schemas.ResolvedObject:
+        data_object, annotation_data = found[object_id]
+        try:
+            # malformed object data fails the object only, not the batch
+            object_data = get_object_data(data_object)
+            uris = [
+                to_served_uri(object_id, usage, object_data.get_image_uri(usage), cache)
+                for usage in request.usages
+            ]
+            description = object_data.get_image_description()
+            # masks are served decoded, like by all other read paths
+            annotation_data = decode_annotation_data(annotation_data)
+        except Exception as exception:
+            error = getattr(exception, "detail", None) or str(exception)
+            return schemas.ResolvedObject(id=object_id, error=error)
+
+        return schemas.ResolvedObject(
+            id=object_id,
+            uris=uris,
+            description=description,
+            annotation_data=annotation_data,
+        )
+
+    ids = list(dict.fromkeys(request.ids))
+    with ThreadPoolExecutor(
+        max_workers=max(env.object_resolve_concurrency, 1)
+    ) as executor:
+        objects = list(executor.map(resolve, [id for id in ids if id in found]))
+
+    return schemas.ResolvedObjects(
+        objects=objects, missing=[id for id in ids if id not in found]
+    )
+
+
+@router.get("/cache/stats", response_model=schemas.CacheStatistics)
+def get_cache_stats():
+    if not env.image_cache:
+        raise HTTPException(status_code=404, detail="Image cache disabled")
+
+    return get_cache_statistics()
+
+
+@router.get("/data/stats", response_model=schemas.ObjectDataStatistics)
+def get_object_data_stats():
+    return get_object_data_statistics()
+
+
+@router.get("/sprite/{project_id}", response_model=schemas.SpritePage)
+def get_objects_sprite(
+    project_id: str,
+    filters: schemas.ObjectFilters = Depends(),
+    paginate: Callable = Depends(get_paginate),
+    db: Session = Depends(get_db),
+    sprites: Sprites = Depends(),
+):
+    if not env.image_cache:
+        raise HTTPException(status_code=404, detail="Image cache disabled")
+
+    query = query_summaries(db).filter_by(project_id=project_id)
+    query = with_filters(query, filters)
+    query = query.order_by(Object.position)
+    objects = paginate(query, to_summary_schema)
+
+    # thumbnails are resolved from the sources of the page
+    ids = [item.id for item in objects.items]
+    sources = {
+        data_object.id: data_object
+        for data_object in query_objects(db, SOURCE).filter(Object.id.in_(ids))
+    }
+    sprite = sprites.get([sources[id] for id in ids if id in sources])
+
+    return schemas.SpritePage(objects=objects, sprite=sprite)
+
+
+@router.post("/warmup", response_model=schemas.WarmupStatus)
+def warmup_cache(request: schemas.WarmupRequest, db: Session = Depends(get_db)):
+    if not env.image_cache:
+        raise HTTPException(status_code=404, detail="Image cache disabled")
+
+    if not db.query(Project.id).filter_by(id=request.project_id).first():
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    return start_warmup(request).status()
+
+
+def get_warmup_job(job_id: str):
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Warm-up not found")
+
+    return job
+
+
+@router.get("/warmup/{job_id}", response_model=schemas.WarmupStatus)
+def get_warmup(job_id: str):
+    return get_warmup_job(job_id).status()
+
+
+@router.post("/warmup/{job_id}/cancel", response_model=schemas.WarmupStatus)
+def cancel_warmup(job_id: str):
+    job = get_warmup_job(job_id)
+    job.cancel()
+
+    return job.status()
+
+
+@router.post("/warmup/{job_id}/resume", response_model=schemas.WarmupStatus)
+def resume_warmup(job_id: str):
+    job = get_warmup_job(job_id)
+    if job.running:
+        raise HTTPException(status_code=409, detail="Warm-up is running")
+
+    job.start()
+    return job.status()
+
+
+@router.get("/cache/sprites/{file}")
+def get_sprite_image(
+    file: str,
+    request: Request,
+    conditional: Conditional = Depends(),
+    transcoding: Transcoding = Depends(),
+    cache: Cache = Depends(Cache),
+):
+    path = cache.get_generated_file(file)
+    etag = transcoding.tag(file[:VERSION_LENGTH])
+
+    def build():
+        served = path
+
+        # send smaller formats to browsers accepting them
+        if transcoding.media_type:
+            served = cache.get_transcoded(path, transcoding.media_type)
+
+        return RangeFileResponse(
+            served,
+            request,
+            media_type=transcoding.media_type or "image/jpeg",
+            headers={"ETag": etag},
+        )
+
+    # sprites are named by their content, so they never change
+    return transcoding.vary(conditional.respond(etag, build, immutable=True))
+
+
 @router.get("/cache/{encoded}")
 def get_cached_image(
-    encoded: str, db: Session = Depends(get_db), cache: Cache = Depends(Cache)
+    encoded: str,
+    request: Request,
+    v: str | None = None,
+    conditional: Conditional = Depends(),
+    transcoding: Transcoding = Depends(),
+    db: Session = Depends(get_db),
+    cache: Cache = Depends(Cache),
 ):
     # lazily resolve missed object
     def resolve(object_id: str, usage: schemas.ImageRequest):
-        data_object: Object = db.query(Object).filter_by(id=object_id).first()
+        data_object: Object = query_objects(db, SOURCE).filter_by(id=object_id).first()
         if not data_object:
             raise HTTPException(status_code=404, detail="Object not found")
 
         return get_object_image_uri(data_object, usage)
 
-    return FileResponse(cache.get(encoded, resolve))
+    path = cache.get(encoded, resolve)
+    version = cache.get_file_version(path)
+    etag = transcoding.tag(version)
+
+    def build():
+        served = path
+
+        # send smaller formats to browsers accepting them
+        if transcoding.media_type:
+            served = cache.get_transcoded(path, transcoding.media_type)
+
+        return RangeFileResponse(
+            served, request, media_type=transcoding.media_type, headers={"ETag": etag}
+        )
+
+    # URLs containing the current version always refer to the same content
+    return transcoding.vary(conditional.respond(etag, build, immutable=v == version))
 
 
 @router.get("/local/{encoded}")
-def get_local_image(encoded: str):
+def get_local_image(
+    encoded: str,
+    request: Request,
+    v: str | None = None,
+    usage: schemas.ImageRequest = Depends(),
+    conditional: Conditional = Depends(),
+    transcoding: Transcoding = Depends(),
+    cache: Cache = Depends(Cache),
+):
     decoded = base64.b32decode(encoded).decode()
+    version = get_file_version(decoded)
+    etag = transcoding.tag(version)
+
+    def build():
+        path = decoded
+
+        # serve smaller sizes of (possibly large) originals
+        if env.image_cache and env.image_derivatives and (usage.width or usage.height):
+            path = cache.get_local(decoded, usage)
+
+        # send smaller formats to browsers accepting them
+        if transcoding.media_type:
+            path = cache.get_transcoded(path, transcoding.media_type)
+
+        return RangeFileResponse(
+            path, request, media_type=transcoding.media_type, headers={"ETag": etag}
+        )
+
+    # derivatives depend on the original only, so its version applies
+    return transcoding.vary(conditional.respond(etag, build, immutable=v == version))
+
 
-    return FileResponse(decoded)
+def get_iiif_source(identifier: str) -> str:
+    if not env.image_local_iiif:
+        raise HTTPException(status_code=404, detail="Local IIIF server disabled")
+
+    source = base64.b32decode(identifier).decode()
+    if not os.path.isfile(source):
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    return source
+
+
+@router.get("/iiif/{identifier}")
+def get_iiif_service(identifier: str):
+    get_iiif_source(identifier)
+
+    return RedirectResponse(f"{identifier}/info.json", status_code=303)
+
+
+@router.get("/iiif/{identifier}/info.json")
+def get_iiif_info(identifier: str, request: Request):
+    source = get_iiif_source(identifier)
+
+    # identifiers of image services are absolute
+    uri = urljoin(str(request.base_url), f"{env.image_local_iiif_url}/{identifier}")
+
+    return JSONResponse(get_info(source, uri))
+
+
+@router.get("/iiif/{identifier}/{region}/{size}/{rotation}/{image}")
+def get_iiif_image(
+    identifier: str,
+    region: str,
+    size: str,
+    rotation: str,
+    image: str,
+    request: Request,
+    cache: Cache = Depends(Cache),
+):
+    source = get_iiif_source(identifier)
+    try:
+        iiif_request = parse_request(source, region, size, rotation, image)
+    except ValueError as exception:
+        raise HTTPException(status_code=400, detail=str(exception))
+
+    modified = os.stat(source).st_mtime_ns
+
+    def render():
+        return render_image(source, modified, iiif_request)
+
+    # rendered images are cached under their canonical request
+    if env.image_cache:
+        path = cache.get_rendered(source, iiif_request.canonical, render)
+        return RangeFileResponse(path, request, media_type=iiif_request.media_type)
+
+    return Response(render(), media_type=iiif_request.media_type)
 
 
 @router.get("/annotations/{object_id}")
-def get_annotations(object_id: str, db: Session = Depends(get_db)):
-    data_object: Object = db.query(Object).filter_by(id=object_id).first()
-    if not data_object:
+async def get_annotations(
+    object_id: str,
+    conditional: Conditional = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+):
+    version = await db.scalar(select(Object.annotation_version).filter_by(id=object_id))
+    if version is None:
         raise HTTPException(status_code=404, detail="Object not found")
 
-    return JSONResponse(data_object.annotation_data)
+    async def build():
+        result = await db.execute(
+            select(Object.annotation_version, Object.annotation_data).filter_by(
+                id=object_id
+            )
+        )
+        data_object = result.one()
+
+        # decoding masks is CPU bound, so it must not block the event loop
+        def respond():
+            return JSONResponse(
+                decode_annotation_data(data_object.annotation_data),
+                headers={"X-Annotation-Version": str(data_object.annotation_version)},
+            )
+
+        return await run_coding(has_masks(data_object.annotation_data), respond)
+
+    response = await conditional.respond_async(make_etag(object_id, version), build)
+    response.headers.setdefault("X-Annotation-Version", str(version))
+
+    return response
 
 
 @router.post("/annotations/{object_id}")
-def store_annotations(
+async def store_annotations(
     object_id: str,
     session_id: str | None = None,
     annotation_data: str = Body(),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    data_object: Object = db.query(Object).filter_by(id=object_id).first()
+    result = await db.execute(select(Object).filter_by(id=object_id))
+    data_object: Object = result.scalars().first()
+    if not data_object:
+        raise HTTPException(status_code=404, detail="Object not found")
+
+    if session_id is not None and data_object.locked_by != session_id:
+        raise HTTPException(status_code=403, detail="Object is locked")
+
+    try:
+        # encoding masks is CPU bound, so it must not block the event loop
+        annotation_data = await run_coding(
+            has_masks(annotation_data), encode_annotation_data, annotation_data
+        )
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=422, detail="Invalid annotations")
+
+    data_object.annotated = False
+    data_object.synced = False
+    data_object.annotation_data = annotation_data
+    data_object.annotation_version += 1
+    await db.commit()
+
+    return Response(
+        headers={"X-Annotation-Version": str(data_object.annotation_version)},
+    )
+
+
+@router.patch("/annotations/{object_id}", response_model=schemas.AnnotationsVersion)
+async def patch_annotations(
+    object_id: str,
+    patch: schemas.AnnotationsPatch,
+    session_id: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    # lock the row, so concurrent patches are applied one after another
+    result = await db.execute(
+        select_objects(ANNOTATIONS).filter_by(id=object_id).with_for_update()
+    )
+    data_object: Object = result.scalars().first()
     if not data_object:
         raise HTTPException(status_code=404, detail="Object not found")
 
     if session_id is not None and data_object.locked_by != session_id:
         raise HTTPException(status_code=403, detail="Object is locked")
 
+    if data_object.annotation_version != patch.version:
+        raise HTTPException(status_code=409, detail="Annotations have been modified")
+
+    operations = [
+        operation.dict(by_alias=True, exclude_unset=True)
+        for operation in patch.operations
+    ]
+
+    # decoding, patching and encoding masks is CPU bound, so it must not
+    # block the event loop
+    def apply(annotation_data: str) -> str:
+        annotations = apply_patch(
+            decode_annotations(json.loads(annotation_data or "[]")), operations
+        )
+        if patch.upsert or patch.delete:
+            annotations = apply_upserts(annotations, patch.upsert, patch.delete)
+
+        return json.dumps(encode_annotations(annotations), separators=(",", ":"))
+
+    try:
+        masked = (
+            has_masks(data_object.annotation_data)
+            or contains_masks(operations)
+            or contains_masks(patch.upsert)
+        )
+        annotation_data = await run_coding(masked, apply, data_object.annotation_data)
+    except PatchConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except PatchError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=422, detail="Invalid annotations")
+
     data_object.annotated = False
     data_object.synced = False
     data_object.annotation_data = annotation_data
-    db.commit()
+    data_object.annotation_version += 1
+    await db.commit()
 
-    return Response()
+    return schemas.AnnotationsVersion(version=data_object.annotation_version)
 
 
 @router.post("/annotations/pull/{object_id}")
 def pull_annotations(object_id: str, db: Session = Depends(get_db)):
-    data_object: Object = db.query(Object).filter_by(id=object_id).first()
+    data_object: Object = query_objects(db, SOURCE).filter_by(id=object_id).first()
     if not data_object:
         raise HTTPException(status_code=404, detail="Object not found")
 
@@ -330,7 +849,7 @@ def push_annotations(
     annotation_data: str = Body(),
     db: Session = Depends(get_db),
 ):
-    data_object: Object = db.query(Object).filter_by(id=object_id).first()
+    data_object: Object = query_objects(db, SOURCE).filter_by(id=object_id).first()
     if not data_object:
         raise HTTPException(status_code=404, detail="Object not found")
 
@@ -345,6 +864,7 @@ def push_annotations(
     # reset the annotations in the database
     data_object.synced = True
     data_object.annotation_data = "[]"
+    data_object.annotation_version += 1
     db.commit()
 
     return Response()
@@ -366,6 +886,7 @@ def reset_annotations(
     # reset the annotations in the database
     data_object.synced = True
     data_object.annotation_data = "[]"
+    data_object.annotation_version += 1
     db.commit()
 
     return Response()
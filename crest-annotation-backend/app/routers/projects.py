@@ -3,10 +3,13 @@ from typing import Callable
 
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import JSONResponse, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from ..dependencies.colors import Colors, ColorTable
-from ..dependencies.db import get_db, get_paginate
+from ..dependencies.db import get_db, get_async_db, get_paginate
+from ..dependencies.etag import Conditional, make_etag
 from ..models.projects import Project
 from .. import schemas
 
@@ -69,16 +72,21 @@ def get_projects(
 
 
 @router.get("/by-id/{project_id}", response_model=schemas.Project)
-def get_project(
+async def get_project(
     project_id: str,
     mapper: Mapper = Depends(Mapper),
-    db: Session = Depends(get_db),
+    conditional: Conditional = Depends(),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    project: Project = db.query(Project).filter_by(id=project_id).first()
+    result = await db.execute(select(Project).filter_by(id=project_id))
+    project: Project = result.scalars().first()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    return JSONResponse(mapper.to_dict(project))
+    return conditional.respond(
+        make_etag(project_id, project.version),
+        lambda: JSONResponse(mapper.to_dict(project)),
+    )
 
 
 @router.patch("/", response_model=schemas.Project)
@@ -88,7 +96,12 @@ def update_project(
     db: Session = Depends(get_db),
 ):
     projects = db.query(Project).filter_by(id=patch.id)
-    projects.update(mapper.map_dict(patch.dict(exclude_none=True)))
+    projects.update(
+        {
+            **mapper.map_dict(patch.dict(exclude_none=True)),
+            Project.version: Project.version + 1,
+        }
+    )
 
     project = projects.first()
     if not project:
@@ -1,3 +1,12 @@
+from .cache import (
+    CacheStatistics,
+    ObjectDataStatistics,
+    WarmupRequest,
+    WarmupStatus,
+    SpriteTile,
+    Sprite,
+    SpritePage,
+)
 from .label import Label, PatchLabel, CreateLabel
 from .object import (
     BaseObject,
@@ -7,7 +16,17 @@ from .object import (
     ImageRequest,
     ObjectFilters,
     ObjectNavigate,
+    ObjectWindow,
     TotalOf,
+    PatchOperation,
+    AnnotationsPatch,
+    AnnotationsVersion,
+    LockStatus,
+    BulkObjects,
+    BulkResult,
+    ResolveObjects,
+    ResolvedObject,
+    ResolvedObjects,
 )
 from .project import Project, PatchProject, CreateProject
-from .sorting import SortDirection, Paginated
+from .sorting import SortDirection, Paginated, CursorPaginated
@@ -0,0 +1,65 @@
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel
+
+from .object import ImageRequest, ObjectFilters, SummaryObject
+from .sorting import Paginated
+
+
+class CacheStatistics(BaseModel):
+    files: int
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evicted: int
+    stale: int
+    revalidated: int
+    refreshed: int
+    revalidation_errors: int
+
+
+class ObjectDataStatistics(BaseModel):
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+
+
+class WarmupRequest(BaseModel):
+    project_id: str
+    filters: ObjectFilters | None
+    usages: list[ImageRequest] | None
+
+
+class WarmupStatus(BaseModel):
+    id: str
+    project_id: str
+    status: Literal["running", "cancelled", "completed", "failed"]
+    total: int
+    processed: int
+    loaded: int
+    failed: int
+    started: datetime
+    eta: float | None
+
+
+class SpriteTile(BaseModel):
+    id: str
+    x: int
+    y: int
+    width: int
+    height: int
+
+
+class Sprite(BaseModel):
+    uri: str | None
+    width: int
+    height: int
+    tiles: list[SpriteTile]
+
+
+class SpritePage(BaseModel):
+    objects: Paginated[SummaryObject]
+    sprite: Sprite
@@ -1,4 +1,7 @@
-from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
 
 
 from .modifiers import create, patch, response
@@ -40,10 +43,74 @@ class ObjectFilters(BaseModel):
     search: str | None
 
 
+class BulkObjects(BaseModel):
+    operation: Literal["finish", "unfinish", "unlock", "reset", "delete"]
+    project_id: str
+    ids: list[str] | None
+    filters: ObjectFilters | None
+
+
 class ObjectNavigate(BaseModel):
     id: str
 
 
+class ObjectWindow(BaseModel):
+    before: list[str]
+    after: list[str]
+
+
 class TotalOf(BaseModel):
     total: int
     annotated: int
+    synced: int
+    locked: int
+
+
+class PatchOperation(BaseModel):
+    op: Literal["add", "remove", "replace", "move", "copy", "test"]
+    path: str
+    from_: str | None = Field(alias="from")
+    value: Any
+
+
+class AnnotationsPatch(BaseModel):
+    version: int
+    operations: list[PatchOperation] = []
+    upsert: list[dict[str, Any]] = []
+    delete: list[str] = []
+
+
+class AnnotationsVersion(BaseModel):
+    version: int
+
+
+class LockStatus(BaseModel):
+    id: str
+    locked: bool
+    owned: bool
+    expires: datetime | None
+
+
+class BulkResult(BaseModel):
+    affected: int
+    statistics: TotalOf
+
+
+class ResolveObjects(BaseModel):
+    ids: list[str]
+    usages: list[ImageRequest]
+    annotations: bool = False
+
+
+class ResolvedObject(BaseModel):
+    id: str
+    # image URIs in the order of the requested usages
+    uris: list[str] | None
+    description: str | None
+    annotation_data: str | None
+    error: str | None
+
+
+class ResolvedObjects(BaseModel):
+    objects: list[ResolvedObject]
+    missing: list[str]
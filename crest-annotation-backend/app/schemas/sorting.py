@@ -31,3 +31,11 @@ class Paginated(GenericModel, Generic[T]):
     pages: int
     page: int
     size: int
+
+
+class CursorPaginated(GenericModel, Generic[T]):
+    items: list[T]
+    next: str | None
+    prev: str | None
+    size: int
+    total: int | None
@@ -0,0 +1,54 @@
+import logging
+
+from sqlalchemy import or_
+from sqlalchemy.orm import load_only
+
+from app.database import SessionLocal
+from app.models.objects import Object
+from app.api import parse_object_data
+from app.api.service_image_iiif.info import record_image_info
+
+
+# record image dimensions of IIIF objects imported before they were stored,
+# so their image URIs can be computed without requesting the image servers
+BATCH_SIZE = 100
+
+logger = logging.getLogger()
+
+db = SessionLocal()
+try:
+    objects = (
+        db.query(Object)
+        .options(load_only(Object.id, Object.object_data))
+        .filter(
+            or_(
+                Object.object_data.like('%"type": "iiif2"%'),
+                Object.object_data.like('%"type": "iiif3"%'),
+            )
+        )
+        .filter(~Object.object_data.like('%"info": {%'))
+        .order_by(Object.id)
+    )
+
+    def backfill(batch: list[Object]) -> int:
+        parsed = [parse_object_data(data_object.object_data) for data_object in batch]
+        record_image_info(parsed, logger)
+
+        for data_object, data in zip(batch, parsed):
+            if data.info is not None:
+                data_object.object_data = data.json()
+
+        db.commit()
+        return sum(data.info is not None for data in parsed)
+
+    # batches are loaded after the previous one, as commits expire loaded rows
+    count = 0
+    last_id = ""
+    while batch := objects.filter(Object.id > last_id).limit(BATCH_SIZE).all():
+        last_id = batch[-1].id
+        count += backfill(batch)
+
+    print(f"Recorded image information of {count} objects")
+
+finally:
+    db.close()
@@ -0,0 +1,82 @@
+import json
+import random
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker, undefer_group
+
+from app.database import Base
+from app.models.objects import Object, ANNOTATIONS, SOURCE, SEARCH
+from app.models.projects import Project
+from app.dependencies.projection import query_summaries
+
+
+# measure the bytes transferred per page of /objects/of on a synthetic project,
+# comparing full rows (previous behaviour) against the summary projection
+OBJECTS = 500
+PAGE_SIZE = 50
+SHAPES = 20
+MASK_SIZE = 64
+
+engine = create_engine("sqlite://")
+Base.metadata.create_all(engine)
+db = sessionmaker(bind=engine)()
+
+
+def make_annotations():
+    return json.dumps(
+        [
+            {
+                "id": f"annotation-{i}",
+                "shapes": [
+                    {
+                        "type": "Mask",
+                        "mask": [
+                            [
+                                int(bit)
+                                for bit in f"{random.getrandbits(MASK_SIZE):0{MASK_SIZE}b}"
+                            ]
+                            for _ in range(MASK_SIZE)
+                        ],
+                    }
+                ],
+            }
+            for i in range(SHAPES)
+        ]
+    )
+
+
+db.add(Project(id="benchmark", name="benchmark"))
+db.add_all(
+    Object(
+        project_id="benchmark",
+        object_uuid=f"object-{i}",
+        position=i,
+        annotation_data=make_annotations() if i % 5 == 0 else "[]",
+        object_data=json.dumps({"type": "fs", "path": f"object-{i}"}),
+        search_text=f"object-{i}",
+    )
+    for i in range(OBJECTS)
+)
+db.commit()
+
+
+def measure(query) -> int:
+    """
+    Sum the size of all values returned by the database for one page
+    """
+
+    page = query.filter_by(project_id="benchmark").order_by(Object.position)
+    # execute on the connection to retrieve raw column values instead of entities
+    rows = db.connection().execute(page.limit(PAGE_SIZE).statement)
+
+    return sum(len(str(value)) for row in rows for value in row if value is not None)
+
+
+full = db.query(Object).options(*map(undefer_group, (ANNOTATIONS, SOURCE, SEARCH)))
+before = measure(full)
+after = measure(query_summaries(db))
+
+print(f"Bytes per page of {PAGE_SIZE} objects:")
+print(f"  full rows:          {before:>12,}")
+print(f"  summary projection: {after:>12,}")
+print(f"  reduction:          {before / after:>11.1f}x")
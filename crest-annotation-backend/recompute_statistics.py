@@ -0,0 +1,9 @@
+from app.database import engine
+from app.dependencies.statistics import recompute_all
+
+
+# recompute per project object counters, e.g. after manual database changes
+with engine.begin() as connection:
+    count = recompute_all(connection)
+
+print(f"Recomputed statistics of {count} projects")
@@ -0,0 +1,26 @@
+from sqlalchemy.orm import load_only
+
+from app.database import SessionLocal
+from app.models.objects import Object
+from app.api import get_object_search_text
+
+
+# rebuild the search text of all objects, e.g. after changing the extracted fields
+db = SessionLocal()
+try:
+    objects = (
+        db.query(Object)
+        .options(load_only(Object.id, Object.object_uuid, Object.object_data))
+        .order_by(Object.id)
+    )
+
+    count = 0
+    for data_object in objects.yield_per(1000):
+        data_object.search_text = get_object_search_text(data_object)
+        count += 1
+
+    db.commit()
+    print(f"Reindexed {count} objects")
+
+finally:
+    db.close()
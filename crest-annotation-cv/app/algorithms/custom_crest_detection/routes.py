@@ -9,6 +9,7 @@ import numpy as np
 import cv2
 
 from uuid import uuid4
+from functools import partial
 from urllib import request
 
 from sam2.automatic_mask_generator import SAM2AutomaticMaskGenerator
@@ -31,6 +32,8 @@ cache_index = None
 segmentations_path = "./cache/custom_crest_detection/"
 # TODO: configure from environment
 backend = "http://localhost:8000"
+# objects resolved per request to the backend
+resolve_batch_size = 500
 
 
 @torch.inference_mode()
@@ -72,8 +75,26 @@ def run_segmentation(
     return masks
 
 
+def resolve_uris(object_ids: list[str]) -> dict[str, str | None]:
+    # resolve the images of many objects per request instead of one by one
+    uris = {}
+    for start in range(0, len(object_ids), resolve_batch_size):
+        response = requests.post(
+            f"{backend}/objects/resolve",
+            json={
+                "ids": object_ids[start : start + resolve_batch_size],
+                "usages": [{"height": 1024}],
+            },
+        )
+        response.raise_for_status()
+        for obj in response.json()["objects"]:
+            uris[obj["id"]] = obj["uris"][0] if obj["uris"] else None
+
+    return uris
+
+
 # TODO: task manager and sam from dependencies
-def segmentation_task(task: TaskStatus):
+def segmentation_task(task: TaskStatus, uris: dict[str, str | None]):
     task_manager = get_task_manager()
     logger = task_manager.get_logger(task.id)
     sam2 = get_sam2_model()
@@ -81,11 +102,10 @@ def segmentation_task(task: TaskStatus):
     logger.info(f"Task starting...")
     task_manager.update_status(task.id, "processing")
     try:
-        uri_response = requests.post(
-            f"{backend}/objects/uri/{task.object_id}",
-            json={"height": 1024},
-        )
-        run_segmentation(uri_response.json(), sam2, logger)
+        uri = uris.get(task.object_id)
+        if uri is None:
+            raise Exception(f"Object {task.object_id} could not be resolved")
+        run_segmentation(uri, sam2, logger)
 
         logger.info(f"Task completed")
         task_manager.update_status(task.id, "completed")
@@ -147,8 +167,13 @@ async def prepare(url: str | None = Body(embed=True), sam2=Depends(get_sam2_mode
 
 @router.post("/start/{task_id}/{project_id}")
 async def start(task_id: str, project_id: str, task_manager=Depends(get_task_manager)):
-    objects_response = requests.get(f"{backend}/objects/all-of/{project_id}")
-    objects = objects_response.json()
+    # stream objects as JSON lines to avoid buffering huge projects
+    objects_response = requests.get(
+        f"{backend}/objects/all-of/{project_id}",
+        params={"stream": True},
+        stream=True,
+    )
+    objects = (json.loads(line) for line in objects_response.iter_lines() if line)
 
     tasks = list(
         [
@@ -162,7 +187,9 @@ async def start(task_id: str, project_id: str, task_manager=Depends(get_task_man
         ]
     )
 
+    uris = resolve_uris([task.object_id for task in tasks])
+
     logging.info(f"Queueing segmentation tasks: {tasks}")
-    tasks = task_manager.queue_tasks(tasks, segmentation_task)
+    tasks = task_manager.queue_tasks(tasks, partial(segmentation_task, uris=uris))
 
     return JSONResponse(jsonable_encoder(tasks))
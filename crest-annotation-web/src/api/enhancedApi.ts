@@ -83,9 +83,11 @@ export const {
   useFinishObjectMutation,
   useGetLockStatusQuery,
   useLockObjectMutation,
+  useHeartbeatObjectMutation,
   useUnlockObjectMutation,
   useGetImageUriQuery,
   useGetImageDescriptionQuery,
+  useResolveObjectsQuery,
   useGetCachedImageQuery,
   useGetLocalImageQuery,
   useGetAnnotationsQuery,
@@ -57,12 +57,36 @@ const injectedRtkApi = api.injectEndpoints({
         },
       }),
     }),
+    navigateWindow: build.query<
+      NavigateWindowApiResponse,
+      NavigateWindowApiArg
+    >({
+      query: (queryArg) => ({
+        url: `/objects/window/${queryArg.objectId}`,
+        params: {
+          before: queryArg.before,
+          after: queryArg.after,
+          annotated: queryArg.annotated,
+          synced: queryArg.synced,
+          search: queryArg.search,
+        },
+      }),
+    }),
     getObjectsCount: build.query<
       GetObjectsCountApiResponse,
       GetObjectsCountApiArg
     >({
       query: (queryArg) => ({ url: `/objects/total-of/${queryArg.projectId}` }),
     }),
+    recountObjects: build.mutation<
+      RecountObjectsApiResponse,
+      RecountObjectsApiArg
+    >({
+      query: (queryArg) => ({
+        url: `/objects/recount-of/${queryArg.projectId}`,
+        method: "POST",
+      }),
+    }),
     getObjects: build.query<GetObjectsApiResponse, GetObjectsApiArg>({
       query: (queryArg) => ({
         url: `/objects/of/${queryArg.projectId}`,
@@ -75,8 +99,33 @@ const injectedRtkApi = api.injectEndpoints({
         },
       }),
     }),
+    getObjectsByCursor: build.query<
+      GetObjectsByCursorApiResponse,
+      GetObjectsByCursorApiArg
+    >({
+      query: (queryArg) => ({
+        url: `/objects/cursor-of/${queryArg.projectId}`,
+        params: {
+          annotated: queryArg.annotated,
+          synced: queryArg.synced,
+          search: queryArg.search,
+          cursor: queryArg.cursor,
+          size: queryArg.size,
+          total: queryArg.total,
+        },
+      }),
+    }),
+    searchObjects: build.query<SearchObjectsApiResponse, SearchObjectsApiArg>({
+      query: (queryArg) => ({
+        url: `/objects/search/${queryArg.projectId}`,
+        params: { search: queryArg.search, limit: queryArg.limit },
+      }),
+    }),
     getAllObjects: build.query<GetAllObjectsApiResponse, GetAllObjectsApiArg>({
-      query: (queryArg) => ({ url: `/objects/all-of/${queryArg.projectId}` }),
+      query: (queryArg) => ({
+        url: `/objects/all-of/${queryArg.projectId}`,
+        params: { stream: queryArg.stream },
+      }),
     }),
     getObject: build.query<GetObjectApiResponse, GetObjectApiArg>({
       query: (queryArg) => ({ url: `/objects/id/${queryArg.objectId}` }),
@@ -88,6 +137,13 @@ const injectedRtkApi = api.injectEndpoints({
         params: { finished: queryArg.finished },
       }),
     }),
+    bulkObjects: build.mutation<BulkObjectsApiResponse, BulkObjectsApiArg>({
+      query: (queryArg) => ({
+        url: `/objects/bulk`,
+        method: "POST",
+        body: queryArg.bulkObjects,
+      }),
+    }),
     getLockStatus: build.query<GetLockStatusApiResponse, GetLockStatusApiArg>({
       query: (queryArg) => ({
         url: `/objects/lock/${queryArg.objectId}/${queryArg.sessionId}`,
@@ -100,6 +156,15 @@ const injectedRtkApi = api.injectEndpoints({
         params: { force: queryArg.force },
       }),
     }),
+    heartbeatObject: build.mutation<
+      HeartbeatObjectApiResponse,
+      HeartbeatObjectApiArg
+    >({
+      query: (queryArg) => ({
+        url: `/objects/heartbeat/${queryArg.objectId}/${queryArg.sessionId}`,
+        method: "POST",
+      }),
+    }),
     unlockObject: build.mutation<UnlockObjectApiResponse, UnlockObjectApiArg>({
       query: (queryArg) => ({
         url: `/objects/unlock/${queryArg.objectId}`,
@@ -107,34 +172,127 @@ const injectedRtkApi = api.injectEndpoints({
         params: { session_id: queryArg.sessionId },
       }),
     }),
+    getLockStatuses: build.mutation<
+      GetLockStatusesApiResponse,
+      GetLockStatusesApiArg
+    >({
+      query: (queryArg) => ({
+        url: `/objects/lock-status`,
+        method: "POST",
+        body: queryArg.body,
+        params: { session_id: queryArg.sessionId },
+      }),
+    }),
     getImageUri: build.query<GetImageUriApiResponse, GetImageUriApiArg>({
       query: (queryArg) => ({
         url: `/objects/uri/${queryArg.objectId}`,
         method: "POST",
         body: queryArg.imageRequest,
-        params: { concurreny_limit: queryArg.concurrenyLimit },
       }),
     }),
     getImageDescription: build.query<
       GetImageDescriptionApiResponse,
       GetImageDescriptionApiArg
     >({
+      query: (queryArg) => ({ url: `/objects/describe/${queryArg.objectId}` }),
+    }),
+    resolveObjects: build.query<
+      ResolveObjectsApiResponse,
+      ResolveObjectsApiArg
+    >({
+      query: (queryArg) => ({
+        url: `/objects/resolve`,
+        method: "POST",
+        body: queryArg.resolveObjects,
+      }),
+    }),
+    getCacheStats: build.query<GetCacheStatsApiResponse, GetCacheStatsApiArg>({
+      query: () => ({ url: `/objects/cache/stats` }),
+    }),
+    getObjectDataStats: build.query<
+      GetObjectDataStatsApiResponse,
+      GetObjectDataStatsApiArg
+    >({
+      query: () => ({ url: `/objects/data/stats` }),
+    }),
+    getObjectsSprite: build.query<
+      GetObjectsSpriteApiResponse,
+      GetObjectsSpriteApiArg
+    >({
+      query: (queryArg) => ({
+        url: `/objects/sprite/${queryArg.projectId}`,
+        params: {
+          annotated: queryArg.annotated,
+          synced: queryArg.synced,
+          search: queryArg.search,
+          page: queryArg.page,
+          size: queryArg.size,
+        },
+      }),
+    }),
+    warmupCache: build.mutation<WarmupCacheApiResponse, WarmupCacheApiArg>({
+      query: (queryArg) => ({
+        url: `/objects/warmup`,
+        method: "POST",
+        body: queryArg.warmupRequest,
+      }),
+    }),
+    getWarmup: build.query<GetWarmupApiResponse, GetWarmupApiArg>({
+      query: (queryArg) => ({ url: `/objects/warmup/${queryArg.jobId}` }),
+    }),
+    cancelWarmup: build.mutation<CancelWarmupApiResponse, CancelWarmupApiArg>({
       query: (queryArg) => ({
-        url: `/objects/describe/${queryArg.objectId}`,
-        params: { concurreny_limit: queryArg.concurrenyLimit },
+        url: `/objects/warmup/${queryArg.jobId}/cancel`,
+        method: "POST",
+      }),
+    }),
+    resumeWarmup: build.mutation<ResumeWarmupApiResponse, ResumeWarmupApiArg>({
+      query: (queryArg) => ({
+        url: `/objects/warmup/${queryArg.jobId}/resume`,
+        method: "POST",
       }),
     }),
+    getSpriteImage: build.query<
+      GetSpriteImageApiResponse,
+      GetSpriteImageApiArg
+    >({
+      query: (queryArg) => ({ url: `/objects/cache/sprites/${queryArg.file}` }),
+    }),
     getCachedImage: build.query<
       GetCachedImageApiResponse,
       GetCachedImageApiArg
     >({
       query: (queryArg) => ({
         url: `/objects/cache/${queryArg.encoded}`,
-        params: { concurreny_limit: queryArg.concurrenyLimit },
+        params: { v: queryArg.v },
       }),
     }),
     getLocalImage: build.query<GetLocalImageApiResponse, GetLocalImageApiArg>({
-      query: (queryArg) => ({ url: `/objects/local/${queryArg.encoded}` }),
+      query: (queryArg) => ({
+        url: `/objects/local/${queryArg.encoded}`,
+        params: {
+          v: queryArg.v,
+          thumbnail: queryArg.thumbnail,
+          width: queryArg.width,
+          height: queryArg.height,
+        },
+      }),
+    }),
+    getIiifService: build.query<
+      GetIiifServiceApiResponse,
+      GetIiifServiceApiArg
+    >({
+      query: (queryArg) => ({ url: `/objects/iiif/${queryArg.identifier}` }),
+    }),
+    getIiifInfo: build.query<GetIiifInfoApiResponse, GetIiifInfoApiArg>({
+      query: (queryArg) => ({
+        url: `/objects/iiif/${queryArg.identifier}/info.json`,
+      }),
+    }),
+    getIiifImage: build.query<GetIiifImageApiResponse, GetIiifImageApiArg>({
+      query: (queryArg) => ({
+        url: `/objects/iiif/${queryArg.identifier}/${queryArg.region}/${queryArg.size}/${queryArg.rotation}/${queryArg.image}`,
+      }),
     }),
     getAnnotations: build.query<
       GetAnnotationsApiResponse,
@@ -155,6 +313,17 @@ const injectedRtkApi = api.injectEndpoints({
         params: { session_id: queryArg.sessionId },
       }),
     }),
+    patchAnnotations: build.mutation<
+      PatchAnnotationsApiResponse,
+      PatchAnnotationsApiArg
+    >({
+      query: (queryArg) => ({
+        url: `/objects/annotations/${queryArg.objectId}`,
+        method: "PATCH",
+        body: queryArg.annotationsPatch,
+        params: { session_id: queryArg.sessionId },
+      }),
+    }),
     pullAnnotations: build.mutation<
       PullAnnotationsApiResponse,
       PullAnnotationsApiArg
@@ -348,11 +517,26 @@ export type NavigateFromApiArg = {
   synced?: boolean;
   search?: string;
 };
+export type NavigateWindowApiResponse =
+  /** status 200 Successful Response */ ObjectWindow;
+export type NavigateWindowApiArg = {
+  objectId: string;
+  before?: number;
+  after?: number;
+  annotated?: boolean;
+  synced?: boolean;
+  search?: string;
+};
 export type GetObjectsCountApiResponse =
   /** status 200 Successful Response */ TotalOf;
 export type GetObjectsCountApiArg = {
   projectId: string;
 };
+export type RecountObjectsApiResponse =
+  /** status 200 Successful Response */ TotalOf;
+export type RecountObjectsApiArg = {
+  projectId: string;
+};
 export type GetObjectsApiResponse =
   /** status 200 Successful Response */ PaginatedSummaryObject;
 export type GetObjectsApiArg = {
@@ -363,10 +547,29 @@ export type GetObjectsApiArg = {
   page: number;
   size: number;
 };
+export type GetObjectsByCursorApiResponse =
+  /** status 200 Successful Response */ CursorPaginatedSummaryObject;
+export type GetObjectsByCursorApiArg = {
+  projectId: string;
+  annotated?: boolean;
+  synced?: boolean;
+  search?: string;
+  cursor?: string;
+  size: number;
+  total?: boolean;
+};
+export type SearchObjectsApiResponse =
+  /** status 200 Successful Response */ SummaryObject[];
+export type SearchObjectsApiArg = {
+  projectId: string;
+  search: string;
+  limit?: number;
+};
 export type GetAllObjectsApiResponse =
   /** status 200 Successful Response */ SummaryObject[];
 export type GetAllObjectsApiArg = {
   projectId: string;
+  stream?: boolean;
 };
 export type GetObjectApiResponse = /** status 200 Successful Response */ Object;
 export type GetObjectApiArg = {
@@ -377,45 +580,128 @@ export type FinishObjectApiArg = {
   objectId: string;
   finished?: boolean;
 };
+export type BulkObjectsApiResponse =
+  /** status 200 Successful Response */ BulkResult;
+export type BulkObjectsApiArg = {
+  bulkObjects: BulkObjects;
+};
 export type GetLockStatusApiResponse =
   /** status 200 Successful Response */ any;
 export type GetLockStatusApiArg = {
   objectId: string;
   sessionId: string;
 };
-export type LockObjectApiResponse = /** status 200 Successful Response */ any;
+export type LockObjectApiResponse =
+  /** status 200 Successful Response */ LockStatus;
 export type LockObjectApiArg = {
   objectId: string;
   sessionId: string;
   force?: boolean;
 };
+export type HeartbeatObjectApiResponse =
+  /** status 200 Successful Response */ LockStatus;
+export type HeartbeatObjectApiArg = {
+  objectId: string;
+  sessionId: string;
+};
 export type UnlockObjectApiResponse = /** status 200 Successful Response */ any;
 export type UnlockObjectApiArg = {
   objectId: string;
   sessionId?: string;
 };
+export type GetLockStatusesApiResponse =
+  /** status 200 Successful Response */ LockStatus[];
+export type GetLockStatusesApiArg = {
+  sessionId?: string;
+  body: string[];
+};
 export type GetImageUriApiResponse = /** status 200 Successful Response */ any;
 export type GetImageUriApiArg = {
   objectId: string;
-  concurrenyLimit?: number;
   imageRequest: ImageRequest;
 };
 export type GetImageDescriptionApiResponse =
   /** status 200 Successful Response */ any;
 export type GetImageDescriptionApiArg = {
   objectId: string;
-  concurrenyLimit?: number;
+};
+export type ResolveObjectsApiResponse =
+  /** status 200 Successful Response */ ResolvedObjects;
+export type ResolveObjectsApiArg = {
+  resolveObjects: ResolveObjects;
+};
+export type GetCacheStatsApiResponse =
+  /** status 200 Successful Response */ CacheStatistics;
+export type GetCacheStatsApiArg = void;
+export type GetObjectDataStatsApiResponse =
+  /** status 200 Successful Response */ ObjectDataStatistics;
+export type GetObjectDataStatsApiArg = void;
+export type GetObjectsSpriteApiResponse =
+  /** status 200 Successful Response */ SpritePage;
+export type GetObjectsSpriteApiArg = {
+  projectId: string;
+  annotated?: boolean;
+  synced?: boolean;
+  search?: string;
+  page: number;
+  size: number;
+};
+export type WarmupCacheApiResponse =
+  /** status 200 Successful Response */ WarmupStatus;
+export type WarmupCacheApiArg = {
+  warmupRequest: WarmupRequest;
+};
+export type GetWarmupApiResponse =
+  /** status 200 Successful Response */ WarmupStatus;
+export type GetWarmupApiArg = {
+  jobId: string;
+};
+export type CancelWarmupApiResponse =
+  /** status 200 Successful Response */ WarmupStatus;
+export type CancelWarmupApiArg = {
+  jobId: string;
+};
+export type ResumeWarmupApiResponse =
+  /** status 200 Successful Response */ WarmupStatus;
+export type ResumeWarmupApiArg = {
+  jobId: string;
+};
+export type GetSpriteImageApiResponse =
+  /** status 200 Successful Response */ any;
+export type GetSpriteImageApiArg = {
+  file: string;
 };
 export type GetCachedImageApiResponse =
   /** status 200 Successful Response */ any;
 export type GetCachedImageApiArg = {
   encoded: string;
-  concurrenyLimit?: number;
+  v?: string;
 };
 export type GetLocalImageApiResponse =
   /** status 200 Successful Response */ any;
 export type GetLocalImageApiArg = {
   encoded: string;
+  v?: string;
+  thumbnail?: boolean;
+  width?: number;
+  height?: number;
+};
+export type GetIiifServiceApiResponse =
+  /** status 200 Successful Response */ any;
+export type GetIiifServiceApiArg = {
+  identifier: string;
+};
+export type GetIiifInfoApiResponse = /** status 200 Successful Response */ any;
+export type GetIiifInfoApiArg = {
+  identifier: string;
+};
+export type GetIiifImageApiResponse = /** status 200 Successful Response */ any;
+export type GetIiifImageApiArg = {
+  identifier: string;
+  region: string;
+  size: string;
+  rotation: string;
+  image: string;
 };
 export type GetAnnotationsApiResponse =
   /** status 200 Successful Response */ any;
@@ -429,6 +715,13 @@ export type StoreAnnotationsApiArg = {
   sessionId?: string;
   body: string;
 };
+export type PatchAnnotationsApiResponse =
+  /** status 200 Successful Response */ AnnotationsVersion;
+export type PatchAnnotationsApiArg = {
+  objectId: string;
+  sessionId?: string;
+  annotationsPatch: AnnotationsPatch;
+};
 export type PullAnnotationsApiResponse =
   /** status 200 Successful Response */ any;
 export type PullAnnotationsApiArg = {
@@ -569,9 +862,15 @@ export type Object = {
 export type ObjectNavigate = {
   id: string;
 };
+export type ObjectWindow = {
+  before: string[];
+  after: string[];
+};
 export type TotalOf = {
   total: number;
   annotated: number;
+  synced: number;
+  locked: number;
 };
 export type SummaryObject = {
   id: string;
@@ -586,11 +885,121 @@ export type PaginatedSummaryObject = {
   page: number;
   size: number;
 };
+export type CursorPaginatedSummaryObject = {
+  items: SummaryObject[];
+  next?: string;
+  prev?: string;
+  size: number;
+  total?: number;
+};
+export type BulkResult = {
+  affected: number;
+  statistics: TotalOf;
+};
+export type ObjectFilters = {
+  annotated?: boolean;
+  synced?: boolean;
+  search?: string;
+};
+export type BulkObjects = {
+  operation: "finish" | "unfinish" | "unlock" | "reset" | "delete";
+  project_id: string;
+  ids?: string[];
+  filters?: ObjectFilters;
+};
+export type LockStatus = {
+  id: string;
+  locked: boolean;
+  owned: boolean;
+  expires?: string;
+};
 export type ImageRequest = {
   thumbnail?: boolean;
   width?: number;
   height?: number;
 };
+export type ResolvedObject = {
+  id: string;
+  uris?: string[];
+  description?: string;
+  annotation_data?: string;
+  error?: string;
+};
+export type ResolvedObjects = {
+  objects: ResolvedObject[];
+  missing: string[];
+};
+export type ResolveObjects = {
+  ids: string[];
+  usages: ImageRequest[];
+  annotations?: boolean;
+};
+export type CacheStatistics = {
+  files: number;
+  size: number;
+  max_size: number;
+  hits: number;
+  misses: number;
+  evicted: number;
+  stale: number;
+  revalidated: number;
+  refreshed: number;
+  revalidation_errors: number;
+};
+export type ObjectDataStatistics = {
+  size: number;
+  max_size: number;
+  hits: number;
+  misses: number;
+};
+export type SpriteTile = {
+  id: string;
+  x: number;
+  y: number;
+  width: number;
+  height: number;
+};
+export type Sprite = {
+  uri?: string;
+  width: number;
+  height: number;
+  tiles: SpriteTile[];
+};
+export type SpritePage = {
+  objects: PaginatedSummaryObject;
+  sprite: Sprite;
+};
+export type WarmupStatus = {
+  id: string;
+  project_id: string;
+  status: "running" | "cancelled" | "completed" | "failed";
+  total: number;
+  processed: number;
+  loaded: number;
+  failed: number;
+  started: string;
+  eta?: number;
+};
+export type WarmupRequest = {
+  project_id: string;
+  filters?: ObjectFilters;
+  usages?: ImageRequest[];
+};
+export type AnnotationsVersion = {
+  version: number;
+};
+export type PatchOperation = {
+  op: "add" | "remove" | "replace" | "move" | "copy" | "test";
+  path: string;
+  from?: string;
+  value?: any;
+};
+export type AnnotationsPatch = {
+  version: number;
+  operations?: PatchOperation[];
+  upsert?: object[];
+  delete?: string[];
+};
 export type Project = {
   id: string;
   name: string;
@@ -675,12 +1084,30 @@ export type ServiceItem1 = {
   service?: Service;
 };
 export type Service = (ServiceItem | ServiceItem1)[];
+export type ImageSize = {
+  width: number;
+  height: number;
+};
+export type ImageTiles = {
+  width: number;
+  height?: number;
+  scaleFactors: number[];
+};
+export type ImageInfo = {
+  width: number;
+  height: number;
+  sizes?: ImageSize[];
+  tiles?: ImageTiles[];
+};
 export type Iiif3ObjectData = {
   manifest: string;
   page: string;
   annotation: string;
   canvas: string;
+  label?: string;
+  manifest_label?: string;
   service: Service;
+  info?: ImageInfo;
   type?: string;
 };
 export type Iiif3Object = {
@@ -706,7 +1133,10 @@ export type Iiif2ObjectData = {
   sequence: string;
   canvas: string;
   image?: string;
+  label?: string;
+  manifest_label?: string;
   service: Service2;
+  info?: ImageInfo;
   type?: string;
 };
 export type Iiif2Object = {
@@ -720,7 +1150,7 @@ export type Iiif2Import = {
   problems: string[];
 };
 export type DigitalHeraldryObjectData = {
-  manifest: string;
+  folio: string;
   image?: string;
   bindings: {
     [key: string]: string;
@@ -746,20 +1176,40 @@ export const {
   useDeleteLabelMutation,
   useGetObjectAtQuery,
   useNavigateFromQuery,
+  useNavigateWindowQuery,
   useGetObjectsCountQuery,
+  useRecountObjectsMutation,
   useGetObjectsQuery,
+  useGetObjectsByCursorQuery,
+  useSearchObjectsQuery,
   useGetAllObjectsQuery,
   useGetObjectQuery,
   useFinishObjectMutation,
+  useBulkObjectsMutation,
   useGetLockStatusQuery,
   useLockObjectMutation,
+  useHeartbeatObjectMutation,
   useUnlockObjectMutation,
+  useGetLockStatusesMutation,
   useGetImageUriQuery,
   useGetImageDescriptionQuery,
+  useResolveObjectsQuery,
+  useGetCacheStatsQuery,
+  useGetObjectDataStatsQuery,
+  useGetObjectsSpriteQuery,
+  useWarmupCacheMutation,
+  useGetWarmupQuery,
+  useCancelWarmupMutation,
+  useResumeWarmupMutation,
+  useGetSpriteImageQuery,
   useGetCachedImageQuery,
   useGetLocalImageQuery,
+  useGetIiifServiceQuery,
+  useGetIiifInfoQuery,
+  useGetIiifImageQuery,
   useGetAnnotationsQuery,
   useStoreAnnotationsMutation,
+  usePatchAnnotationsMutation,
   usePullAnnotationsMutation,
   usePushAnnotationsMutation,
   useResetAnnotationsMutation,
@@ -4,6 +4,7 @@ import {
   useGetImageUriQuery,
   useGetObjectQuery,
   useGetProjectQuery,
+  useHeartbeatObjectMutation,
   useLockObjectMutation,
   useUnlockObjectMutation,
 } from "../../../api/enhancedApi";
@@ -12,6 +13,9 @@ import { updateObject } from "../slice/annotations";
 import { operationCancel } from "../slice/operation";
 import { activateTool } from "../slice/toolbox";
 
+// interval to renew the object lock, well below the backend lease duration
+const HEARTBEAT_INTERVAL = 60 * 1000;
+
 /**
  * Enable the annotation middleware and ensure it is configured correctly
  *
@@ -47,6 +51,7 @@ export const useAnnotationMiddleware = ({
 
   // control access to the object
   const [lockRequest] = useLockObjectMutation();
+  const [heartbeatRequest] = useHeartbeatObjectMutation();
   const [unlockRequest] = useUnlockObjectMutation();
 
   const localProject = useAppSelector((state) => state.annotations.project);
@@ -103,8 +108,14 @@ export const useAnnotationMiddleware = ({
 
         // acquire remote lock on current object
         lockRequest({ objectId, sessionId: session });
+        // keep the lock alive while the object is open
+        const heartbeat = setInterval(
+          () => heartbeatRequest({ objectId, sessionId: session }),
+          HEARTBEAT_INTERVAL
+        );
         // unlock on unmount
         return () => {
+          clearInterval(heartbeat);
           unlockRequest({ objectId, sessionId: session });
         };
       }
@@ -10,24 +10,20 @@ import {
   useTheme,
 } from "@mui/material";
 import { useNavigate } from "react-router-dom";
-import { useGetImageUriQuery } from "../../../api/enhancedApi";
 import { SummaryObject } from "../../../api/openApi";
 import Loader from "../../../components/Loader";
 
 interface IProps {
   projectId?: string;
   object: SummaryObject;
+  // thumbnail resolved for the whole page of objects
+  imageQuery: { isLoading?: boolean; isError?: boolean; data?: string };
 }
 
-const ObjectCard = ({ projectId, object }: IProps) => {
+const ObjectCard = ({ projectId, object, imageQuery }: IProps) => {
   const navigate = useNavigate();
   const theme = useTheme();
 
-  const imageQuery = useGetImageUriQuery({
-    objectId: object.id,
-    imageRequest: { thumbnail: true, width: 240 },
-  });
-
   return (
     <Card>
       <CardActionArea
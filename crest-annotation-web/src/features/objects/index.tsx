@@ -1,8 +1,12 @@
-import React, { useState } from "react";
+import React, { useMemo, useState } from "react";
 import { Link, Stack } from "@mui/material";
 import { useDispatch } from "react-redux";
 import ObjectCard from "./components/ObjectCard";
-import { useGetObjectsQuery, useGetProjectQuery } from "../../api/enhancedApi";
+import {
+  useGetObjectsQuery,
+  useGetProjectQuery,
+  useResolveObjectsQuery,
+} from "../../api/enhancedApi";
 import { SummaryObject } from "../../api/openApi";
 import { useAppSelector } from "../../app/hooks";
 import { selectObjectFilters, updateObjectFilters } from "../../app/slice";
@@ -33,6 +37,25 @@ const ObjectsPage = withProject(({ projectId }) => {
     ...filters,
   });
 
+  // resolve the thumbnails of the page at once instead of per card
+  const ids = objectsQuery.data?.items.map((object) => object.id) ?? [];
+  const resolveQuery = useResolveObjectsQuery(
+    {
+      resolveObjects: { ids, usages: [{ thumbnail: true, width: 240 }] },
+    },
+    { skip: !ids.length }
+  );
+  const thumbnails = useMemo(
+    () =>
+      Object.fromEntries(
+        (resolveQuery.data?.objects ?? []).map((object) => [
+          object.id,
+          object.uris?.[0],
+        ])
+      ),
+    [resolveQuery.data]
+  );
+
   const changeState = (annotated: boolean | undefined) => {
     dispatch(updateObjectFilters({ ...filters, annotated }));
     // reset the page when filtering
@@ -52,7 +75,15 @@ const ObjectsPage = withProject(({ projectId }) => {
   };
 
   const renderCard = (object: SummaryObject) => (
-    <ObjectCard projectId={projectId} object={object} />
+    <ObjectCard
+      projectId={projectId}
+      object={object}
+      imageQuery={{
+        isLoading: resolveQuery.isFetching,
+        isError: resolveQuery.isError,
+        data: thumbnails[object.id],
+      }}
+    />
   );
 
   const renderActions = () => (